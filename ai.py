@@ -1,49 +1,102 @@
 # ai.py
 """AI implementation using Monte Carlo Tree Search."""
 
-import math
+import os
 import random
 import time
-from typing import Optional, List, Tuple, Dict
+import numpy as np
+from typing import Callable, Optional, List, Tuple, Dict
 from hex_game import HexGame, Player
+from bitboard import BitBoard, masks_to_array
+from rollout import ROLLOUT_POLICIES
+from batch_rollout import batch_fill
+from mcts_tree import MCTSTree
+from config import Config
+from transposition import TranspositionTable
+from parallel_search import get_pool, rollout_worker, submit_root_searches, merge_root_searches
+from search_stats import PHASES, SearchStats
+from time_manager import TimeManager
+from inferior_cells import InferiorCellCache
+from solver import Solver
+from policy_net import PolicyValueNet
+from opening_book import OpeningBook, book_path
 import threading
+from concurrent.futures import FIRST_COMPLETED, wait
 from queue import Queue
 
-class MCTSNode:
-    def __init__(self, game_state: HexGame, parent: Optional['MCTSNode'] = None, move: Optional[Tuple[int, int]] = None):
-        self.game_state = game_state.copy()
-        self.parent = parent
-        self.move = move
-        self.children: List[MCTSNode] = []
-        self.visits = 0
-        self.wins = 0
-        self.untried_moves = game_state.get_valid_moves()
-        random.shuffle(self.untried_moves)
-    
-    def uct_select_child(self, exploration_constant: float = 1.414) -> 'MCTSNode':
-        """Select a child node using UCT formula."""
-        return max(self.children, key=lambda child: 
-                   child.wins / child.visits + exploration_constant * math.sqrt(math.log(self.visits) / child.visits))
-    
-    def add_child(self, move: Tuple[int, int], game_state: HexGame) -> 'MCTSNode':
-        """Add a new child node."""
-        child = MCTSNode(game_state, parent=self, move=move)
-        self.untried_moves.remove(move)
-        self.children.append(child)
-        return child
-
 class HexAI:
     def __init__(self, difficulty_settings: Dict):
         self.simulations = difficulty_settings["simulations"]
         self.time_limit = difficulty_settings["time_limit"]
+        # Early stopping, extensions and the optional per-game clock
+        self.time_manager = TimeManager(difficulty_settings)
+        self.rollout_policy = difficulty_settings.get("rollout", "fill")
+        self.rollout = ROLLOUT_POLICIES[self.rollout_policy]
+        self.rng = random.Random()
+        # Playouts per leaf; above 1 the vectorized evaluator backs up win rates
+        self.batch_size = difficulty_settings.get("batch_size", 1)
+        self.np_rng = np.random.default_rng()
+        self.last_playouts = 0
+        # Node arrays are allocated once and reused by every search
+        self.tree = MCTSTree(difficulty_settings.get("max_nodes", Config.MAX_TREE_NODES))
+        # Parallel search across worker processes when above 1: "root" runs
+        # independent searches, "tree" grows one tree with pooled playouts
+        self.workers = difficulty_settings.get("workers", 1)
+        self.parallel_mode = difficulty_settings.get("parallel", "root")
+        self.virtual_loss = difficulty_settings.get("virtual_loss", Config.VIRTUAL_LOSS)
+        self.leaves_per_job = difficulty_settings.get("leaves_per_job", Config.TREE_PARALLEL_LEAVES)
+        self.settings = dict(difficulty_settings)
+        # Keep the relevant subtree between moves instead of starting cold
+        self.reuse_tree = difficulty_settings.get("reuse_tree", True)
+        self.tree_moves: Optional[List[int]] = None  # move sequence at the tree root
+        self.last_inherited_visits = 0
+        self.last_root_visits: Optional[np.ndarray] = None  # visits per cell after a search
+        # Transposition table shared by every search of this AI (0 MB disables)
+        tt_memory_mb = difficulty_settings.get("tt_memory_mb", Config.TT_MEMORY_MB)
+        self.transpositions = TranspositionTable(tt_memory_mb) if tt_memory_mb > 0 else None
+        # RAVE equivalence parameter k; 0 uses plain UCT
+        self.rave_equivalence = difficulty_settings.get("rave_k", Config.RAVE_EQUIVALENCE)
+        # Drop dead, captured and dominated cells from expansion and fill
+        # dead and captured ones in before playouts
+        prune = difficulty_settings.get("prune_inferior", Config.PRUNE_INFERIOR_CELLS)
+        self.inferior = InferiorCellCache() if prune else None
+        # Solve leaves with at most this many empty cells exactly (0 disables)
+        self.solver_empty_cells = difficulty_settings.get("solver_empty_cells", Config.SOLVER_EMPTY_CELLS)
+        self.solver_max_nodes = difficulty_settings.get("solver_max_nodes", Config.SOLVER_MAX_NODES)
+        self.solver = Solver() if self.solver_empty_cells > 0 else None
+        # Policy/value network (weights file or PolicyValueNet) replacing the
+        # playouts; leaves are evaluated ``leaf_batch`` at a time
+        evaluator = difficulty_settings.get("evaluator")
+        if isinstance(evaluator, str):
+            evaluator = PolicyValueNet.load(evaluator)
+        self.evaluator: Optional[PolicyValueNet] = evaluator
+        self.leaf_batch = difficulty_settings.get("leaf_batch", Config.LEAF_BATCH_SIZE)
+        self.c_puct = difficulty_settings.get("c_puct", Config.PUCT_EXPLORATION)
+        # Directory of opening books (hex_<size>.hexb) consulted before searching;
+        # None disables. Books are opened on first use per board size.
+        self.book_dir = difficulty_settings.get("book", Config.OPENING_BOOK_DIR)
+        self.books: Dict[int, Optional[OpeningBook]] = {}
+        self.exploration = difficulty_settings.get(
+            "exploration", Config.RAVE_EXPLORATION if self.rave_equivalence > 0 else 1.414)
+        # Seconds to keep searching on the opponent's time (0 disables)
+        self.ponder_time = difficulty_settings.get("ponder_time", 0)
+        self.ponder_thread = None
+        # Cooperative stop flag checked by the search loop
+        self.stop_event = threading.Event()
         self.result_queue = Queue()
         self.current_thread = None
+        # Statistics of the last search, and an optional observer that gets
+        # a snapshot every ``stats_interval`` seconds while searching
+        self.last_stats: Optional[SearchStats] = None
+        self.stats_callback: Optional[Callable[[SearchStats], None]] = None
+        self.stats_interval = difficulty_settings.get("stats_interval", 0.5)
     
     def get_best_move_async(self, game_state: HexGame):
         """Start AI calculation in a separate thread."""
         if self.current_thread and self.current_thread.is_alive():
             return
         
+        self.stop_pondering()
         self.current_thread = threading.Thread(
             target=self._calculate_move,
             args=(game_state,)
@@ -51,13 +104,68 @@ class HexAI:
         self.current_thread.daemon = True
         self.current_thread.start()
     
+    def start_pondering(self, game_state: HexGame):
+        """Keep growing the tree in the background while the opponent thinks.
+
+        The next ``get_best_move_async`` stops pondering and continues from
+        the subtree under the opponent's actual reply.
+        """
+        if self.ponder_time <= 0 or game_state.is_game_over():
+            return
+        self.stop_pondering()
+        
+        self.ponder_thread = threading.Thread(
+            target=self._ponder,
+            args=(game_state.copy(),)
+        )
+        self.ponder_thread.daemon = True
+        self.ponder_thread.start()
+    
+    def stop_pondering(self):
+        """Stop a running ponder search and wait for it to finish."""
+        if self.ponder_thread and self.ponder_thread.is_alive():
+            self.stop_event.set()
+            self.ponder_thread.join()
+        self.ponder_thread = None
+        self.stop_event.clear()
+    
+    def cancel(self):
+        """Stop pondering and any move calculation in progress."""
+        self.stop_event.set()
+        for thread in (self.ponder_thread, self.current_thread):
+            if thread and thread.is_alive():
+                thread.join()
+        self.ponder_thread = None
+        self.stop_event.clear()
+        while not self.result_queue.empty():
+            self.result_queue.get()
+    
+    def _ponder(self, game_state: HexGame):
+        """Search the opponent's position until stopped or out of ponder time."""
+        try:
+            self._mcts_search(game_state, simulations=float("inf"), time_limit=self.ponder_time)
+        except Exception as e:
+            print(f"AI ponder error: {e}")
+            self._record_error(game_state, e)
+            self.tree_moves = None
+    
+    def new_game(self):
+        """Forget the kept tree and refill the game clock before another game."""
+        self.tree_moves = None
+        self.time_manager.new_game()
+    
+    def get_best_move(self, game_state: HexGame) -> Tuple[int, int]:
+        """Search synchronously (headless use: self-play, arena, scripts)."""
+        return self._search(game_state)
+    
     def _calculate_move(self, game_state: HexGame):
         """Calculate the best move (runs in separate thread)."""
         try:
-            move = self._mcts_search(game_state)
+            move = self._search(game_state)
             self.result_queue.put(move)
         except Exception as e:
             print(f"AI error: {e}")
+            self._record_error(game_state, e)
             # Fallback to random move
             valid_moves = game_state.get_valid_moves()
             if valid_moves:
@@ -65,54 +173,682 @@ class HexAI:
             else:
                 self.result_queue.put(None)
     
-    def _mcts_search(self, game_state: HexGame) -> Tuple[int, int]:
-        """Perform MCTS search."""
-        root = MCTSNode(game_state)
-        start_time = time.time()
+    def _search(self, game_state: HexGame) -> Tuple[int, int]:
+        """Play the book move if there is one, else run the configured search."""
+        move = self._book_move(game_state)
+        if move is not None:
+            return move
+        if self.workers > 1:
+            # Tree-parallel search runs playouts; with an evaluator workers search roots
+            if self.parallel_mode == "tree" and self.evaluator is None:
+                return self._tree_parallel_search(game_state)
+            return self._root_parallel_search(game_state)
+        return self._mcts_search(game_state)
+    
+    def _book_move(self, game_state: HexGame) -> Optional[Tuple[int, int]]:
+        """Look the position up in the opening book for this board size."""
+        if not self.book_dir:
+            return None
+        size = game_state.board_size
+        if size not in self.books:
+            path = book_path(self.book_dir, size)
+            self.books[size] = OpeningBook(path) if os.path.exists(path) else None
+        book = self.books[size]
+        if book is None:
+            return None
+        moves = book.candidates(game_state.bitboard)
+        if not moves:
+            return None
+        
+        num_cells = size * size
+        self.last_playouts = 0
+        self.last_root_visits = np.zeros(num_cells, dtype=np.int64)
+        for cell, visits, _ in moves:
+            self.last_root_visits[cell] = visits
+        stats = SearchStats(size)
+        stats.stop_reason = "book"
+        stats.root_moves = [divmod(cell, size) for cell, _, _ in moves]
+        stats.root_visits = np.array([visits for _, visits, _ in moves], dtype=np.int64)
+        stats.root_win_rates = np.array([value for _, _, value in moves])
+        stats.principal_variation = stats.root_moves[:1]
+        stats.finished = True
+        self.last_stats = stats
+        if self.stats_callback is not None:
+            self.stats_callback(stats)
+        return stats.root_moves[0]
+    
+    def _root_parallel_search(self, game_state: HexGame) -> Tuple[int, int]:
+        """Merge root visit counts from independent searches in a process pool.
+
+        This process searches its own (reused, pondered) tree as one of the
+        ``workers`` while the pool runs the others. A move proven to win, by
+        this tree or by any worker, is played regardless of visit counts.
+        Workers that fail are left out of the merge. The whole move, waiting
+        for the workers included, is charged to the game clock.
+        """
+        clock_before = self.time_manager.clock_remaining
+        move_start = time.perf_counter()
+        try:
+            return self._merge_root_parallel(game_state)
+        finally:
+            self.time_manager.charge_move(clock_before, time.perf_counter() - move_start)
+    
+    def _merge_root_parallel(self, game_state: HexGame) -> Tuple[int, int]:
+        """Run this process's search alongside the workers and pick from the merged root."""
+        seed = self.rng.randrange(2 ** 31)
+        # Workers search for the time this move gets from the game clock
+        time_limit = self.time_limit
+        if self.time_manager.game_time > 0:
+            num_cells = game_state.bitboard.tables.num_cells
+            time_limit = self.time_manager.allocate(num_cells - len(game_state.bitboard.moves), num_cells)
+        futures = submit_root_searches(self.settings, game_state, self.workers - 1, seed, time_limit)
+        move = self._mcts_search(game_state)
+        
+        tree = self.tree
+        best = tree.best_child(0)
+        if best >= 0 and tree.proven[best] > 0:
+            # Nothing the workers found can beat a proven win
+            for future in futures:
+                future.cancel()
+            return move
+        
+        # A local search that ended early does not wait out the workers'
+        # full time limit: a decided or solved root only takes what has
+        # already finished, and at the simulation cap the workers, running
+        # the same budget, get as long as this search took
+        wait_limit = None
+        if self.last_stats.stop_reason in ("decided", "solved"):
+            wait_limit = 0.0
+        elif self.last_stats.stop_reason == "simulations":
+            wait_limit = self.last_stats.elapsed
+        
+        merged = self.last_root_visits
+        proven = np.zeros(len(merged), dtype=np.int8)
+        start = tree.first_child[0]
+        end = start + tree.num_children[0]
+        proven[tree.move[start:end].astype(np.intp)] = tree.proven[start:end]
+        self.last_playouts += merge_root_searches(futures, merged, proven, self.stop_event, wait_limit)
+        self.last_stats.playouts = self.last_playouts
+        
+        if (proven > 0).any():
+            return game_state.bitboard.coords(int(np.where(proven > 0, merged, -1).argmax()))
+        if (proven < 0).any() and not (proven[merged > 0] < 0).all():
+            merged = np.where(proven < 0, 0, merged)
+        if merged.any():
+            return game_state.bitboard.coords(int(merged.argmax()))
+        # Nothing was merged (e.g. every worker failed): keep this search's move
+        return move
+    
+    def _tree_parallel_search(self, game_state: HexGame) -> Tuple[int, int]:
+        """Grow one shared tree while the process pool runs the leaf playouts.
+
+        This process only selects, expands and backs up. Each job carries
+        ``leaves_per_job`` leaves, and two jobs per worker are kept in
+        flight; virtual loss on the pending paths makes later selections
+        spread out instead of piling onto the same line.
+        """
+        board = game_state.bitboard.copy()
+        root_player = board.to_move
+        root_depth = len(board.moves)
+        num_cells = board.tables.num_cells
+        tree = self.tree
+        table = self.transpositions
+        clock = time.perf_counter
+        search_start = clock()
+        self.last_inherited_visits = self._advance_root(board.moves)
+        tree.key[0] = board.canonical_hash()
+        if table is not None:
+            table.new_search()
+        stats = SearchStats(board.size)
+        stats.inherited_visits = self.last_inherited_visits
+        start_size = int(tree.size)
+        phase_times = [0.0] * len(PHASES)
+        if not tree.num_children[0]:
+            self._expand(0, board)
+        
+        pool = get_pool(self.workers)
+        seed = self.rng.randrange(2 ** 31)
+        rave = self.rave_equivalence
+        exploration = self.exploration
+        virtual_loss = self.virtual_loss
+        timer = self.time_manager
+        timer.start(tree, self.simulations, self.time_limit, num_cells - root_depth, num_cells)
+        pending = {}  # future -> paths of the leaves it evaluates
+        simulations_done = 0
+        max_depth = 0
+        stopping = False
+        while True:
+            if not stopping and (self.stop_event.is_set() or timer.should_stop(simulations_done)):
+                stopping = True
+            
+            # Selection and expansion (timed together) until every worker has two jobs queued
+            t0 = clock()
+            while not stopping and len(pending) < 2 * self.workers:
+                paths = []
+                leaves = []
+                for _ in range(self.leaves_per_job):
+                    node = 0
+                    path = [0]
+                    while tree.num_children[node]:
+                        node = tree.select_child(node, exploration, table, rave)
+                        board.make_move(int(tree.move[node]))
+                        path.append(node)
+                    if not board.winner and self._expand(node, board):
+                        node = tree.select_child(node, exploration, table, rave)
+                        board.make_move(int(tree.move[node]))
+                        path.append(node)
+                    max_depth = max(max_depth, len(path) - 1)
+                    
+                    if board.winner:
+                        # Decided positions need no playout
+                        result = 1.0 if board.winner == root_player else 0.0
+                        tree.backpropagate(path, result)
+                        if table is not None:
+                            self._update_transpositions(path, root_depth, result)
+                        simulations_done += 1
+                    else:
+                        tree.add_virtual_loss(path, virtual_loss)
+                        paths.append(path)
+                        saved_stones = self._fill_inferior(board)
+                        leaves.append((board.stones[1], board.stones[2], board.to_move, board.moves[-1]))
+                        if saved_stones is not None:
+                            board.stones = saved_stones
+                    while len(board.moves) > root_depth:
+                        board.unmake_move()
+                if not leaves:
+                    break
+                future = pool.submit(rollout_worker, board.size, leaves, self.rollout_policy,
+                                     self.batch_size, seed)
+                seed += 1
+                pending[future] = paths
+            t1 = clock()
+            phase_times[0] += t1 - t0
+            if not pending:
+                if stopping:
+                    break
+                continue
+            
+            # Wait for playouts, then back up every finished leaf
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            t2 = clock()
+            phase_times[2] += t2 - t1
+            for future in done:
+                paths = pending.pop(future)
+                for path, (winners, owners) in zip(paths, future.result()):
+                    tree.remove_virtual_loss(path, virtual_loss)
+                    result = np.count_nonzero(winners == root_player) / len(winners)
+                    tree.backpropagate(path, result)
+                    if rave:
+                        tree.update_amaf(path, owners, winners, root_player)
+                    if table is not None:
+                        self._update_transpositions(path, root_depth, result)
+                    simulations_done += 1
+            phase_times[3] += clock() - t2
+        
+        timer.finish()
+        self.last_playouts = simulations_done * self.batch_size
+        self.tree_moves = list(board.moves)
+        self.last_root_visits = self._root_visits(num_cells)
+        self._fill_stats(stats, simulations_done, clock() - search_start, phase_times, max_depth, start_size)
+        stats.time_limit = timer.time_limit
+        stats.stop_reason = timer.stop_reason or "stopped"
+        stats.finished = True
+        self.last_stats = stats
+        if self.stats_callback is not None:
+            self.stats_callback(stats)
+        
+        return self._best_move(board, game_state)
+    
+    def _mcts_search(self, game_state: HexGame, simulations: Optional[float] = None,
+                     time_limit: Optional[float] = None) -> Tuple[int, int]:
+        """Perform MCTS search (defaults to the difficulty's budget).
+
+        With the default budget the time manager may stop early or extend
+        the search; an explicit budget (pondering) is searched in full.
+        """
+        if self.evaluator is not None:
+            return self._net_search(game_state, simulations, time_limit)
+        managed = simulations is None and time_limit is None
+        simulations = self.simulations if simulations is None else simulations
+        time_limit = self.time_limit if time_limit is None else time_limit
+        board = game_state.bitboard.copy()
+        root_player = board.to_move
+        root_depth = len(board.moves)
+        num_cells = board.tables.num_cells
+        tree = self.tree
+        table = self.transpositions
+        clock = time.perf_counter
+        search_start = clock()
+        self.last_inherited_visits = self._advance_root(board.moves)
+        tree.key[0] = board.canonical_hash()
+        if table is not None:
+            table.new_search()
+        stats = SearchStats(board.size)
+        stats.inherited_visits = self.last_inherited_visits
+        start_size = int(tree.size)
+        phase_times = [0.0] * len(PHASES)
+        if not tree.num_children[0]:
+            expand_start = clock()
+            self._expand(0, board)
+            phase_times[1] += clock() - expand_start
+        self._solve_root_children(board, stats)
         simulations_done = 0
+        max_depth = 0
+        callback = self.stats_callback
+        next_snapshot = search_start + self.stats_interval
+        solver = self.solver
+        solver_cells = self.solver_empty_cells
+        solver_nodes = solver.nodes if solver else 0
+        solver_time = solver.elapsed if solver else 0.0
         
-        while simulations_done < self.simulations and time.time() - start_time < self.time_limit:
-            node = root
-            temp_game = game_state.copy()
+        rave = self.rave_equivalence
+        exploration = self.exploration
+        stop_event = self.stop_event
+        timer = self.time_manager
+        timer.start(tree, simulations, time_limit, num_cells - root_depth, num_cells, managed)
+        while not stop_event.is_set():
+            node = 0
+            path = [0]
+            t0 = clock()
             
-            # Selection
-            while node.untried_moves == [] and node.children != []:
-                node = node.uct_select_child()
-                temp_game.make_move(node.move[0], node.move[1])
+            # Selection, stopping at proven nodes below the root
+            while tree.num_children[node] and (not tree.proven[node] or node == 0):
+                node = tree.select_child(node, exploration, table, rave)
+                board.make_move(int(tree.move[node]))
+                path.append(node)
+            t1 = clock()
             
-            # Expansion
-            if node.untried_moves != []:
-                move = random.choice(node.untried_moves)
-                temp_game.make_move(move[0], move[1])
-                node = node.add_child(move, temp_game)
+            # Endgame solver for small leaves, then expansion
+            if (not tree.proven[node] and not board.winner and solver is not None
+                    and num_cells - len(board.moves) <= solver_cells):
+                winner = solver.solve(board, self.solver_max_nodes)
+                if winner:
+                    tree.proven[node] = 1 if winner != board.to_move else -1
+                    stats.solved_nodes += 1
+            if not tree.proven[node] and not board.winner and self._expand(node, board):
+                node = tree.select_child(node, exploration, table, rave)
+                board.make_move(int(tree.move[node]))
+                path.append(node)
+            if board.winner:
+                tree.proven[node] = 1
+            t2 = clock()
             
-            # Simulation
-            simulation_game = temp_game.copy()
-            moves = 0
-            while not simulation_game.is_game_over() and moves < 30:
-                valid_moves = simulation_game.get_valid_moves()
-                if not valid_moves:
-                    break
-                move = random.choice(valid_moves)
-                simulation_game.make_move(move[0], move[1])
-                moves += 1
+            # Simulation with the leaf's dead and captured cells filled in;
+            # proven nodes are never sampled, their result is exact
+            proven = tree.proven[node]
+            saved_stones = None if proven else self._fill_inferior(board)
+            if proven:
+                if board.winner:
+                    winner = board.winner
+                else:
+                    winner = 3 - board.to_move if proven > 0 else board.to_move
+                result = 1.0 if winner == root_player else 0.0
+                tree.propagate_proof(path)
+            elif self.batch_size > 1:
+                winners, fills = batch_fill(board, self.batch_size, self.np_rng)
+                result = np.count_nonzero(winners == root_player) / self.batch_size
+                owners = fills.reshape(self.batch_size, -1)
+            else:
+                winner, red, blue = self.rollout(board, self.rng)
+                result = 1.0 if winner == root_player else 0.0
+                if rave:
+                    winners = np.array([winner])
+                    owners = masks_to_array(red, blue, num_cells)[None, :]
+            if saved_stones is not None:
+                board.stones = saved_stones
+            t3 = clock()
             
             # Backpropagation
-            winner = simulation_game.winner
-            while node is not None:
-                node.visits += 1
-                if winner == game_state.current_player:
-                    node.wins += 1
-                node = node.parent
+            tree.backpropagate(path, result)
+            if rave and not proven:
+                tree.update_amaf(path, owners, winners, root_player)
+            if table is not None:
+                self._update_transpositions(path, root_depth, result)
+            
+            # Undo everything played since the root
+            while len(board.moves) > root_depth:
+                board.unmake_move()
+            t4 = clock()
             
+            phase_times[0] += t1 - t0
+            phase_times[1] += t2 - t1
+            phase_times[2] += t3 - t2
+            phase_times[3] += t4 - t3
+            if len(path) > max_depth:
+                max_depth = len(path)
             simulations_done += 1
+            if callback is not None and t4 >= next_snapshot:
+                snapshot = SearchStats(board.size)
+                snapshot.inherited_visits = self.last_inherited_visits
+                self._fill_stats(snapshot, simulations_done, t4 - search_start, phase_times,
+                                 max_depth - 1, start_size)
+                callback(snapshot)
+                next_snapshot = t4 + self.stats_interval
+            if timer.should_stop(simulations_done) or (tree.proven[0] and self._root_decided()):
+                break
+        
+        self.last_playouts = simulations_done * self.batch_size
+        self.tree_moves = list(board.moves)
+        self.last_root_visits = self._root_visits(num_cells)
+        self._fill_stats(stats, simulations_done, clock() - search_start, phase_times,
+                         max(max_depth - 1, 0), start_size)
+        timer.finish()
+        stats.time_limit = timer.time_limit
+        stats.stop_reason = "solved" if tree.proven[0] else timer.stop_reason or "stopped"
+        if solver is not None:
+            stats.solver_nodes = solver.nodes - solver_nodes
+            stats.solver_time = solver.elapsed - solver_time
+        stats.finished = True
+        self.last_stats = stats
+        if callback is not None:
+            callback(stats)
         
         # Select best move
-        if root.children:
-            return max(root.children, key=lambda child: child.visits).move
-        else:
-            valid_moves = game_state.get_valid_moves()
-            return random.choice(valid_moves) if valid_moves else (0, 0)
+        return self._best_move(board, game_state)
+    
+    def _net_search(self, game_state: HexGame, simulations: Optional[float] = None,
+                    time_limit: Optional[float] = None) -> Tuple[int, int]:
+        """MCTS guided by the policy/value network instead of playouts.
+
+        Each round selects up to ``leaf_batch`` leaves by PUCT, with virtual
+        loss on every pending path so the batch holds different leaves, and
+        evaluates them all in one network call. The priors go to the new
+        children and the values are backed up in place of playout results.
+        Terminal and solved leaves are backed up exactly, as in ``_mcts_search``.
+        """
+        managed = simulations is None and time_limit is None
+        simulations = self.simulations if simulations is None else simulations
+        time_limit = self.time_limit if time_limit is None else time_limit
+        board = game_state.bitboard.copy()
+        root_player = board.to_move
+        root_depth = len(board.moves)
+        num_cells = board.tables.num_cells
+        tree = self.tree
+        net = self.evaluator
+        clock = time.perf_counter
+        search_start = clock()
+        self.last_inherited_visits = self._advance_root(board.moves)
+        tree.key[0] = board.canonical_hash()
+        stats = SearchStats(board.size)
+        stats.inherited_visits = self.last_inherited_visits
+        start_size = int(tree.size)
+        phase_times = [0.0] * len(PHASES)
+        simulations_done = 0
+        max_depth = 0
+        callback = self.stats_callback
+        next_snapshot = search_start + self.stats_interval
+        solver = self.solver
+        solver_cells = self.solver_empty_cells
+        solver_nodes = solver.nodes if solver else 0
+        solver_time = solver.elapsed if solver else 0.0
+        self._solve_root_children(board, stats)
+        
+        c_puct = self.c_puct
+        virtual_loss = self.virtual_loss
+        boards = np.zeros((self.leaf_batch, num_cells), dtype=np.int8)
+        to_move = np.zeros(self.leaf_batch, dtype=np.int8)
+        stop_event = self.stop_event
+        timer = self.time_manager
+        timer.start(tree, simulations, time_limit, num_cells - root_depth, num_cells, managed)
+        while not stop_event.is_set():
+            # Selection: collect leaves until the batch is full or a
+            # selection runs into a leaf that is already waiting
+            t0 = clock()
+            paths = []
+            pending = set()
+            leaf_players = []
+            expand_time = 0.0
+            for _ in range(self.leaf_batch):
+                node = 0
+                path = [0]
+                while (tree.num_children[node] and (not tree.proven[node] or node == 0)
+                       and node not in pending):
+                    node = tree.select_child_puct(node, c_puct)
+                    board.make_move(int(tree.move[node]))
+                    path.append(node)
+                if node in pending:
+                    while len(board.moves) > root_depth:
+                        board.unmake_move()
+                    break
+                max_depth = max(max_depth, len(path))
+                
+                if (not tree.proven[node] and not board.winner and solver is not None
+                        and num_cells - len(board.moves) <= solver_cells):
+                    winner = solver.solve(board, self.solver_max_nodes)
+                    if winner:
+                        tree.proven[node] = 1 if winner != board.to_move else -1
+                        stats.solved_nodes += 1
+                if board.winner:
+                    tree.proven[node] = 1
+                proven = tree.proven[node]
+                if proven:
+                    # Exact result, no evaluation needed
+                    if board.winner:
+                        winner = board.winner
+                    else:
+                        winner = 3 - board.to_move if proven > 0 else board.to_move
+                    tree.backpropagate(path, 1.0 if winner == root_player else 0.0)
+                    tree.propagate_proof(path)
+                    simulations_done += 1
+                else:
+                    # A full tree still gets the leaf's value, just no children
+                    expand_start = clock()
+                    self._expand(node, board)
+                    row = len(paths)
+                    boards[row] = masks_to_array(board.stones[1], board.stones[2], num_cells)
+                    to_move[row] = board.to_move
+                    expand_time += clock() - expand_start
+                    leaf_players.append(board.to_move)
+                    tree.add_virtual_loss(path, virtual_loss)
+                    paths.append(path)
+                    pending.add(node)
+                while len(board.moves) > root_depth:
+                    board.unmake_move()
+                if tree.proven[0] and self._root_decided():
+                    break
+            t1 = clock()
+            
+            # Evaluation: one network call for the whole batch
+            count = len(paths)
+            priors = values = ()
+            if count:
+                priors, values = net.evaluate(boards[:count], to_move[:count])
+            t2 = clock()
+            
+            # Backpropagation of priors and values
+            for path, player, prior, value in zip(paths, leaf_players, priors, values):
+                node = path[-1]
+                if tree.num_children[node]:
+                    start = tree.first_child[node]
+                    end = start + tree.num_children[node]
+                    child_priors = prior[tree.move[start:end].astype(np.intp)]
+                    total = child_priors.sum()
+                    tree.prior[start:end] = child_priors / total if total > 0 else 1.0 / (end - start)
+                tree.remove_virtual_loss(path, virtual_loss)
+                # ``value`` is for the side to move at the leaf
+                mover_wins = (float(value) + 1) / 2
+                tree.backpropagate(path, mover_wins if player == root_player else 1.0 - mover_wins)
+            simulations_done += count
+            t3 = clock()
+            
+            phase_times[0] += t1 - t0 - expand_time
+            phase_times[1] += expand_time
+            phase_times[2] += t2 - t1
+            phase_times[3] += t3 - t2
+            if callback is not None and t3 >= next_snapshot:
+                snapshot = SearchStats(board.size)
+                snapshot.inherited_visits = self.last_inherited_visits
+                self._fill_stats(snapshot, simulations_done, t3 - search_start, phase_times,
+                                 max_depth - 1, start_size)
+                callback(snapshot)
+                next_snapshot = t3 + self.stats_interval
+            if (tree.proven[0] and self._root_decided()) or timer.should_stop(simulations_done):
+                break
+        
+        self.last_playouts = 0
+        self.tree_moves = list(board.moves)
+        self.last_root_visits = self._root_visits(num_cells)
+        self._fill_stats(stats, simulations_done, clock() - search_start, phase_times,
+                         max(max_depth - 1, 0), start_size)
+        stats.playouts = 0
+        timer.finish()
+        stats.time_limit = timer.time_limit
+        stats.stop_reason = "solved" if tree.proven[0] else timer.stop_reason or "stopped"
+        if solver is not None:
+            stats.solver_nodes = solver.nodes - solver_nodes
+            stats.solver_time = solver.elapsed - solver_time
+        stats.finished = True
+        self.last_stats = stats
+        if callback is not None:
+            callback(stats)
+        
+        return self._best_move(board, game_state)
+    
+    def _root_decided(self) -> bool:
+        """Whether a proven root has its move: the winning child, or any visited one when lost.
+
+        A root promoted onto an already proven node may have fresh,
+        unvisited children, so the search keeps going below it until then.
+        """
+        tree = self.tree
+        best = tree.best_child(0)
+        if best < 0:
+            return True
+        if tree.proven[0] < 0:
+            return tree.proven[best] > 0
+        return tree.proven[best] > 0 or tree.visits[best] > 0
+    
+    def _solve_root_children(self, board: BitBoard, stats: SearchStats):
+        """Find the winning move of a root proven won before it was expanded.
+
+        Tree reuse can promote a leaf the endgame solver proved; its
+        children are solved directly (mostly from the solver's cache)
+        until the winning one turns up.
+        """
+        tree = self.tree
+        if self.solver is None or tree.proven[0] >= 0 or board.winner:
+            return
+        if not tree.num_children[0] and not self._expand(0, board):
+            return
+        start = tree.first_child[0]
+        end = start + tree.num_children[0]
+        if (tree.proven[start:end] > 0).any():
+            return
+        player = board.to_move
+        for child in range(start, end):
+            if tree.proven[child]:
+                continue
+            board.make_move(int(tree.move[child]))
+            winner = board.winner or self.solver.solve(board, self.solver_max_nodes)
+            board.unmake_move()
+            if winner:
+                tree.proven[child] = 1 if winner == player else -1
+                stats.solved_nodes += 1
+                if winner == player:
+                    return
+    
+    def _best_move(self, board: BitBoard, game_state: HexGame) -> Tuple[int, int]:
+        """The root's best child (a proven win even if never visited), else a random move."""
+        tree = self.tree
+        best = tree.best_child(0)
+        if best >= 0 and (tree.visits[best] > 0 or tree.proven[best] > 0):
+            return board.coords(int(tree.move[best]))
+        valid_moves = game_state.get_valid_moves()
+        return random.choice(valid_moves) if valid_moves else (0, 0)
+    
+    def _fill_stats(self, stats: SearchStats, simulations: int, elapsed: float,
+                    phase_times: List[float], max_depth: int, start_size: int):
+        """Copy the search counters and the current tree summary into ``stats``."""
+        stats.simulations = simulations
+        stats.playouts = simulations * self.batch_size
+        stats.elapsed = elapsed
+        stats.phase_times = dict(zip(PHASES, phase_times))
+        stats.max_depth = max_depth
+        stats.nodes_allocated = int(self.tree.size) - start_size
+        stats.capture_tree(self.tree)
+    
+    def _record_error(self, game_state: HexGame, error: Exception):
+        """Keep the failure in ``last_stats`` so callers can see why the move was random."""
+        stats = SearchStats(game_state.board_size)
+        stats.error = f"{type(error).__name__}: {error}"
+        self.last_stats = stats
+    
+    def _root_visits(self, num_cells: int) -> np.ndarray:
+        """Visit count of every root move, indexed by cell."""
+        tree = self.tree
+        start = tree.first_child[0]
+        end = start + tree.num_children[0]
+        visits = np.zeros(num_cells, dtype=np.int64)
+        visits[tree.move[start:end].astype(np.intp)] = tree.visits[start:end]
+        return visits
+    
+    def _advance_root(self, moves: List[int]) -> int:
+        """Re-root the kept tree at the position reached by ``moves``.
+
+        Follows the moves played since the last search (normally our move and
+        the opponent's reply) down the tree. Returns the visits inherited by
+        the new root, or 0 after falling back to a fresh tree.
+        """
+        tree = self.tree
+        previous = self.tree_moves
+        if (not self.reuse_tree or previous is None or len(moves) < len(previous)
+                or moves[:len(previous)] != previous):
+            tree.reset()
+            return 0
+
+        node = 0
+        for cell in moves[len(previous):]:
+            node = tree.find_child(node, cell)
+            if node < 0:
+                tree.reset()
+                return 0
+        tree.promote(node)
+        return int(tree.visits[0])
+    
+    def _expand(self, node: int, board: BitBoard) -> bool:
+        """Add children for every legal move of the position on ``board``."""
+        moves = self._shuffled_moves(board)
+        # Symmetric positions share transposition table entries
+        keys = board.child_canonical_hashes(moves)
+        return self.tree.expand(node, moves, keys)
+    
+    def _update_transpositions(self, path: List[int], root_depth: int, result: float):
+        """Share this simulation's result with every position on the path."""
+        keys = self.tree.key[path]
+        depths = np.arange(root_depth, root_depth + len(path), dtype=np.int16)
+        wins = np.empty(len(path))
+        wins[0::2] = 1.0 - result  # positions reached by the root player's opponent
+        wins[1::2] = result
+        self.transpositions.update(keys, depths, wins)
+    
+    def _shuffled_moves(self, board: BitBoard) -> List[int]:
+        """Legal moves in random order, so unvisited children are tried randomly.
+
+        With inferior cell pruning only the analysis' candidates are kept.
+        """
+        moves = []
+        if self.inferior is not None:
+            moves = list(self.inferior.analyze(board).candidates)
+        if not moves:
+            moves = board.empty_cells()
+        self.rng.shuffle(moves)
+        return moves
+    
+    def _fill_inferior(self, board: BitBoard) -> Optional[List[int]]:
+        """Add the leaf's dead and captured cells to ``board.stones`` for a playout.
+
+        Returns the original stones for the caller to put back, or None if
+        nothing was filled. Truncated playouts keep the real position, since
+        they rely on the union-find.
+        """
+        if self.inferior is None or board.winner or self.rollout_policy == "truncated":
+            return None
+        fill = self.inferior.analyze(board).fill
+        if not fill[1] | fill[2]:
+            return None
+        stones = board.stones
+        board.stones = [0, stones[1] | fill[1], stones[2] | fill[2]]
+        return stones
     
     def get_move_result(self) -> Optional[Tuple[int, int]]:
         """Check if AI has completed its calculation."""
@@ -0,0 +1,165 @@
+# arena.py
+"""Headless engine-vs-engine tournaments with Elo reporting.
+
+Usage:
+    python arena.py --engine Medium --engine Hard --games 40
+    python arena.py --engine Expert --engine 'uct={"base": "Expert", "rave_k": 0}' --workers 8
+
+An engine is either a difficulty name from ``Config.DIFFICULTY_LEVELS`` or
+``label=JSON`` with search settings; ``"base"`` in the JSON starts from a
+difficulty level and overrides the given keys. Every pair plays
+``--games`` games, alternating colours. Engines search in one process
+each (``workers`` is forced to 1); the cores go to parallel matches instead.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+from ai import HexAI
+from config import Config
+from hex_game import HexGame, Player
+
+def parse_engine(spec: str) -> Tuple[str, Dict]:
+    """Turn a command-line engine spec into (label, settings)."""
+    if "=" not in spec:
+        if spec not in Config.DIFFICULTY_LEVELS:
+            raise ValueError(f"unknown difficulty {spec!r}; use one of {list(Config.DIFFICULTY_LEVELS)} or label=JSON")
+        return spec, dict(Config.DIFFICULTY_LEVELS[spec])
+
+    label, raw = spec.split("=", 1)
+    custom = json.loads(raw)
+    base = custom.pop("base", None)
+    settings = dict(Config.DIFFICULTY_LEVELS[base]) if base else {}
+    settings.update(custom)
+    if "simulations" not in settings or "time_limit" not in settings:
+        raise ValueError(f"engine {label!r} needs simulations and time_limit (or a base level)")
+    return label, settings
+
+def play_game(red_settings: Dict, blue_settings: Dict, board_size: int, seed: int):
+    """Play one game between two engines.
+
+    Returns (winner value, [red think seconds, red moves], [blue think seconds, blue moves]).
+    """
+    engines = {Player.PLAYER1: HexAI(dict(red_settings, workers=1, ponder_time=0)),
+               Player.PLAYER2: HexAI(dict(blue_settings, workers=1, ponder_time=0))}
+    for offset, ai in enumerate(engines.values()):
+        ai.rng.seed(seed * 2 + offset)
+        ai.np_rng = np.random.default_rng(seed * 2 + offset)
+
+    thinking = {Player.PLAYER1: [0.0, 0], Player.PLAYER2: [0.0, 0]}
+    game = HexGame(board_size)
+    while not game.is_game_over():
+        player = game.current_player
+        start = time.perf_counter()
+        move = engines[player].get_best_move(game)
+        thinking[player][0] += time.perf_counter() - start
+        thinking[player][1] += 1
+        game.make_move(move[0], move[1])
+    return game.winner.value, thinking[Player.PLAYER1], thinking[Player.PLAYER2]
+
+def elo_from_score(score: float, games: int, z: float = 1.96) -> Tuple[float, float, float]:
+    """Elo difference for a score fraction, with a Wilson 95% confidence interval.
+
+    With no games the difference is unknown: NaN with infinite bounds.
+    """
+    if games <= 0:
+        return math.nan, -math.inf, math.inf
+
+    def to_elo(s: float) -> float:
+        s = min(max(s, 1e-3), 1 - 1e-3)
+        return -400 * math.log10(1 / s - 1)
+
+    denominator = 1 + z * z / games
+    center = (score + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(score * (1 - score) / games + z * z / (4 * games * games)) / denominator
+    return to_elo(score), to_elo(center - margin), to_elo(center + margin)
+
+def fit_ratings(labels: List[str], results: Dict[Tuple[str, str], List[int]], iterations: int = 200) -> Dict[str, float]:
+    """Bradley-Terry ratings from all pairings, anchored so the first engine is 0."""
+    strength = {label: 1.0 for label in labels}
+    for _ in range(iterations):
+        for label in labels:
+            wins = 0.0
+            denominator = 0.0
+            for (a, b), (a_wins, games) in results.items():
+                if label not in (a, b):
+                    continue
+                other = b if label == a else a
+                wins += a_wins if label == a else games - a_wins
+                denominator += games / (strength[label] + strength[other])
+            # A drawn game against a rating-0 opponent keeps undefeated engines finite
+            wins += 0.5
+            denominator += 1.0 / (strength[label] + 1.0)
+            strength[label] = wins / denominator
+    anchor = strength[labels[0]]
+    return {label: 400 * math.log10(strength[label] / anchor) for label in labels}
+
+def run_tournament(engines: List[Tuple[str, Dict]], games: int, board_size: int = Config.BOARD_SIZE,
+                   workers: int = os.cpu_count() or 1, seed: int = 0):
+    """Round robin between ``engines``; prints a report and returns the pair results."""
+    labels = [label for label, _ in engines]
+    settings = dict(engines)
+    results: Dict[Tuple[str, str], List[int]] = {}
+    thinking = {label: [0.0, 0] for label in labels}
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        jobs = []
+        for a, b in itertools.combinations(labels, 2):
+            results[(a, b)] = [0, games]
+            for game_num in range(games):
+                a_is_red = game_num % 2 == 0
+                red, blue = (a, b) if a_is_red else (b, a)
+                future = pool.submit(play_game, settings[red], settings[blue], board_size,
+                                     seed + len(jobs))
+                jobs.append((future, a, b, red, blue))
+
+        for future, a, b, red, blue in jobs:
+            winner, red_time, blue_time = future.result()
+            if (winner == Player.PLAYER1.value) == (red == a):
+                results[(a, b)][0] += 1
+            for label, (seconds, moves) in ((red, red_time), (blue, blue_time)):
+                thinking[label][0] += seconds
+                thinking[label][1] += moves
+
+    print(f"\n{board_size}x{board_size}, {games} games per pairing\n")
+    print(f"{'pairing':<32} {'score':>9} {'Elo diff':>9} {'95% CI':>17}")
+    for (a, b), (a_wins, played) in results.items():
+        elo, low, high = elo_from_score(a_wins / played if played else math.nan, played)
+        print(f"{a + ' vs ' + b:<32} {a_wins:>4}/{played:<4} {elo:>+9.0f} {f'[{low:+.0f}, {high:+.0f}]':>17}")
+
+    ratings = fit_ratings(labels, results)
+    print(f"\n{'engine':<20} {'Elo':>7} {'win rate':>9} {'ms/move':>9}")
+    for label in sorted(labels, key=ratings.get, reverse=True):
+        won = sum(a_wins if label == a else played - a_wins
+                  for (a, b), (a_wins, played) in results.items() if label in (a, b))
+        played = sum(played for (a, b), (_, played) in results.items() if label in (a, b))
+        seconds, moves = thinking[label]
+        print(f"{label:<20} {ratings[label]:>+7.0f} {won / played:>9.1%} {1000 * seconds / max(moves, 1):>9.1f}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Play engine configurations against each other.")
+    parser.add_argument("--engine", action="append", required=True,
+                        help="difficulty name or label=JSON settings (repeat for each engine)")
+    parser.add_argument("--games", type=int, default=20, help="games per pairing")
+    parser.add_argument("--board-size", type=int, default=Config.BOARD_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel matches")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engines = [parse_engine(spec) for spec in args.engine]
+    if len(engines) < 2:
+        parser.error("need at least two engines")
+    if len({label for label, _ in engines}) != len(engines):
+        parser.error("engine labels must be unique")
+    run_tournament(engines, args.games, args.board_size, args.workers, args.seed)
+
+if __name__ == "__main__":
+    main()
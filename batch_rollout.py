@@ -0,0 +1,70 @@
+# batch_rollout.py
+"""Vectorized fill-the-board playouts: many random games per NumPy call."""
+
+import numpy as np
+from bitboard import BitBoard, mask_to_cells
+
+def random_fills(board: BitBoard, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Fill the empty cells ``count`` times in random order.
+
+    Returns a (count, size, size) int8 array of player values. The side to
+    move receives the first half (rounded up) of each random permutation,
+    exactly as in ``rollout.fill_playout``.
+    """
+    size = board.size
+    fills = np.zeros((count, size * size), dtype=np.int8)
+    fills[:, mask_to_cells(board.stones[1])] = 1
+    fills[:, mask_to_cells(board.stones[2])] = 2
+
+    empty = np.array(board.empty_cells(), dtype=np.intp)
+    if len(empty):
+        order = rng.random((count, len(empty))).argsort(axis=1)
+        cells = empty[order]
+        mover_share = (len(empty) + 1) // 2
+        rows = np.arange(count)[:, None]
+        fills[rows, cells[:, :mover_share]] = board.to_move
+        fills[rows, cells[:, mover_share:]] = 3 - board.to_move
+    return fills.reshape(count, size, size)
+
+def red_connects(red: np.ndarray) -> np.ndarray:
+    """Decide top-to-bottom connection for a (count, size, size) boolean stack.
+
+    Each row is packed into a uint64 so one dilation step is a handful of
+    shifts over a (count, size) array; seeds start on the top edge and grow
+    until nothing changes.
+    """
+    count, size, _ = red.shape
+    weights = np.left_shift(np.uint64(1), np.arange(size, dtype=np.uint64))
+    stones = (red.astype(np.uint64) * weights).sum(axis=2, dtype=np.uint64)
+    full = np.uint64((1 << size) - 1)
+    one = np.uint64(1)
+
+    reach = np.zeros_like(stones)
+    reach[:, 0] = stones[:, 0]
+    while True:
+        grown = reach | ((reach << one) & full) | (reach >> one)
+        # Neighbours (r-1, c) and (r-1, c+1) lie in the row above
+        grown[:, 1:] |= reach[:, :-1] | (reach[:, :-1] >> one)
+        # Neighbours (r+1, c) and (r+1, c-1) lie in the row below
+        grown[:, :-1] |= reach[:, 1:] | ((reach[:, 1:] << one) & full)
+        grown &= stones
+        if np.array_equal(grown, reach):
+            return reach[:, -1] != 0
+        reach = grown
+
+def batch_fill(board: BitBoard, count: int, rng: np.random.Generator):
+    """Play ``count`` fill-the-board playouts.
+
+    Returns (winners, fills): a (count,) array of winners (1 or 2) and the
+    (count, size, size) final boards.
+    """
+    fills = random_fills(board, count, rng)
+    if board.winner:
+        return np.full(count, board.winner, dtype=np.int8), fills
+    return np.where(red_connects(fills == 1), 1, 2).astype(np.int8), fills
+
+def batch_fill_winners(board: BitBoard, count: int, rng: np.random.Generator) -> np.ndarray:
+    """Play ``count`` fill-the-board playouts and return their winners (1 or 2)."""
+    if board.winner:
+        return np.full(count, board.winner, dtype=np.int8)
+    return batch_fill(board, count, rng)[0]
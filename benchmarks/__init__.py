@@ -0,0 +1 @@
+"""Performance benchmarks for the Hex engine (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,64 @@
+# benchmarks/engine_server.py
+"""Load test for the engine server: many clients playing engine-vs-engine games at once."""
+
+import argparse
+import asyncio
+import json
+import time
+from engine_server import EngineServer
+from parallel_search import shutdown_pools
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, **fields) -> dict:
+    writer.write(json.dumps(fields).encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    if not reply["ok"]:
+        raise RuntimeError(reply["error"])
+    return reply
+
+async def play_games(port: int, games: int, size: int, difficulty: str, time_limit: float) -> int:
+    """One client: play ``games`` games against the server itself; returns moves played."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    moves = 0
+    for _ in range(games):
+        game = (await request(reader, writer, cmd="new_game", size=size, difficulty=difficulty,
+                              time_limit=time_limit))["game"]
+        while not (await request(reader, writer, cmd="genmove", game=game))["winner"]:
+            moves += 1
+        await request(reader, writer, cmd="close", game=game)
+        moves += 1
+    writer.close()
+    return moves
+
+async def run(args) -> dict:
+    server = EngineServer(args.workers)
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    start = time.perf_counter()
+    moves = await asyncio.gather(*(play_games(port, args.games, args.size, args.difficulty, args.time_limit)
+                                   for _ in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    listener.close()
+    stats = server.stats()
+    stats["moves_per_second"] = sum(moves) / elapsed
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--games", type=int, default=1, help="games per client")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--size", type=int, default=7)
+    parser.add_argument("--difficulty", default="Easy")
+    parser.add_argument("--time-limit", type=float, default=0.05)
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args))
+    shutdown_pools()
+    print(f"{args.clients} clients x {args.games} games on {args.workers} workers: "
+          f"{stats['completed']} moves, {stats['moves_per_second']:.1f} moves/s")
+    for name in ("latency_ms", "queue_wait_ms"):
+        print(f"{name:>14}: " + ", ".join(f"{key} {value:.0f}" for key, value in stats[name].items()))
+
+if __name__ == "__main__":
+    main()
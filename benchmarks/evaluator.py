@@ -0,0 +1,67 @@
+# benchmarks/evaluator.py
+"""Policy/value network evaluations/sec by batch size, raw and inside the search."""
+
+import argparse
+import time
+import numpy as np
+from ai import HexAI
+from hex_game import HexGame
+from policy_net import PolicyValueNet
+
+def random_positions(size: int, count: int, rng: np.random.Generator):
+    """Mid-game positions: a random third of the board filled alternately."""
+    n = size * size
+    boards = np.zeros((count, n), dtype=np.int8)
+    stones = n // 3
+    for board in boards:
+        cells = rng.permutation(n)[:stones]
+        board[cells[0::2]] = 1
+        board[cells[1::2]] = 2
+    to_move = np.full(count, 1 if stones % 2 == 0 else 2, dtype=np.int8)
+    return boards, to_move
+
+def evaluations_per_second(net: PolicyValueNet, batch_size: int, duration: float) -> float:
+    """Positions evaluated per second when calling ``evaluate`` on batches of ``batch_size``."""
+    boards, to_move = random_positions(net.size, batch_size, np.random.default_rng(batch_size))
+    net.evaluate(boards, to_move)
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        net.evaluate(boards, to_move)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return calls * batch_size / elapsed
+
+def search_rate(net: PolicyValueNet, leaf_batch: int, duration: float) -> float:
+    """Simulations/sec of a network-guided search from the empty board."""
+    ai = HexAI({"simulations": float("inf"), "time_limit": duration, "evaluator": net,
+                "leaf_batch": leaf_batch, "reuse_tree": False, "early_stop": False})
+    ai._mcts_search(HexGame(net.size))
+    return ai.last_stats.simulations_per_second
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--weights", help="weights file (default: random weights)")
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 128, 256])
+    parser.add_argument("--leaf-batches", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    net = PolicyValueNet.load(args.weights) if args.weights else PolicyValueNet(args.size, args.hidden, seed=0)
+    print(f"{net.size}x{net.size}, hidden {net.hidden}\n")
+    print(f"{'batch':>6} {'evals/s':>10} {'speedup':>8}")
+    base = None
+    for batch_size in args.batch_sizes:
+        rate = evaluations_per_second(net, batch_size, args.duration)
+        base = base or rate
+        print(f"{batch_size:>6} {rate:>10,.0f} {rate / base:>7.1f}x")
+
+    print(f"\n{'leaves':>6} {'sims/s':>10}")
+    for leaf_batch in args.leaf_batches:
+        print(f"{leaf_batch:>6} {search_rate(net, leaf_batch, args.duration):>10,.0f}")
+
+if __name__ == "__main__":
+    main()
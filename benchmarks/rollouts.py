@@ -0,0 +1,72 @@
+# benchmarks/rollouts.py
+"""Playouts/sec and head-to-head strength of the rollout policies."""
+
+import argparse
+import random
+import time
+from typing import Dict, Tuple
+from arena import play_game
+from bitboard import BitBoard
+from hex_game import Player
+from rollout import ROLLOUT_POLICIES
+
+def playouts_per_second(policy: str, board_size: int, duration: float = 1.0) -> Tuple[float, float]:
+    """Return (playouts/sec, fraction of playouts that reach a winner)."""
+    rollout = ROLLOUT_POLICIES[policy]
+    rng = random.Random(0)
+    board = BitBoard(board_size)
+    playouts = 0
+    decided = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        if rollout(board, rng)[0]:
+            decided += 1
+        while board.moves:
+            board.unmake_move()
+        playouts += 1
+    elapsed = time.perf_counter() - start
+    return playouts / elapsed, decided / playouts
+
+def play_match(settings_a: Dict, settings_b: Dict, board_size: int, games: int) -> float:
+    """Play ``games`` games alternating colours; return A's win rate."""
+    wins = 0
+    for game_num in range(games):
+        a_is_red = game_num % 2 == 0
+        red, blue = (settings_a, settings_b) if a_is_red else (settings_b, settings_a)
+        winner, _, _ = play_game(red, blue, board_size, seed=game_num)
+        if (winner == Player.PLAYER1.value) == a_is_red:
+            wins += 1
+    return wins / games
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--match-size", type=int, default=7)
+    parser.add_argument("--simulations", type=int, default=200)
+    parser.add_argument("--time-limit", type=float, default=0.2,
+                        help="seconds per move for the equal-time matches")
+    args = parser.parse_args()
+
+    print(f"Playouts from the empty {args.size}x{args.size} board")
+    for policy in ROLLOUT_POLICIES:
+        rate, decided = playouts_per_second(policy, args.size)
+        print(f"  {policy:>10}: {rate:>10,.0f} playouts/s, {decided:.0%} reach a winner")
+
+    # Equal simulations shows playout quality; equal time shows strength per CPU second
+    print(f"\nAgainst fill on {args.match_size}x{args.match_size}, {args.games} games each")
+    for policy in ROLLOUT_POLICIES:
+        if policy == "fill":
+            continue
+        budgets = {
+            f"{args.simulations} simulations": {"simulations": args.simulations, "time_limit": 60.0},
+            f"{args.time_limit:g}s per move": {"simulations": float("inf"), "time_limit": args.time_limit,
+                                               "early_stop": False},
+        }
+        for name, budget in budgets.items():
+            win_rate = play_match(dict(budget, rollout=policy), dict(budget, rollout="fill"),
+                                  args.match_size, args.games)
+            print(f"  {policy:>10} vs fill, {name:<18}: {policy} wins {win_rate:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# benchmarks/suite.py
+"""Throughput of the HexGame and MCTS hot paths, with JSON output and baseline checks.
+
+Usage:
+    python -m benchmarks.suite --out bench.json --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.10
+
+Every metric is a number with a unit and a direction; a run compared with a
+baseline exits with status 1 when any metric is worse by more than the
+threshold (a fraction of the baseline value).
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from ai import HexAI
+from hex_game import HexGame, Player
+
+SIZES = (7, 11, 14, 19)
+
+def _random_orders(board_size: int, games: int, seed: int) -> List[List[int]]:
+    """Pre-generate move orders so every run plays identical games."""
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(games):
+        cells = list(range(board_size * board_size))
+        rng.shuffle(cells)
+        orders.append(cells)
+    return orders
+
+def _midgame_positions(board_size: int, count: int, seed: int) -> List[HexGame]:
+    """Unfinished positions with about half of the board filled."""
+    positions = []
+    for order in _random_orders(board_size, count * 4, seed):
+        game = HexGame(board_size)
+        for cell in order[:board_size * board_size // 2]:
+            game.make_move(*divmod(cell, board_size))
+            if game.is_game_over():
+                break
+        if not game.is_game_over():
+            positions.append(game)
+        if len(positions) == count:
+            break
+    return positions
+
+def _rate(operation: Callable[[], int], duration: float) -> float:
+    """Repeat ``operation`` (which returns the calls it made) for ``duration`` seconds."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        calls += operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= duration:
+            return calls / elapsed
+
+def bench_make_move(board_size: int, duration: float, seed: int) -> float:
+    """Moves/sec playing random games to the end through ``HexGame.make_move``."""
+    orders = iter(_random_orders(board_size, 10000, seed))
+
+    def play_one() -> int:
+        game = HexGame(board_size)
+        for moves, cell in enumerate(next(orders), 1):
+            game.make_move(*divmod(cell, board_size))
+            if game.winner:
+                return moves
+        return board_size * board_size
+    return _rate(play_one, duration)
+
+def bench_positions(board_size: int, duration: float, seed: int) -> Dict[str, float]:
+    """Calls/sec of ``check_winner``, ``get_valid_moves`` and ``copy`` on mid-game positions."""
+    positions = _midgame_positions(board_size, 50, seed)
+
+    def check_winner() -> int:
+        for game in positions:
+            game.check_winner(Player.PLAYER1)
+            game.check_winner(Player.PLAYER2)
+        return 2 * len(positions)
+
+    def get_valid_moves() -> int:
+        for game in positions:
+            game.get_valid_moves()
+        return len(positions)
+
+    def copy() -> int:
+        for game in positions:
+            game.copy()
+        return len(positions)
+
+    return {
+        "check_winner": _rate(check_winner, duration),
+        "get_valid_moves": _rate(get_valid_moves, duration),
+        "copy": _rate(copy, duration),
+    }
+
+def bench_search(board_size: int, duration: float, seed: int) -> Dict[str, float]:
+    """Simulations/sec of ``_mcts_search`` from the empty board and its memory use."""
+    ai = HexAI({"simulations": float("inf"), "time_limit": duration, "reuse_tree": False, "early_stop": False})
+    ai.rng.seed(seed)
+    game = HexGame(board_size)
+    start = time.perf_counter()
+    ai._mcts_search(game)
+    simulations_per_sec = ai.last_playouts / (time.perf_counter() - start)
+
+    # Second, shorter run under tracemalloc for the peak allocated while searching
+    ai.rng.seed(seed)
+    tracemalloc.start()
+    ai._mcts_search(game, time_limit=duration / 4)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "simulations": simulations_per_sec,
+        "tree_kb_per_1k_nodes": ai.tree.nbytes() / ai.tree.capacity * 1000 / 1024,
+        "search_peak_kb_per_1k_nodes": peak / max(int(ai.tree.size), 1) * 1000 / 1024,
+    }
+
+def run_suite(sizes: List[int], duration: float, seed: int = 0) -> Dict[str, Dict]:
+    """Run every benchmark; returns {metric name: {"value", "unit", "higher_is_better"}}."""
+    results = {}
+
+    def record(name: str, value: float, unit: str, higher_is_better: bool = True):
+        results[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"  {name:<40} {value:>14,.1f} {unit}")
+
+    for size in sizes:
+        print(f"{size}x{size}")
+        record(f"make_move/{size}", bench_make_move(size, duration, seed), "moves/s")
+        for name, rate in bench_positions(size, duration, seed).items():
+            record(f"{name}/{size}", rate, "calls/s")
+        search = bench_search(size, duration, seed)
+        record(f"mcts_search/{size}", search["simulations"], "simulations/s")
+        record(f"tree_memory/{size}", search["tree_kb_per_1k_nodes"], "KiB per 1k nodes", False)
+        record(f"search_peak_memory/{size}", search["search_peak_kb_per_1k_nodes"], "KiB per 1k nodes", False)
+    return results
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Print the change of every metric against ``baseline``; return the regressed names."""
+    regressions = []
+    print(f"\n{'metric':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, metric in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]["value"]
+        new = metric["value"]
+        change = (new - old) / old if old else 0.0
+        worse = -change if metric["higher_is_better"] else change
+        flag = ""
+        if worse > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40} {old:>14,.1f} {new:>14,.1f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--save-baseline", help="also write the results here as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown as a fraction of the baseline (default 0.10)")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.duration, args.seed)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "duration": args.duration,
+        "metrics": results,
+    }
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["metrics"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
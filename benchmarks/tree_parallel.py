@@ -0,0 +1,47 @@
+# benchmarks/tree_parallel.py
+"""Simulations/sec and scaling efficiency of tree-parallel search by worker count."""
+
+import argparse
+import os
+from ai import HexAI
+from hex_game import HexGame
+from parallel_search import shutdown_pools
+
+def simulations_per_second(workers: int, board_size: int, duration: float, batch_size: int) -> float:
+    """Rate of one tree-parallel search from the empty board (pool already warm)."""
+    settings = {"simulations": float("inf"), "time_limit": duration, "workers": workers, "parallel": "tree",
+                "batch_size": batch_size, "reuse_tree": False, "early_stop": False}
+    ai = HexAI(settings)
+    game = HexGame(board_size)
+    # Start the pool's processes outside the measurement
+    ai.time_limit = 0.2
+    ai._tree_parallel_search(game)
+    ai.time_limit = duration
+    ai._tree_parallel_search(game)
+    return ai.last_stats.simulations / ai.last_stats.elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--size", type=int, default=11)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--batch-size", type=int, default=1, help="playouts per leaf")
+    args = parser.parse_args()
+
+    sequential = HexAI({"simulations": float("inf"), "time_limit": args.duration, "batch_size": args.batch_size,
+                        "reuse_tree": False, "early_stop": False})
+    sequential._mcts_search(HexGame(args.size))
+    print(f"{args.size}x{args.size}, {os.cpu_count()} CPUs, batch size {args.batch_size}")
+    print(f"single-process search: {sequential.last_stats.simulations_per_second:,.0f} simulations/s\n")
+
+    print(f"{'workers':>7} {'sims/s':>10} {'speedup':>8} {'efficiency':>11}")
+    base = None
+    for workers in args.workers:
+        rate = simulations_per_second(workers, args.size, args.duration, args.batch_size)
+        base = base or rate
+        speedup = rate / base
+        print(f"{workers:>7} {rate:>10,.0f} {speedup:>7.2f}x {speedup / workers * args.workers[0]:>10.0%}")
+    shutdown_pools()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/win_detection.py
+"""Moves/sec of union-find win detection versus the original per-move DFS."""
+
+import argparse
+import random
+import time
+import numpy as np
+from typing import List
+from bitboard import BitBoard
+
+class LegacyDFSBoard:
+    """The original NumPy board with a fresh DFS from the start edge after every move."""
+
+    def __init__(self, board_size: int):
+        self.board_size = board_size
+        self.board = np.zeros((board_size, board_size), dtype=int)
+        self.current_player = 1
+        self.winner = 0
+
+    def get_neighbors(self, row: int, col: int):
+        neighbors = []
+        directions = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, 1), (1, -1)]
+        for dr, dc in directions:
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < self.board_size and 0 <= new_col < self.board_size:
+                neighbors.append((new_row, new_col))
+        return neighbors
+
+    def make_move(self, row: int, col: int) -> bool:
+        if self.board[row, col] != 0 or self.winner:
+            return False
+        self.board[row, col] = self.current_player
+        if self.check_winner(self.current_player):
+            self.winner = self.current_player
+        else:
+            self.current_player = 3 - self.current_player
+        return True
+
+    def check_winner(self, player: int) -> bool:
+        n = self.board_size
+        starts = [(0, col) for col in range(n)] if player == 1 else [(row, 0) for row in range(n)]
+        for row, col in starts:
+            if self.board[row, col] == player and self._dfs_check(row, col, player):
+                return True
+        return False
+
+    def _dfs_check(self, row: int, col: int, player: int) -> bool:
+        visited = set()
+        stack = [(row, col)]
+        while stack:
+            curr_row, curr_col = stack.pop()
+            if (curr_row, curr_col) in visited:
+                continue
+            visited.add((curr_row, curr_col))
+            if player == 1 and curr_row == self.board_size - 1:
+                return True
+            if player == 2 and curr_col == self.board_size - 1:
+                return True
+            for next_row, next_col in self.get_neighbors(curr_row, curr_col):
+                if (next_row, next_col) not in visited and self.board[next_row, next_col] == player:
+                    stack.append((next_row, next_col))
+        return False
+
+def _random_games(board_size: int, games: int, seed: int) -> List[List[int]]:
+    """Pre-generate move orders so both engines play identical games."""
+    rng = random.Random(seed)
+    orders = []
+    for _ in range(games):
+        cells = list(range(board_size * board_size))
+        rng.shuffle(cells)
+        orders.append(cells)
+    return orders
+
+def bench_legacy(board_size: int, orders: List[List[int]]) -> float:
+    moves = 0
+    start = time.perf_counter()
+    for order in orders:
+        game = LegacyDFSBoard(board_size)
+        for cell in order:
+            game.make_move(*divmod(cell, board_size))
+            moves += 1
+            if game.winner:
+                break
+    return moves / (time.perf_counter() - start)
+
+def bench_union_find(board_size: int, orders: List[List[int]]) -> float:
+    moves = 0
+    start = time.perf_counter()
+    for order in orders:
+        board = BitBoard(board_size)
+        for cell in order:
+            board.make_move(cell)
+            moves += 1
+            if board.winner:
+                break
+    return moves / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[11, 14, 19])
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>5} {'DFS moves/s':>14} {'union-find moves/s':>20} {'speedup':>8}")
+    for size in args.sizes:
+        orders = _random_games(size, args.games, args.seed)
+        legacy = bench_legacy(size, orders)
+        union_find = bench_union_find(size, orders)
+        print(f"{size:>5} {legacy:>14,.0f} {union_find:>20,.0f} {union_find / legacy:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+# bitboard.py
+"""Compact bitboard representation of a Hex position."""
+
+import random
+import numpy as np
+from typing import Dict, List
+from union_find import UnionFind
+
+# Symmetries of the Hex board (see ``BoardTables.symmetry_cells``)
+IDENTITY, ROTATE, SWAP, SWAP_ROTATE = range(4)
+
+class BoardTables:
+    """Precomputed masks shared by every board of the same size."""
+
+    _cache: Dict[int, 'BoardTables'] = {}
+
+    def __init__(self, size: int):
+        self.size = size
+        self.num_cells = size * size
+        self.full_mask = (1 << self.num_cells) - 1
+
+        # Column masks used when shifting the whole board by one cell
+        first_col = 0
+        last_col = 0
+        for row in range(size):
+            first_col |= 1 << (row * size)
+            last_col |= 1 << (row * size + size - 1)
+        self.not_first_col = self.full_mask & ~first_col
+        self.not_last_col = self.full_mask & ~last_col
+
+        # Edge masks: Red connects top to bottom, Blue connects left to right
+        self.top = (1 << size) - 1
+        self.bottom = self.top << (size * (size - 1))
+        self.left = first_col
+        self.right = last_col
+
+        # Six directions for hex grid (same order as HexGame.get_neighbors)
+        directions = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, 1), (1, -1)]
+        self.neighbors: List[List[int]] = []
+        self.neighbor_masks: List[int] = []
+        for row in range(size):
+            for col in range(size):
+                cells = []
+                for dr, dc in directions:
+                    new_row, new_col = row + dr, col + dc
+                    if 0 <= new_row < size and 0 <= new_col < size:
+                        cells.append(new_row * size + new_col)
+                self.neighbors.append(cells)
+                mask = 0
+                for cell in cells:
+                    mask |= 1 << cell
+                self.neighbor_masks.append(mask)
+
+        # Virtual edge nodes for the union-find, after the real cells
+        self.TOP = self.num_cells
+        self.BOTTOM = self.num_cells + 1
+        self.LEFT = self.num_cells + 2
+        self.RIGHT = self.num_cells + 3
+        self.goals = [None, (self.TOP, self.BOTTOM), (self.LEFT, self.RIGHT)]
+
+        # edge_links[player][cell] lists the player's edge nodes touching that cell
+        self.edge_links: List[List[List[int]]] = [[], [], []]
+        for cell in range(self.num_cells):
+            row, col = divmod(cell, size)
+            red = []
+            if row == 0:
+                red.append(self.TOP)
+            if row == size - 1:
+                red.append(self.BOTTOM)
+            blue = []
+            if col == 0:
+                blue.append(self.LEFT)
+            if col == size - 1:
+                blue.append(self.RIGHT)
+            self.edge_links[1].append(red)
+            self.edge_links[2].append(blue)
+
+        # bridge_responses[player][cell] lists (stones mask, reply cell): when the
+        # opponent plays ``cell`` and ``player`` owns every stone in the mask,
+        # ``reply`` is the other carrier cell of a threatened two-bridge (or of
+        # a bridge from a second-row stone to ``player``'s own edge)
+        ring = [(0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1), (1, 0)]  # neighbours in circular order
+        self.bridge_responses: List[List[List[tuple]]] = [[], [], []]
+        for cell in range(self.num_cells):
+            row, col = divmod(cell, size)
+            entries = {1: [], 2: []}
+            for i in range(6):
+                (r1, c1), (r2, c2), (r3, c3) = (
+                    (row + dr, col + dc) for dr, dc in (ring[i], ring[(i + 1) % 6], ring[(i + 2) % 6]))
+                if not (0 <= r2 < size and 0 <= c2 < size):
+                    continue
+                reply = r2 * size + c2
+                ends = [(r, c) for r, c in ((r1, c1), (r3, c3)) if 0 <= r < size and 0 <= c < size]
+                if len(ends) == 2:
+                    need = (1 << (r1 * size + c1)) | (1 << (r3 * size + c3))
+                    entries[1].append((need, reply))
+                    entries[2].append((need, reply))
+                elif len(ends) == 1:
+                    need = 1 << (ends[0][0] * size + ends[0][1])
+                    off_row, off_col = (r3, c3) if ends[0] == (r1, c1) else (r1, c1)
+                    if 0 <= off_col < size:
+                        entries[1].append((need, reply))  # off the top or bottom: Red's edge
+                    elif 0 <= off_row < size:
+                        entries[2].append((need, reply))  # off the left or right: Blue's edge
+            self.bridge_responses[1].append(entries[1])
+            self.bridge_responses[2].append(entries[2])
+
+        # Zobrist keys; seeded by size so hashes agree across processes and runs
+        rng = random.Random(0x4E58 + size)
+        self.zobrist: List[List[int]] = [
+            [0] * self.num_cells,
+            [rng.getrandbits(64) for _ in range(self.num_cells)],
+            [rng.getrandbits(64) for _ in range(self.num_cells)],
+        ]
+        self.zobrist_side = rng.getrandbits(64)
+        self.zobrist_empty = rng.getrandbits(64)  # hash of the empty board, never 0
+        # Same keys as NumPy arrays for hashing many children at once
+        self.zobrist_array = [np.array(keys, dtype=np.uint64) for keys in self.zobrist]
+
+        # Board symmetries as cell permutations, each its own inverse:
+        # IDENTITY, ROTATE (180 degrees), SWAP (transpose with colours and
+        # side to move exchanged) and SWAP_ROTATE (both)
+        rows, cols = np.divmod(np.arange(self.num_cells), size)
+        self.symmetry_cells = np.stack([
+            rows * size + cols,
+            (size - 1 - rows) * size + (size - 1 - cols),
+            cols * size + rows,
+            (size - 1 - cols) * size + (size - 1 - rows),
+        ]).astype(np.intp)
+        # image_zobrist[symmetry][player][cell]: the key a stone contributes to
+        # the hash of the board's image under that symmetry
+        self.image_zobrist: List[List[List[int]]] = []
+        for symmetry, cells in enumerate(self.symmetry_cells.tolist()):
+            swap = symmetry >= SWAP
+            self.image_zobrist.append([[0] * self.num_cells] + [
+                [self.zobrist[3 - player if swap else player][cells[cell]] for cell in range(self.num_cells)]
+                for player in (1, 2)])
+        self.image_zobrist_array = [[np.array(keys, dtype=np.uint64) for keys in image]
+                                    for image in self.image_zobrist]
+
+    @classmethod
+    def get(cls, size: int) -> 'BoardTables':
+        """Return the (cached) tables for the given board size."""
+        tables = cls._cache.get(size)
+        if tables is None:
+            tables = cls(size)
+            cls._cache[size] = tables
+        return tables
+
+    def dilate(self, mask: int) -> int:
+        """Grow a set of cells by one step in every hex direction."""
+        n = self.size
+        grown = (mask
+                 | ((mask << 1) & self.not_first_col)
+                 | ((mask >> 1) & self.not_last_col)
+                 | (mask << n)
+                 | (mask >> n)
+                 | ((mask >> (n - 1)) & self.not_first_col)
+                 | ((mask << (n - 1)) & self.not_last_col))
+        return grown & self.full_mask
+
+class BitBoard:
+    """One integer bitmask per player, updated in place with make/unmake.
+
+    Cells are indexed row-major (``row * size + col``) and players use the
+    same values as ``Player`` (1 = Red, 2 = Blue, 0 = nobody). Stones are
+    merged into a ``UnionFind`` with virtual edge nodes as they are placed,
+    so a win is detected without scanning the board.
+    """
+
+    __slots__ = ('size', 'tables', 'stones', 'to_move', 'winner', 'moves', 'uf', 'checkpoints', 'hash',
+                 'hash_rotated', 'hash_swapped', 'hash_swapped_rotated')
+
+    def __init__(self, size: int = 11):
+        self.size = size
+        self.tables = BoardTables.get(size)
+        self.stones = [0, 0, 0]  # indexed by player value, slot 0 unused
+        self.to_move = 1
+        self.winner = 0
+        self.moves: List[int] = []
+        self.uf = UnionFind(self.tables.num_cells + 4)
+        self.checkpoints: List[int] = []  # union-find log length before each move
+        # Zobrist hash of the stones, toggled by zobrist_side after every move,
+        # and the hashes of the board's symmetric images (see ``canonical``)
+        self.hash = self.tables.zobrist_empty
+        self.hash_rotated = self.hash_swapped = self.hash_swapped_rotated = self.hash
+
+    def copy(self) -> 'BitBoard':
+        """Create an independent copy of this board."""
+        new_board = BitBoard.__new__(BitBoard)
+        new_board.size = self.size
+        new_board.tables = self.tables
+        new_board.stones = self.stones.copy()
+        new_board.to_move = self.to_move
+        new_board.winner = self.winner
+        new_board.moves = self.moves.copy()
+        new_board.uf = self.uf.copy()
+        new_board.checkpoints = self.checkpoints.copy()
+        new_board.hash = self.hash
+        new_board.hash_rotated = self.hash_rotated
+        new_board.hash_swapped = self.hash_swapped
+        new_board.hash_swapped_rotated = self.hash_swapped_rotated
+        return new_board
+
+    def load(self, stones: List[int]):
+        """Set up an arbitrary position and rebuild the connectivity.
+
+        The side to move follows the stone count (Red moves first), like
+        the side key of the hash; a connected player is the winner.
+        """
+        self.stones = [0, 0, 0]
+        self.moves = []
+        self.uf = UnionFind(self.tables.num_cells + 4)
+        self.checkpoints = []
+        hashes = [self.tables.zobrist_empty] * 4  # the position and its images
+        images = self.tables.image_zobrist
+        for player in (1, 2):
+            for cell in mask_to_cells(stones[player]):
+                self.checkpoints.append(self.uf.checkpoint())
+                self._join(cell, player)
+                self.stones[player] |= 1 << cell
+                self.moves.append(cell)
+                for symmetry in range(4):
+                    hashes[symmetry] ^= images[symmetry][player][cell]
+        if len(self.moves) % 2:
+            hashes = [key ^ self.tables.zobrist_side for key in hashes]
+        self.hash, self.hash_rotated, self.hash_swapped, self.hash_swapped_rotated = hashes
+        self.to_move = 2 if len(self.moves) % 2 else 1
+        self.winner = 0
+        for player in (1, 2):
+            if self.connected(player):
+                # After a win ``to_move`` stays with the winner, as in make_move
+                self.winner = self.to_move = player
+
+    def cell(self, row: int, col: int) -> int:
+        """Convert (row, col) to a cell index."""
+        return row * self.size + col
+
+    def coords(self, cell: int):
+        """Convert a cell index to (row, col)."""
+        return divmod(cell, self.size)
+
+    def occupied_mask(self) -> int:
+        return self.stones[1] | self.stones[2]
+
+    def empty_mask(self) -> int:
+        return self.tables.full_mask & ~(self.stones[1] | self.stones[2])
+
+    def empty_cells(self) -> List[int]:
+        """List the empty cells in row-major order."""
+        return mask_to_cells(self.empty_mask())
+
+    def get(self, cell: int) -> int:
+        """Return the player value occupying a cell (0 if empty)."""
+        bit = 1 << cell
+        if self.stones[1] & bit:
+            return 1
+        if self.stones[2] & bit:
+            return 2
+        return 0
+
+    def make_move(self, cell: int) -> bool:
+        """Place a stone for the side to move; return False if illegal."""
+        bit = 1 << cell
+        if self.winner or (self.stones[1] | self.stones[2]) & bit:
+            return False
+
+        player = self.to_move
+        self.checkpoints.append(len(self.uf.log))
+        self._join(cell, player)
+        self.stones[player] |= bit
+        self.moves.append(cell)
+        side = self.tables.zobrist_side
+        images = self.tables.image_zobrist
+        self.hash ^= images[0][player][cell] ^ side
+        self.hash_rotated ^= images[1][player][cell] ^ side
+        self.hash_swapped ^= images[2][player][cell] ^ side
+        self.hash_swapped_rotated ^= images[3][player][cell] ^ side
+
+        start, goal = self.tables.goals[player]
+        uf = self.uf
+        if uf.find(start) == uf.find(goal):
+            self.winner = player
+        else:
+            self.to_move = 3 - player
+        return True
+
+    def _join(self, cell: int, player: int):
+        """Union a new stone with its same-coloured neighbours and edges."""
+        tables = self.tables
+        uf = self.uf
+        stones = self.stones[player]
+        for other in tables.neighbors[cell]:
+            if stones >> other & 1:
+                uf.union(cell, other)
+        for edge in tables.edge_links[player][cell]:
+            uf.union(cell, edge)
+
+    def unmake_move(self) -> int:
+        """Take back the last stone and return its cell."""
+        cell = self.moves.pop()
+        bit = 1 << cell
+        player = 1 if self.stones[1] & bit else 2
+        self.stones[player] &= ~bit
+        self.uf.rollback(self.checkpoints.pop())
+        side = self.tables.zobrist_side
+        images = self.tables.image_zobrist
+        self.hash ^= images[0][player][cell] ^ side
+        self.hash_rotated ^= images[1][player][cell] ^ side
+        self.hash_swapped ^= images[2][player][cell] ^ side
+        self.hash_swapped_rotated ^= images[3][player][cell] ^ side
+        self.to_move = player
+        self.winner = 0
+        return cell
+
+    def canonical(self):
+        """(canonical hash, symmetry) of the position, seen by the side to move.
+
+        Positions that differ by a symmetry (and for swaps, by who is to
+        move) share the canonical hash, so results for the side to move can
+        be shared. Of the images with Red to move, the one with the smaller
+        hash is canonical; ``symmetry`` maps this board's cells onto it
+        (``tables.symmetry_cells[symmetry]``), and also back.
+        """
+        # After a win ``to_move`` stays with the winner; the loser would be next
+        mover = 3 - self.winner if self.winner else self.to_move
+        if mover == 1:
+            if self.hash <= self.hash_rotated:
+                return self.hash, IDENTITY
+            return self.hash_rotated, ROTATE
+        if self.hash_swapped <= self.hash_swapped_rotated:
+            return self.hash_swapped, SWAP
+        return self.hash_swapped_rotated, SWAP_ROTATE
+
+    def canonical_hash(self) -> int:
+        return self.canonical()[0]
+
+    def child_canonical_hashes(self, cells: List[int]) -> np.ndarray:
+        """Vectorized ``canonical_hash`` of the positions after each of ``cells``."""
+        images = self.tables.image_zobrist_array
+        side = self.tables.zobrist_side
+        player = self.to_move
+        if player == 2:
+            # Red moves next: compare the child and its rotation
+            first = np.uint64(self.hash ^ side) ^ images[IDENTITY][player][cells]
+            second = np.uint64(self.hash_rotated ^ side) ^ images[ROTATE][player][cells]
+        else:
+            first = np.uint64(self.hash_swapped ^ side) ^ images[SWAP][player][cells]
+            second = np.uint64(self.hash_swapped_rotated ^ side) ^ images[SWAP_ROTATE][player][cells]
+        return np.minimum(first, second)
+
+    def child_hash(self, cell: int) -> int:
+        """Hash of the position after the side to move plays ``cell``."""
+        return self.hash ^ self.tables.zobrist[self.to_move][cell] ^ self.tables.zobrist_side
+
+    def child_hashes(self, cells: List[int]) -> np.ndarray:
+        """Vectorized ``child_hash`` for a list of cells."""
+        base = np.uint64(self.hash ^ self.tables.zobrist_side)
+        return base ^ self.tables.zobrist_array[self.to_move][cells]
+
+    def group(self, cell: int, player: int) -> int:
+        """Flood fill the group of ``player`` stones containing ``cell``."""
+        stones = self.stones[player]
+        reached = 0
+        frontier = (1 << cell) & stones
+        while frontier:
+            reached |= frontier
+            frontier = self.tables.dilate(frontier) & stones & ~reached
+        return reached
+
+    def connected(self, player: int) -> bool:
+        """Check whether ``player`` connects their two edges."""
+        start, goal = self.tables.goals[player]
+        return self.uf.connected(start, goal)
+
+def spans_edges(tables: BoardTables, stones: int, player: int) -> bool:
+    """Flood fill ``stones`` from ``player``'s first edge and test the second.
+
+    Used where no union-find is maintained, e.g. on a filled playout board.
+    """
+    if player == 1:
+        start, goal = tables.top, tables.bottom
+    else:
+        start, goal = tables.left, tables.right
+
+    reached = 0
+    frontier = stones & start
+    while frontier:
+        reached |= frontier
+        if reached & goal:
+            return True
+        frontier = tables.dilate(frontier) & stones & ~reached
+    return False
+
+def masks_to_array(red: int, blue: int, num_cells: int) -> np.ndarray:
+    """Player values (0, 1, 2) per cell for a pair of stone masks."""
+    num_bytes = (num_cells + 7) // 8
+    red_bits = np.unpackbits(np.frombuffer(red.to_bytes(num_bytes, "little"), dtype=np.uint8),
+                             bitorder="little")[:num_cells]
+    blue_bits = np.unpackbits(np.frombuffer(blue.to_bytes(num_bytes, "little"), dtype=np.uint8),
+                              bitorder="little")[:num_cells]
+    return (red_bits + 2 * blue_bits).astype(np.int8)
+
+def mask_to_cells(mask: int) -> List[int]:
+    """Expand a bitmask into the list of set cell indices (ascending)."""
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
@@ -36,12 +36,76 @@ class Config:
     LABEL_FONT_SIZE = 20
     TITLE_FONT_SIZE = 32
     
+    # GUI frame rate while the AI is thinking; otherwise the GUI sleeps until
+    # an event arrives, waking at least every GUI_IDLE_TIMEOUT_MS
+    GUI_FPS = 60
+    GUI_IDLE_TIMEOUT_MS = 500
+    
+    # Search tree capacity (nodes preallocated per AI)
+    MAX_TREE_NODES = 1000000
+    
+    # AIs kept per pool worker process, one per distinct search settings
+    # (least recently used dropped first; each holds a full tree)
+    WORKER_AI_CACHE_SIZE = 4
+    
+    # RAVE: equivalence parameter k (0 = plain UCT) and the exploration
+    # constant used alongside it
+    RAVE_EQUIVALENCE = 300
+    RAVE_EXPLORATION = 0.25
+    
+    # Transposition table memory budget per AI, in MB (0 disables it)
+    TT_MEMORY_MB = 16
+    
+    # Time management: clock checked at most every N simulations, one
+    # extension by this factor when the runner-up has at least CLOSE_MOVE_RATIO
+    # of the leader's visits at the deadline
+    TIME_CHECK_INTERVAL = 16
+    TIME_EXTENSION = 1.5
+    CLOSE_MOVE_RATIO = 0.9
+    
+    # Tree-parallel search: virtual visits added to a pending path, and leaves
+    # sent to a rollout worker per job
+    VIRTUAL_LOSS = 1
+    TREE_PARALLEL_LEAVES = 8
+    
+    # Prune dead, captured and dominated cells from the search (see inferior_cells.py)
+    PRUNE_INFERIOR_CELLS = True
+    
+    # Endgame solver: leaves with at most this many empty cells are solved
+    # exactly, within a node budget per call
+    SOLVER_EMPTY_CELLS = 8
+    SOLVER_MAX_NODES = 2000
+    
+    # Policy/value network search: leaves evaluated per network call and the
+    # PUCT exploration constant
+    LEAF_BATCH_SIZE = 16
+    PUCT_EXPLORATION = 1.5
+    
+    # Engine server (engine_server.py): default port, searches allowed to wait
+    # for a worker, and seconds allowed beyond a search's time before it times out
+    SERVER_PORT = 7471
+    SERVER_MAX_QUEUE = 256
+    SERVER_GRACE_TIME = 2.0
+    
+    # Opening books (built by opening_book.py), one hex_<size>.hexb per board size
+    OPENING_BOOK_DIR = "books"
+    
     # Difficulty settings
+    # rollout: "fill" plays out the whole board, "bridge" fills it but answers bridge
+    # intrusions, "truncated" stops after 30 moves
+    # batch_size: vectorized playouts per leaf (1 = one pure-Python playout)
+    # workers: root-parallel searches, the AI thread's own plus workers - 1 processes
+    # parallel: "root" (independent searches, default) or "tree" (one shared tree, playouts in workers processes)
+    # ponder_time: seconds of background search on the human's turn (0 = off)
+    # game_time: seconds per game for all AI moves, split by game phase (0 = use time_limit)
+    # early_stop: stop once the best move can no longer change (default on)
+    # evaluator: policy/value network weights (.npz from policy_net.py) used instead of playouts
+    # book: opening book directory (default OPENING_BOOK_DIR, None = no book)
     DIFFICULTY_LEVELS = {
-        "Beginner": {"simulations": 10, "time_limit": 0.5},
-        "Easy": {"simulations": 50, "time_limit": 1.0},
-        "Medium": {"simulations": 100, "time_limit": 1.5},
-        "Hard": {"simulations": 200, "time_limit": 2.0},
-        "Expert": {"simulations": 400, "time_limit": 3.0},
-        "Unbeatable": {"simulations": 800, "time_limit": 4.0}
+        "Beginner": {"simulations": 10, "time_limit": 0.5, "rollout": "fill"},
+        "Easy": {"simulations": 50, "time_limit": 1.0, "rollout": "fill"},
+        "Medium": {"simulations": 100, "time_limit": 1.5, "rollout": "fill", "ponder_time": 2.0},
+        "Hard": {"simulations": 200, "time_limit": 2.0, "rollout": "fill", "workers": 2, "ponder_time": 5.0},
+        "Expert": {"simulations": 400, "time_limit": 3.0, "rollout": "fill", "workers": 4, "ponder_time": 10.0},
+        "Unbeatable": {"simulations": 800, "time_limit": 4.0, "rollout": "fill", "batch_size": 256, "workers": 8, "ponder_time": 20.0}
     }
\ No newline at end of file
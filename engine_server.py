@@ -0,0 +1,354 @@
+# engine_server.py
+"""Headless asyncio engine server: many concurrent games on one process pool.
+
+Usage:
+    python engine_server.py --port 7471 --workers 8
+
+Clients send one JSON object per line and get one JSON line back for each,
+with the request's ``id`` echoed. Requests on a connection are handled
+concurrently, so a client can run several games and cancel a search while
+it is thinking. Commands:
+
+    {"cmd": "new_game", "size": 11, "difficulty": "Medium", "time_limit": 1.0, "game_time": 0}
+        -> {"game": 3}
+    {"cmd": "play", "game": 3, "move": [5, 5]}            -> {"winner": 0}
+    {"cmd": "genmove", "game": 3, "play": true}           -> {"move": [r, c], "winner": 0, "search": {...}}
+    {"cmd": "cancel", "game": 3}                          -> the pending genmove fails with "cancelled"
+    {"cmd": "state", "game": 3}                           -> {"moves": [[r, c], ...], "to_move": 1, ...}
+    {"cmd": "close", "game": 3}
+    {"cmd": "stats"}                                      -> queue depth, latency percentiles, ...
+
+Failures come back as ``{"ok": false, "error": "..."}``. Searches run in the
+shared pool of ``parallel_search``, at most ``workers`` at a time; waiting
+searches form the queue, which is capped at ``max_queue``. A game's move
+time is its ``time_limit``, or its share of ``game_time`` when a per-game
+clock is set (``game_time`` 0 means none); both are positive seconds. A
+cancelled search that already started keeps its worker until its time
+runs out; its result is dropped. Games belong to the connection that
+created them and are closed when it disconnects.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import numpy as np
+from collections import deque
+from typing import Deque, Dict, Optional, Set
+from config import Config
+from hex_game import HexGame
+from parallel_search import get_pool, move_worker, shutdown_pools
+from time_manager import TimeManager
+
+class ServerError(Exception):
+    """A request that cannot be served; its message goes back to the client."""
+
+class EngineGame:
+    """One game hosted by the server."""
+
+    def __init__(self, game_id: int, size: int, settings: Dict, owner: object):
+        self.game_id = game_id
+        self.game = HexGame(size)
+        self.settings = settings
+        # Per-game clock; only its allocation is used, the search runs in a worker
+        self.clock = TimeManager(settings)
+        self.owner = owner
+        self.search: Optional[asyncio.Task] = None
+        self.cancelled = False
+
+    def move_time(self) -> float:
+        """Seconds for the next search: the fixed limit or a share of the clock."""
+        if self.clock.game_time > 0:
+            num_cells = self.game.bitboard.tables.num_cells
+            return self.clock.allocate(num_cells - len(self.game.bitboard.moves), num_cells)
+        return self.settings["time_limit"]
+
+class EngineServer:
+    """Serves the line-delimited JSON protocol (see the module docstring)."""
+
+    def __init__(self, workers: int = 4, max_queue: int = Config.SERVER_MAX_QUEUE,
+                 history: int = 1000, seed: Optional[int] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.games: Dict[int, EngineGame] = {}
+        self.next_game_id = 1
+        self.rng = random.Random(seed)
+        self.slots: Optional[asyncio.Semaphore] = None
+        self.waiting = 0  # searches queued for a worker
+        self.running = 0  # searches in the pool
+        self.completed = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.timeouts = 0
+        # Recent genmove latencies (request to reply) and queue waits, in seconds
+        self.latencies: Deque[float] = deque(maxlen=history)
+        self.queue_waits: Deque[float] = deque(maxlen=history)
+        self.started = time.perf_counter()
+        self.commands = {
+            "new_game": self._new_game,
+            "play": self._play,
+            "genmove": self._genmove,
+            "cancel": self._cancel,
+            "state": self._state,
+            "close": self._close,
+            "stats": self._stats,
+            "ping": self._ping,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = Config.SERVER_PORT) -> asyncio.AbstractServer:
+        """Start listening; the pool's processes are started here, not on the first move."""
+        self.slots = asyncio.Semaphore(self.workers)
+        pool = get_pool(self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, int, 0) for _ in range(self.workers)))
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read requests until EOF, answering each one from its own task."""
+        lock = asyncio.Lock()
+        tasks: Set[asyncio.Task] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            # Searches of this connection are cancelled with their tasks
+            for task in tasks:
+                task.cancel()
+            for game_id in [game_id for game_id, game in self.games.items() if game.owner is writer]:
+                del self.games[game_id]
+            writer.close()
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ServerError("request must be a JSON object")
+            request_id = request.get("id")
+            handler = self.commands.get(request.get("cmd"))
+            if handler is None:
+                raise ServerError(f"unknown command {request.get('cmd')!r}")
+            reply = dict(await handler(request, writer), ok=True)
+        except ServerError as e:
+            reply = {"ok": False, "error": str(e)}
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        if request_id is not None:
+            reply["id"] = request_id
+        async with lock:
+            writer.write(json.dumps(reply).encode() + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    def _game(self, request: Dict, writer: object) -> EngineGame:
+        game = self.games.get(request.get("game"))
+        if game is None or game.owner is not writer:
+            raise ServerError(f"no game {request.get('game')!r}")
+        return game
+
+    def _drop(self, game_id: int):
+        game = self.games.pop(game_id)
+        if game.search is not None:
+            game.cancelled = True
+            game.search.cancel()
+
+    async def _ping(self, request: Dict, writer: object) -> Dict:
+        return {}
+
+    async def _new_game(self, request: Dict, writer: object) -> Dict:
+        size = int(request.get("size", Config.BOARD_SIZE))
+        if not 2 <= size <= 19:
+            raise ServerError(f"board size must be 2 to 19, not {size}")
+        difficulty = request.get("difficulty", "Medium")
+        if difficulty not in Config.DIFFICULTY_LEVELS:
+            raise ServerError(f"unknown difficulty {difficulty!r}")
+        settings = dict(Config.DIFFICULTY_LEVELS[difficulty], workers=1, ponder_time=0)
+        if "time_limit" in request:
+            settings["time_limit"] = self._seconds(request, "time_limit")
+        if "game_time" in request and request["game_time"] != 0:
+            settings["game_time"] = self._seconds(request, "game_time")
+
+        game_id = self.next_game_id
+        self.next_game_id += 1
+        self.games[game_id] = EngineGame(game_id, size, settings, writer)
+        return {"game": game_id}
+
+    @staticmethod
+    def _seconds(request: Dict, key: str) -> float:
+        """A positive, finite number of seconds from the request."""
+        try:
+            value = float(request[key])
+        except (TypeError, ValueError):
+            value = math.nan
+        if not math.isfinite(value) or value <= 0:
+            raise ServerError(f"{key} must be a positive number of seconds, not {request[key]!r}")
+        return value
+
+    async def _play(self, request: Dict, writer: object) -> Dict:
+        game = self._game(request, writer)
+        if game.search is not None:
+            raise ServerError("a search is running for this game")
+        row, col = (int(value) for value in request["move"])
+        hex_game = game.game
+        if not (0 <= row < hex_game.board_size and 0 <= col < hex_game.board_size) or not hex_game.make_move(row, col):
+            raise ServerError(f"illegal move {[row, col]}")
+        return {"winner": hex_game.bitboard.winner}
+
+    async def _genmove(self, request: Dict, writer: object) -> Dict:
+        """Queue a search for the side to move, wait for a worker and for the result."""
+        game = self._game(request, writer)
+        hex_game = game.game
+        if game.search is not None:
+            raise ServerError("a search is already running for this game")
+        if hex_game.is_game_over():
+            raise ServerError("the game is over")
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise ServerError("server busy")
+
+        received = time.perf_counter()
+        game.search = asyncio.current_task()
+        game.cancelled = False
+        loop = asyncio.get_running_loop()
+        try:
+            self.waiting += 1
+            try:
+                await self.slots.acquire()
+            finally:
+                self.waiting -= 1
+            self.queue_waits.append(time.perf_counter() - received)
+
+            time_limit = game.move_time()
+            moves = list(hex_game.bitboard.moves)
+            try:
+                future = get_pool(self.workers).submit(move_worker, game.settings, hex_game.board_size, moves,
+                                                       self.rng.randrange(2 ** 31), time_limit)
+            except Exception as e:
+                # The done callback never runs for a search that was not submitted
+                self.slots.release()
+                raise ServerError(f"search could not start: {e}")
+            self.running += 1
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._search_done))
+            # Extensions can stretch a search by time_extension; allow for that and the transfer
+            extension = game.settings.get("time_extension", Config.TIME_EXTENSION)
+            timeout = time_limit * max(extension, 1.0) + Config.SERVER_GRACE_TIME
+            try:
+                cell, stats = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise ServerError(f"search timed out after {timeout:.1f}s")
+        except asyncio.CancelledError:
+            if not game.cancelled:
+                raise
+            self.cancelled += 1
+            raise ServerError("cancelled")
+        finally:
+            game.search = None
+
+        if game.clock.game_time > 0:
+            game.clock.clock_remaining = max(game.clock.clock_remaining - stats["elapsed"], 0.0)
+        row, col = divmod(cell, hex_game.board_size)
+        if request.get("play", True):
+            hex_game.make_move(row, col)
+        self.completed += 1
+        self.latencies.append(time.perf_counter() - received)
+        return {
+            "move": [row, col],
+            "winner": hex_game.bitboard.winner,
+            "clock": game.clock.clock_remaining if game.clock.game_time > 0 else None,
+            "search": {key: stats[key] for key in ("simulations", "elapsed", "stop_reason", "root")},
+        }
+
+    def _search_done(self):
+        self.running -= 1
+        self.slots.release()
+
+    async def _cancel(self, request: Dict, writer: object) -> Dict:
+        game = self._game(request, writer)
+        if game.search is None:
+            return {"cancelled": False}
+        game.cancelled = True
+        game.search.cancel()
+        return {"cancelled": True}
+
+    async def _state(self, request: Dict, writer: object) -> Dict:
+        game = self._game(request, writer)
+        bitboard = game.game.bitboard
+        return {
+            "size": bitboard.size,
+            "moves": [list(bitboard.coords(cell)) for cell in bitboard.moves],
+            "to_move": bitboard.to_move,
+            "winner": bitboard.winner,
+            "searching": game.search is not None,
+            "clock": game.clock.clock_remaining if game.clock.game_time > 0 else None,
+        }
+
+    async def _close(self, request: Dict, writer: object) -> Dict:
+        self._drop(self._game(request, writer).game_id)
+        return {}
+
+    async def _stats(self, request: Dict, writer: object) -> Dict:
+        return self.stats()
+
+    def stats(self) -> Dict:
+        """Load and latency figures (latencies in milliseconds)."""
+        def percentiles(samples: Deque[float]) -> Dict[str, float]:
+            if not samples:
+                return {}
+            values = np.percentile(np.array(samples) * 1000, (50, 90, 99))
+            return {"p50": float(values[0]), "p90": float(values[1]), "p99": float(values[2]),
+                    "max": float(max(samples) * 1000)}
+
+        return {
+            "games": len(self.games),
+            "workers": self.workers,
+            "queue_depth": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "timeouts": self.timeouts,
+            "uptime": time.perf_counter() - self.started,
+            "latency_ms": percentiles(self.latencies),
+            "queue_wait_ms": percentiles(self.queue_waits),
+        }
+
+async def serve(host: str, port: int, workers: int, max_queue: int):
+    server = EngineServer(workers, max_queue)
+    listener = await server.start(host, port)
+    address = ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"Hex engine server on {address} with {workers} workers")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        shutdown_pools()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Hex engine games over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=Config.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=4, help="searches running at once")
+    parser.add_argument("--max-queue", type=int, default=Config.SERVER_MAX_QUEUE,
+                        help="searches allowed to wait for a worker")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_queue))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
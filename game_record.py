@@ -0,0 +1,157 @@
+# game_record.py
+"""Compact binary game records and a memory-mapped multi-game archive.
+
+Layout of an archive file (``.hexa``):
+    file header   4s B 3x      magic b"HEXA", format version, padding
+    per game      B B H        board size, winner (0 = unfinished), move count
+                  moves        one byte per move (cell index, row-major),
+                               two bytes (little-endian) on boards above 16x16
+
+The offset index (``<archive>.idx``) is a flat array of little-endian
+uint64 record offsets, one per game, so any game can be reached without
+reading the ones before it. Red always moves first and players alternate.
+"""
+
+import os
+import struct
+import numpy as np
+from typing import Iterator, List, Optional
+from hex_game import HexGame
+
+MAGIC = b"HEXA"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sB3x")
+RECORD_HEADER = struct.Struct("<BBH")
+
+def move_width(board_size: int) -> int:
+    """Bytes per move: one while every cell index fits in a byte."""
+    return 1 if board_size * board_size <= 256 else 2
+
+def encode_game(game: HexGame) -> bytes:
+    """Pack a game's move list into a single record."""
+    size = game.board_size
+    cells = [row * size + col for row, col, _ in game.move_history]
+    winner = game.winner.value if game.winner else 0
+    dtype = np.uint8 if move_width(size) == 1 else np.dtype("<u2")
+    return RECORD_HEADER.pack(size, winner, len(cells)) + np.array(cells, dtype=dtype).tobytes()
+
+def replay(board_size: int, moves: np.ndarray) -> HexGame:
+    """Rebuild a ``HexGame`` by playing the recorded moves."""
+    game = HexGame(board_size)
+    for cell in moves.tolist():
+        game.make_move(*divmod(cell, board_size))
+    return game
+
+class GameArchive:
+    """Append-only writer for a multi-game archive and its offset index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + ".idx"
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            open(self.index_path, 'wb').close()
+        elif not os.path.exists(self.index_path):
+            build_index(path)
+
+    def append(self, game: HexGame):
+        self.extend([game])
+
+    def extend(self, games: List[HexGame]):
+        """Append several games with one write to each file."""
+        with open(self.path, 'ab') as data, open(self.index_path, 'ab') as index:
+            offset = data.tell()
+            offsets = []
+            records = []
+            for game in games:
+                record = encode_game(game)
+                offsets.append(offset)
+                records.append(record)
+                offset += len(record)
+            data.write(b"".join(records))
+            index.write(np.array(offsets, dtype="<u8").tobytes())
+
+class ArchiveReader:
+    """Random access to an archive through ``np.memmap``; nothing is parsed up front."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version = FILE_HEADER.unpack(self.data[:FILE_HEADER.size].tobytes())
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} game archive")
+
+        index_path = path + ".idx"
+        if not os.path.exists(index_path):
+            build_index(path)
+        if os.path.getsize(index_path):
+            self.offsets = np.memmap(index_path, dtype="<u8", mode='r')
+        else:
+            self.offsets = np.zeros(0, dtype="<u8")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def header(self, index: int):
+        """Return (board size, winner, move count) of a game."""
+        offset = int(self.offsets[index])
+        return RECORD_HEADER.unpack(self.data[offset:offset + RECORD_HEADER.size].tobytes())
+
+    def moves(self, index: int) -> np.ndarray:
+        """Cell indices of a game's moves (a view into the mapped file when possible)."""
+        size, _, count = self.header(index)
+        start = int(self.offsets[index]) + RECORD_HEADER.size
+        if move_width(size) == 1:
+            return self.data[start:start + count]
+        return self.data[start:start + 2 * count].view("<u2")
+
+    def winner(self, index: int) -> int:
+        return self.header(index)[1]
+
+    def board_at(self, index: int, ply: Optional[int] = None) -> np.ndarray:
+        """(N, N) int8 board after ``ply`` moves (the final board by default)."""
+        size = self.header(index)[0]
+        moves = self.moves(index)[:ply].astype(np.intp)
+        board = np.zeros(size * size, dtype=np.int8)
+        board[moves[0::2]] = 1
+        board[moves[1::2]] = 2
+        return board.reshape(size, size)
+
+    def game(self, index: int) -> HexGame:
+        return replay(self.header(index)[0], self.moves(index))
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.moves(index)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for index in range(len(self)):
+            yield self.moves(index)
+
+def build_index(path: str):
+    """(Re)create the offset index by walking the record headers once."""
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    offsets = []
+    offset = FILE_HEADER.size
+    while offset < len(data):
+        size, _, count = RECORD_HEADER.unpack(data[offset:offset + RECORD_HEADER.size].tobytes())
+        offsets.append(offset)
+        offset += RECORD_HEADER.size + count * move_width(size)
+    with open(path + ".idx", 'wb') as f:
+        f.write(np.array(offsets, dtype="<u8").tobytes())
+
+def save_record(game: HexGame, filename: str):
+    """Write a single game as a one-game archive."""
+    with open(filename, 'wb') as f:
+        f.write(FILE_HEADER.pack(MAGIC, VERSION) + encode_game(game))
+
+def load_record(filename: str) -> HexGame:
+    """Read the first game of an archive written by ``save_record`` or ``GameArchive``."""
+    with open(filename, 'rb') as f:
+        magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} game archive")
+        size, _, count = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+        dtype = np.uint8 if move_width(size) == 1 else np.dtype("<u2")
+        moves = np.frombuffer(f.read(count * np.dtype(dtype).itemsize), dtype=dtype)
+    return replay(size, moves)
@@ -7,6 +7,7 @@ from typing import Tuple, Optional, List
 from hex_game import HexGame, Player
 from ai import HexAI
 from config import Config
+from parallel_search import shutdown_pools
 
 class DifficultyMenu:
     def __init__(self, config: Config):
@@ -101,9 +102,30 @@ class HexGUI:
         self.label_font = pygame.font.Font(None, self.config.LABEL_FONT_SIZE)
         self.bold_font = pygame.font.Font(None, self.config.TITLE_FONT_SIZE)
         self.bold_font.set_bold(True)
+        
+        # Vertex offsets of a flat-top hexagon, shared by every cell
+        radius = self.config.HEX_RADIUS
+        self.hex_offsets = [(radius * math.cos(math.pi / 3 * i), radius * math.sin(math.pi / 3 * i))
+                            for i in range(6)]
+        self.stone_sprites = {
+            Player.PLAYER1.value: self._make_stone(self.config.PLAYER1_COLOR),
+            Player.PLAYER2.value: self._make_stone(self.config.PLAYER2_COLOR),
+        }
+        
+        # Render cache: the static board (background, hexagons, edges and
+        # labels) is drawn once per window size and board size; frames then
+        # only repaint the cells and panel that changed since the last one
+        self.board_surface = None
+        self.board_surface_key = None
+        self.drawn_board = None
+        self.drawn_panel = None
+        self.full_redraw = True
     
     def start_game(self, difficulty: str):
         """Start a new game with selected difficulty."""
+        if self.ai:
+            self.ai.cancel()
+        self.ai_calculating = False
         self.difficulty = difficulty
         self.show_menu = False
         self.game = HexGame()
@@ -114,6 +136,8 @@ class HexGUI:
         
         # Calculate hex centers
         self.hex_centers = self._calculate_hex_centers()
+        self.cell_rects = [[self._stone_rect(center) for center in row] for row in self.hex_centers]
+        self.full_redraw = True
     
     def _calculate_hex_centers(self) -> List[List[Tuple[float, float]]]:
         """Calculate center coordinates for each hexagon."""
@@ -143,44 +167,63 @@ class HexGUI:
         
         return centers
     
-    def _draw_hexagon(self, center: Tuple[float, float], color: Tuple[int, int, int]):
+    def _make_stone(self, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Pre-render a stone on a transparent square sprite."""
+        radius = self.config.HEX_RADIUS * 0.6
+        size = math.ceil(radius * 2) + 2
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (size / 2, size / 2), radius)
+        return sprite
+    
+    def _stone_rect(self, center: Tuple[float, float]) -> pygame.Rect:
+        """Screen area of the stone sprite on a cell (stones of neighbouring cells never overlap)."""
+        size = self.stone_sprites[Player.PLAYER1.value].get_width()
+        return pygame.Rect(round(center[0] - size / 2), round(center[1] - size / 2), size, size)
+    
+    def _draw_hexagon(self, surface: pygame.Surface, center: Tuple[float, float], color: Tuple[int, int, int]):
         """Draw a hexagon with black border."""
-        points = []
-        # Flat-top hexagon
-        for i in range(6):
-            angle = math.pi / 3 * i
-            x = center[0] + self.config.HEX_RADIUS * math.cos(angle)
-            y = center[1] + self.config.HEX_RADIUS * math.sin(angle)
-            points.append((x, y))
+        points = [(center[0] + dx, center[1] + dy) for dx, dy in self.hex_offsets]
         
         # Fill
-        pygame.draw.polygon(self.screen, color, points)
+        pygame.draw.polygon(surface, color, points)
         # Border
-        pygame.draw.polygon(self.screen, self.config.GRID_COLOR, points, 2)
+        pygame.draw.polygon(surface, self.config.GRID_COLOR, points, 2)
+    
+    def _board_surface(self) -> pygame.Surface:
+        """The static board for the current window and board size, rebuilt only when either changes."""
+        key = (self.screen.get_size(), self.game.board_size)
+        if self.board_surface_key != key:
+            surface = pygame.Surface(self.screen.get_size()).convert()
+            surface.fill(self.config.BACKGROUND_COLOR)
+            self._draw_board(surface)
+            self.board_surface = surface
+            self.board_surface_key = key
+        return self.board_surface
     
-    def _draw_board(self):
-        """Draw the hexagonal board."""
+    def _draw_board(self, surface: pygame.Surface):
+        """Draw the empty hexagonal board."""
         # Draw hexagons
         for row in range(self.game.board_size):
             for col in range(self.game.board_size):
                 center = self.hex_centers[row][col]
-                self._draw_hexagon(center, self.config.BOARD_COLOR)
+                self._draw_hexagon(surface, center, self.config.BOARD_COLOR)
         
         # Draw colored edges
-        self._draw_colored_edges()
+        self._draw_colored_edges(surface)
         
         # Draw labels
-        self._draw_labels()
-        
-        # Draw pieces
-        for row in range(self.game.board_size):
-            for col in range(self.game.board_size):
-                if self.game.board[row, col] != Player.EMPTY.value:
-                    center = self.hex_centers[row][col]
-                    color = self.config.PLAYER1_COLOR if self.game.board[row, col] == Player.PLAYER1.value else self.config.PLAYER2_COLOR
-                    pygame.draw.circle(self.screen, color, center, self.config.HEX_RADIUS * 0.6)
+        self._draw_labels(surface)
     
-    def _draw_colored_edges(self):
+    def _draw_cell(self, row: int, col: int, board_surface: pygame.Surface) -> pygame.Rect:
+        """Repaint one cell from the cached board and blit its stone, if any."""
+        rect = self.cell_rects[row][col]
+        self.screen.blit(board_surface, rect, rect)
+        player = self.game.board[row, col]
+        if player != Player.EMPTY.value:
+            self.screen.blit(self.stone_sprites[int(player)], rect)
+        return rect
+    
+    def _draw_colored_edges(self, surface: pygame.Surface):
         """Draw red and blue colored borders."""
         margin = 30
         edge_width = 40
@@ -202,7 +245,7 @@ class HexGUI:
             (top_right[0] + offset + margin + diagonal_offset, top_left[1] - offset - margin + edge_width),
             (top_left[0] - offset - margin, top_left[1] - offset - margin + edge_width)
         ]
-        pygame.draw.polygon(self.screen, self.config.EDGE_RED, top_points)
+        pygame.draw.polygon(surface, self.config.EDGE_RED, top_points)
         
         # Bottom edge (red)
         bottom_points = [
@@ -211,7 +254,7 @@ class HexGUI:
             (bottom_right[0] + offset + margin, bottom_left[1] + offset + margin),
             (bottom_left[0] - offset - margin, bottom_left[1] + offset + margin)
         ]
-        pygame.draw.polygon(self.screen, self.config.EDGE_RED, bottom_points)
+        pygame.draw.polygon(surface, self.config.EDGE_RED, bottom_points)
         
         # Left edge (blue)
         left_points = [
@@ -220,7 +263,7 @@ class HexGUI:
             (bottom_left[0] - offset - margin + edge_width, bottom_left[1] + offset + margin),
             (bottom_left[0] - offset - margin, bottom_left[1] + offset + margin)
         ]
-        pygame.draw.polygon(self.screen, self.config.EDGE_BLUE, left_points)
+        pygame.draw.polygon(surface, self.config.EDGE_BLUE, left_points)
         
         # Right edge (blue)
         right_points = [
@@ -229,9 +272,9 @@ class HexGUI:
             (bottom_right[0] + offset + margin, bottom_right[1] + offset + margin),
             (bottom_right[0] + offset + margin - edge_width, bottom_right[1] + offset + margin)
         ]
-        pygame.draw.polygon(self.screen, self.config.EDGE_BLUE, right_points)
+        pygame.draw.polygon(surface, self.config.EDGE_BLUE, right_points)
     
-    def _draw_labels(self):
+    def _draw_labels(self, surface: pygame.Surface):
         """Draw row and column labels."""
         # Column labels (A-K)
         for col in range(self.game.board_size):
@@ -241,12 +284,12 @@ class HexGUI:
             top_pos = self.hex_centers[0][col]
             text = self.label_font.render(label, True, self.config.WHITE)
             text_rect = text.get_rect(center=(top_pos[0], top_pos[1] - self.config.HEX_RADIUS - 50))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
             
             # Bottom label
             bottom_pos = self.hex_centers[-1][col]
             text_rect = text.get_rect(center=(bottom_pos[0], bottom_pos[1] + self.config.HEX_RADIUS + 50))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
         
         # Row labels (1-11)
         for row in range(self.game.board_size):
@@ -256,15 +299,15 @@ class HexGUI:
             left_pos = self.hex_centers[row][0]
             text = self.label_font.render(label, True, self.config.WHITE)
             text_rect = text.get_rect(center=(left_pos[0] - self.config.HEX_RADIUS - 60, left_pos[1]))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
             
             # Right label
             right_pos = self.hex_centers[row][-1]
             text_rect = text.get_rect(center=(right_pos[0] + self.config.HEX_RADIUS + 60, right_pos[1]))
-            self.screen.blit(text, text_rect)
+            surface.blit(text, text_rect)
     
-    def _draw_player_indicator(self):
-        """Draw the player turn indicator panel."""
+    def _draw_player_indicator(self) -> pygame.Rect:
+        """Draw the player turn indicator panel; returns the area it covers."""
         # Background box
         box_x = self.config.PANEL_X
         box_y = self.config.PANEL_Y
@@ -315,19 +358,32 @@ class HexGUI:
             thinking_surface = self.label_font.render(thinking_text, True, self.config.TEXT_COLOR)
             thinking_rect = thinking_surface.get_rect(center=(box_x + box_width // 2, box_y + box_height - 25))
             self.screen.blit(thinking_surface, thinking_rect)
+        
+        return pygame.Rect(box_x, box_y, box_width, box_height)
     
     def _get_hex_from_pixel(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
-        """Convert pixel coordinates to hex coordinates."""
-        for row in range(self.game.board_size):
-            for col in range(self.game.board_size):
-                center = self.hex_centers[row][col]
-                dx = pos[0] - center[0]
-                dy = pos[1] - center[1]
-                distance = math.sqrt(dx * dx + dy * dy)
-                
-                if distance <= self.config.HEX_RADIUS * 0.9:
-                    return (row, col)
-        return None
+        """Convert pixel coordinates to hex coordinates.
+        
+        Inverts the axial layout of ``_calculate_hex_centers``: the nearest
+        centre lies in one of the two rows around the point, and within a
+        row the column follows from x directly.
+        """
+        radius = self.config.HEX_RADIUS
+        size = self.game.board_size
+        y = (pos[1] - self.config.BOARD_OFFSET_Y) / (radius * math.sqrt(3))
+        best, best_distance = None, (radius * 0.9) ** 2
+        for row in (math.floor(y), math.floor(y) + 1):
+            if not 0 <= row < size:
+                continue
+            x = pos[0] - self.config.BOARD_OFFSET_X - row * radius * 0.75
+            col = min(max(round(x / (radius * 1.5)), 0), size - 1)
+            center = self.hex_centers[row][col]
+            dx = pos[0] - center[0]
+            dy = pos[1] - center[1]
+            distance = dx * dx + dy * dy
+            if distance <= best_distance:
+                best, best_distance = (row, col), distance
+        return best
     
     def _check_ai_move(self):
         """Check if AI has completed its calculation."""
@@ -336,6 +392,8 @@ class HexGUI:
             if move:
                 self.game.make_move(move[0], move[1])
                 self.ai_calculating = False
+                # Think on the human's time
+                self.ai.start_pondering(self.game)
     def handle_click(self, pos: Tuple[int, int]):
         """Handle mouse clicks."""
         if self.show_menu:
@@ -355,30 +413,64 @@ class HexGUI:
                         self.ai_calculating = True
                         self.ai.get_best_move_async(self.game)
     
-    def draw(self):
-        """Draw the current state."""
-        self.screen.fill(self.config.BACKGROUND_COLOR)
+    def draw(self) -> Optional[List[pygame.Rect]]:
+        """Bring the screen up to date.
         
+        Returns the areas that changed, or None when the whole window was
+        redrawn. Between full redraws only cells whose stone changed and
+        the turn panel are repainted.
+        """
         if self.show_menu:
+            if not self.full_redraw:
+                return []
+            self.full_redraw = False
             self.difficulty_menu.draw(self.screen)
-        else:
-            self._draw_board()
-            self._draw_player_indicator()
+            return None
+        
+        panel = (self.game.current_player, self.ai_calculating, self.game.winner)
+        # The winner message is drawn over the board, so a finished game is redrawn whole
+        if self.full_redraw or (self.game.winner and panel != self.drawn_panel):
+            self._draw_frame()
+            return None
+        
+        dirty = []
+        board_surface = self._board_surface()
+        for row, col in zip(*(self.game.board != self.drawn_board).nonzero()):
+            dirty.append(self._draw_cell(row, col, board_surface))
+        self.drawn_board = self.game.board.copy()
+        if panel != self.drawn_panel:
+            dirty.append(self._draw_player_indicator())
+            self.drawn_panel = panel
+        return dirty
+    
+    def _draw_frame(self):
+        """Redraw the whole game screen from the cached board."""
+        board_surface = self._board_surface()
+        self.screen.blit(board_surface, (0, 0))
+        for row in range(self.game.board_size):
+            for col in range(self.game.board_size):
+                if self.game.board[row, col] != Player.EMPTY.value:
+                    self._draw_cell(row, col, board_surface)
+        self._draw_player_indicator()
+        
+        # Draw winner message
+        if self.game.winner:
+            winner_text = f"{'Human' if self.game.winner == Player.PLAYER1 else 'Computer'} Wins!"
+            font = pygame.font.Font(None, 72)
+            text = font.render(winner_text, True, self.config.WHITE)
+            text_rect = text.get_rect(center=(self.config.WINDOW_WIDTH // 2, 50))
+            self.screen.blit(text, text_rect)
             
-            # Draw winner message
-            if self.game.winner:
-                winner_text = f"{'Human' if self.game.winner == Player.PLAYER1 else 'Computer'} Wins!"
-                font = pygame.font.Font(None, 72)
-                text = font.render(winner_text, True, self.config.WHITE)
-                text_rect = text.get_rect(center=(self.config.WINDOW_WIDTH // 2, 50))
-                self.screen.blit(text, text_rect)
-                
-                # Restart instruction
-                inst_text = "Press R to restart or M for menu"
-                inst_font = pygame.font.Font(None, 36)
-                inst_surface = inst_font.render(inst_text, True, self.config.WHITE)
-                inst_rect = inst_surface.get_rect(center=(self.config.WINDOW_WIDTH // 2, 120))
-                self.screen.blit(inst_surface, inst_rect)
+            # Restart instruction
+            inst_text = "Press R to restart or M for menu"
+            inst_font = pygame.font.Font(None, 36)
+            inst_surface = inst_font.render(inst_text, True, self.config.WHITE)
+            inst_rect = inst_surface.get_rect(center=(self.config.WINDOW_WIDTH // 2, 120))
+            self.screen.blit(inst_surface, inst_rect)
+        
+        self.drawn_board = self.game.board.copy()
+        self.drawn_panel = (self.game.current_player, self.ai_calculating, self.game.winner)
+        self.full_redraw = False
     
     def run(self):
         """Main game loop."""
@@ -386,7 +478,13 @@ class HexGUI:
         running = True
         
         while running:
-            for event in pygame.event.get():
+            events = pygame.event.get()
+            if not events and not self.ai_calculating:
+                # Idle: nothing to poll, so sleep until the next event
+                # instead of spinning frames next to the search
+                events = [pygame.event.wait(self.config.GUI_IDLE_TIMEOUT_MS)]
+            
+            for event in events:
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.MOUSEBUTTONDOWN:
@@ -397,16 +495,29 @@ class HexGUI:
                         self.start_game(self.difficulty)
                     elif event.key == pygame.K_m:
                         # Menu
+                        if self.ai:
+                            self.ai.cancel()
                         self.show_menu = True
+                        self.full_redraw = True
                     elif event.key == pygame.K_ESCAPE:
                         running = False
+                elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                    self.screen = pygame.display.get_surface()
+                    self.full_redraw = True
             
             # Check for AI move completion
             if self.game and not self.show_menu:
                 self._check_ai_move()
             
-            self.draw()
-            pygame.display.flip()
-            clock.tick(60)
-        
-        pygame.quit()
\ No newline at end of file
+            dirty = self.draw()
+            if dirty is None:
+                pygame.display.flip()
+            elif dirty:
+                pygame.display.update(dirty)
+            if self.ai_calculating:
+                clock.tick(self.config.GUI_FPS)
+        
+        if self.ai:
+            self.ai.cancel()
+        pygame.quit()
+        shutdown_pools()
\ No newline at end of file
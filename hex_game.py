@@ -4,6 +4,8 @@
 import numpy as np
 from enum import Enum
 from typing import List, Tuple, Optional
+from bitboard import BitBoard, SWAP
+from inferior_cells import InferiorCells, analyze
 
 class Player(Enum):
     EMPTY = 0
@@ -11,102 +13,144 @@ class Player(Enum):
     PLAYER2 = 2  # Blue (AI) - connects left to right
 
 class HexGame:
+    """Game facade over a ``BitBoard``.
+
+    The search works on ``bitboard`` directly with make/unmake; ``board``
+    is a read-only NumPy view rebuilt lazily for display and I/O.
+    """
+
     def __init__(self, board_size: int = 11):
         self.board_size = board_size
-        self.board = np.zeros((board_size, board_size), dtype=int)
-        self.current_player = Player.PLAYER1
-        self.winner = None
+        self.bitboard = BitBoard(board_size)
+        self.move_history = []
+        self._board_cache: Optional[np.ndarray] = None
+
+    @property
+    def board(self) -> np.ndarray:
+        """2-D array of player values (read-only)."""
+        if self._board_cache is None:
+            board = np.zeros(self.board_size * self.board_size, dtype=int)
+            for player in (Player.PLAYER1.value, Player.PLAYER2.value):
+                mask = self.bitboard.stones[player]
+                while mask:
+                    low = mask & -mask
+                    board[low.bit_length() - 1] = player
+                    mask ^= low
+            board = board.reshape(self.board_size, self.board_size)
+            board.flags.writeable = False
+            self._board_cache = board
+        return self._board_cache
+
+    @board.setter
+    def board(self, board: np.ndarray):
+        """Replace the position from a 2-D array of player values.
+
+        The side to move and the winner follow from the stones; the order
+        the stones were played in is unknown, so the move history is cleared.
+        """
+        stones = [0, 0, 0]
+        for (row, col), value in np.ndenumerate(np.asarray(board)):
+            if value:
+                stones[int(value)] |= 1 << (row * self.board_size + col)
+        self.bitboard.load(stones)
         self.move_history = []
-    
+        self._board_cache = None
+
+    @property
+    def current_player(self) -> Player:
+        return Player(self.bitboard.to_move)
+
+    @current_player.setter
+    def current_player(self, player: Player):
+        self.bitboard.to_move = player.value
+
+    @property
+    def winner(self) -> Optional[Player]:
+        return Player(self.bitboard.winner) if self.bitboard.winner else None
+
+    @winner.setter
+    def winner(self, player: Optional[Player]):
+        self.bitboard.winner = player.value if player else 0
+
+    @property
+    def zobrist_hash(self) -> int:
+        """64-bit Zobrist hash, updated incrementally by make/unmake."""
+        return self.bitboard.hash
+
+    def canonical_hash(self) -> int:
+        """Hash shared by every symmetric image of the position (see ``BitBoard.canonical``)."""
+        return self.bitboard.canonical_hash()
+
+    def transformed(self, symmetry: int) -> 'HexGame':
+        """The position mapped by a board symmetry (``bitboard.ROTATE``, ``SWAP``, ...).
+
+        Swaps exchange the colours and the side to move. Only the stones
+        are mapped; the image starts without a move history.
+        """
+        cells = self.bitboard.tables.symmetry_cells[symmetry].tolist()
+        swap = symmetry >= SWAP
+        stones = [0, 0, 0]
+        for player in (Player.PLAYER1.value, Player.PLAYER2.value):
+            image_player = 3 - player if swap else player
+            mask = self.bitboard.stones[player]
+            while mask:
+                low = mask & -mask
+                stones[image_player] |= 1 << cells[low.bit_length() - 1]
+                mask ^= low
+        image = HexGame(self.board_size)
+        image.bitboard.load(stones)
+        to_move = self.bitboard.to_move
+        image.bitboard.to_move = 3 - to_move if swap else to_move
+        if self.bitboard.winner:
+            image.bitboard.winner = 3 - self.bitboard.winner if swap else self.bitboard.winner
+        return image
+
     def get_neighbors(self, row: int, col: int) -> List[Tuple[int, int]]:
         """Get all valid neighboring cells for a hexagonal grid."""
-        neighbors = []
-        # Six directions for hex grid
-        directions = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, 1), (1, -1)]
-        
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            if 0 <= new_row < self.board_size and 0 <= new_col < self.board_size:
-                neighbors.append((new_row, new_col))
-        return neighbors
-    
+        neighbors = self.bitboard.tables.neighbors[row * self.board_size + col]
+        return [divmod(cell, self.board_size) for cell in neighbors]
+
     def make_move(self, row: int, col: int) -> bool:
         """Attempt to place a piece at the given position."""
-        if self.board[row, col] != Player.EMPTY.value or self.winner:
+        player = self.current_player
+        if not self.bitboard.make_move(row * self.board_size + col):
             return False
-        
-        self.board[row, col] = self.current_player.value
-        self.move_history.append((row, col, self.current_player))
-        
-        # Check for winner
-        if self.check_winner(self.current_player):
-            self.winner = self.current_player
-        else:
-            # Switch player
-            self.current_player = Player.PLAYER2 if self.current_player == Player.PLAYER1 else Player.PLAYER1
-        
+
+        self.move_history.append((row, col, player))
+        self._board_cache = None
         return True
-    
+
+    def unmake_move(self) -> Optional[Tuple[int, int]]:
+        """Take back the last move and return its position."""
+        if not self.move_history:
+            return None
+
+        row, col, _ = self.move_history.pop()
+        self.bitboard.unmake_move()
+        self._board_cache = None
+        return (row, col)
+
     def check_winner(self, player: Player) -> bool:
         """Check if the given player has won."""
-        if player == Player.PLAYER1:
-            # Red connects top to bottom
-            for col in range(self.board_size):
-                if self.board[0, col] == player.value:
-                    if self._dfs_check(0, col, player, "vertical"):
-                        return True
-        else:  # Player.PLAYER2
-            # Blue connects left to right
-            for row in range(self.board_size):
-                if self.board[row, 0] == player.value:
-                    if self._dfs_check(row, 0, player, "horizontal"):
-                        return True
-        return False
-    
-    def _dfs_check(self, row: int, col: int, player: Player, direction: str) -> bool:
-        """DFS to check if there's a path connecting opposite sides."""
-        visited = set()
-        stack = [(row, col)]
-        
-        while stack:
-            curr_row, curr_col = stack.pop()
-            
-            if (curr_row, curr_col) in visited:
-                continue
-            
-            visited.add((curr_row, curr_col))
-            
-            # Check if we've reached the opposite side
-            if direction == "vertical" and curr_row == self.board_size - 1:
-                return True
-            elif direction == "horizontal" and curr_col == self.board_size - 1:
-                return True
-            
-            # Add valid neighbors
-            for next_row, next_col in self.get_neighbors(curr_row, curr_col):
-                if (next_row, next_col) not in visited and self.board[next_row, next_col] == player.value:
-                    stack.append((next_row, next_col))
-        
-        return False
-    
+        return self.bitboard.connected(player.value)
+
     def get_valid_moves(self) -> List[Tuple[int, int]]:
         """Get all valid moves (empty cells)."""
-        valid_moves = []
-        for row in range(self.board_size):
-            for col in range(self.board_size):
-                if self.board[row, col] == Player.EMPTY.value:
-                    valid_moves.append((row, col))
-        return valid_moves
-    
+        return [divmod(cell, self.board_size) for cell in self.bitboard.empty_cells()]
+
+    def inferior_cells(self) -> InferiorCells:
+        """Dead, captured and dominated cells of the current position."""
+        return analyze(self.bitboard)
+
     def is_game_over(self) -> bool:
         """Check if the game is over."""
         return self.winner is not None
-    
+
     def copy(self):
         """Create a deep copy of the game state."""
-        new_game = HexGame(self.board_size)
-        new_game.board = self.board.copy()
-        new_game.current_player = self.current_player
-        new_game.winner = self.winner
+        new_game = HexGame.__new__(HexGame)
+        new_game.board_size = self.board_size
+        new_game.bitboard = self.bitboard.copy()
         new_game.move_history = self.move_history.copy()
-        return new_game
\ No newline at end of file
+        new_game._board_cache = self._board_cache
+        return new_game
@@ -0,0 +1,212 @@
+# inferior_cells.py
+"""Inferior cell analysis: dead, captured and dominated cells of a position.
+
+All patterns look at the six neighbours of a cell, taken in circular order
+(an off-board neighbour belongs to the edge it lies beyond). For a player
+P, an empty cell is useless when the neighbours P could reach it through
+are already joined without it: they form a single arc whose interior cells
+are all P's. A cell useless to both players is *dead*; its colour never
+matters. A pair of adjacent empty cells is *captured* by P when P playing
+either one makes the other dead, so P can treat both as its own. For the
+player to move, a cell c is *dominated* by a neighbour k when playing k
+makes c dead: k is then at least as good as c.
+
+Dead and captured cells are filled in (repeatedly, since every fill can
+expose more) and dropped from the candidate moves together with dominated
+cells. Results are cached per Zobrist hash.
+"""
+
+import numpy as np
+from typing import Dict, List
+from bitboard import BitBoard, masks_to_array
+
+# Neighbour offsets in circular order; consecutive entries are adjacent
+RING = [(0, 1), (-1, 1), (-1, 0), (0, -1), (1, -1), (1, 0)]
+RING_WEIGHTS = 1 << np.arange(6)
+
+def _useless(own: int, usable: int) -> bool:
+    """Whether a cell can help a player, given 6-bit ring masks.
+
+    ``own`` marks neighbours that are the player's stones or edge, ``usable``
+    those that are not the opponent's.
+    """
+    if usable == 0b111111:
+        # One unbroken ring: the neighbours are already joined only if all are own
+        return own == 0b111111
+    start = next(i for i in range(6) if not usable >> i & 1)
+    arcs = []
+    current: List[int] = []
+    for step in range(1, 7):
+        i = (start + step) % 6
+        if usable >> i & 1:
+            current.append(i)
+        elif current:
+            arcs.append(current)
+            current = []
+    if len(arcs) > 1:
+        return False
+    return not arcs or all(own >> i & 1 for i in arcs[0][1:-1])
+
+def _dead_table() -> np.ndarray:
+    """DEAD[red ring mask, blue ring mask] for every neighbourhood."""
+    table = np.zeros((64, 64), dtype=bool)
+    for red in range(64):
+        for blue in range(64):
+            table[red, blue] = (_useless(red, 0b111111 & ~(blue & ~red))
+                                and _useless(blue, 0b111111 & ~(red & ~blue)))
+    return table
+
+DEAD = _dead_table()
+
+class PatternTables:
+    """Ring neighbour indices and adjacent pairs for one board size."""
+
+    _cache: Dict[int, 'PatternTables'] = {}
+
+    def __init__(self, size: int):
+        n = size * size
+        # Index into an owner array extended by Red edge (n), Blue edge (n + 1)
+        # and the obtuse corner, which lies beyond both edges (n + 2)
+        self.ring = np.zeros((n, 6), dtype=np.intp)
+        for cell in range(n):
+            row, col = divmod(cell, size)
+            for i, (dr, dc) in enumerate(RING):
+                r, c = row + dr, col + dc
+                row_off = not 0 <= r < size
+                col_off = not 0 <= c < size
+                if row_off and col_off:
+                    self.ring[cell, i] = n + 2
+                elif row_off:
+                    self.ring[cell, i] = n
+                elif col_off:
+                    self.ring[cell, i] = n + 1
+                else:
+                    self.ring[cell, i] = r * size + c
+
+        # Directed adjacent pairs (a, b) with the ring position of b around a
+        a, k = np.nonzero(self.ring < n)
+        self.pair_a = a
+        self.pair_b = self.ring[a, k]
+        self.pair_k = k
+        # Undirected pairs, each with the ring position of a around b
+        back = {(int(x), int(y)): int(i) for x, y, i in zip(a, self.pair_b, k)}
+        once = self.pair_a < self.pair_b
+        self.edge_a = self.pair_a[once]
+        self.edge_b = self.pair_b[once]
+        self.edge_ka = self.pair_k[once]
+        self.edge_kb = np.array([back[(int(y), int(x))] for x, y in zip(self.edge_a, self.edge_b)],
+                                dtype=np.intp)
+
+    @classmethod
+    def get(cls, size: int) -> 'PatternTables':
+        tables = cls._cache.get(size)
+        if tables is None:
+            tables = cls(size)
+            cls._cache[size] = tables
+        return tables
+
+class InferiorCells:
+    """Result of one analysis.
+
+    ``fill`` holds the stone masks to add for each player (dead cells go to
+    Red, captured cells to their owner), ``candidates`` the cells still
+    worth playing for the side to move, in ascending order.
+    """
+
+    __slots__ = ('dead', 'captured', 'dominated', 'fill', 'candidates')
+
+    def __init__(self, dead: int, captured: List[int], dominated: int, candidates: List[int]):
+        self.dead = dead
+        self.captured = captured  # [unused, Red-captured mask, Blue-captured mask]
+        self.dominated = dominated
+        self.fill = [0, dead | captured[1], captured[2]]
+        self.candidates = candidates
+
+def analyze(board: BitBoard, max_rounds: int = 8) -> InferiorCells:
+    """Find the inferior cells of the position on ``board``."""
+    size = board.size
+    n = size * size
+    patterns = PatternTables.get(size)
+    owners = np.empty(n + 3, dtype=np.int8)
+    owners[:n] = masks_to_array(board.stones[1], board.stones[2], n)
+    owners[n:] = (1, 2, 3)
+    dead = 0
+    captured = [0, 0, 0]
+
+    for _ in range(max_rounds):
+        ring = owners[patterns.ring]
+        red6 = (ring & 1) @ RING_WEIGHTS
+        blue6 = (ring >> 1) @ RING_WEIGHTS
+        empty = owners[:n] == 0
+
+        new_dead = np.flatnonzero(empty & DEAD[red6, blue6])
+        owners[new_dead] = 1
+        for cell in new_dead.tolist():
+            dead |= 1 << cell
+
+        # Captured pairs; every pair was tested against the same (pre-fill)
+        # neighbourhoods, which stays valid because dead cells stay dead
+        # when stones are added. Overlapping pairs wait for the next round.
+        a, b = patterns.edge_a, patterns.edge_b
+        both_empty = (owners[a] == 0) & (owners[b] == 0)
+        filled = len(new_dead)
+        bit_a = 1 << patterns.edge_ka
+        bit_b = 1 << patterns.edge_kb
+        for player in (1, 2):
+            if player == 1:
+                kills = DEAD[red6[a] | bit_a, blue6[a]] & DEAD[red6[b] | bit_b, blue6[b]]
+            else:
+                kills = DEAD[red6[a], blue6[a] | bit_a] & DEAD[red6[b], blue6[b] | bit_b]
+            for x, y in zip(a[both_empty & kills].tolist(), b[both_empty & kills].tolist()):
+                if owners[x] or owners[y]:
+                    continue
+                owners[x] = owners[y] = player
+                captured[player] |= (1 << x) | (1 << y)
+                filled += 2
+        if not filled:
+            break
+
+    # Dominated cells for the side to move: c is dominated by neighbour k
+    # when a stone on k makes c dead. Prune c only while k stays a candidate,
+    # so chains and cycles of dominance always keep one cell.
+    mover = board.to_move
+    ring = owners[patterns.ring]
+    red6 = (ring & 1) @ RING_WEIGHTS
+    blue6 = (ring >> 1) @ RING_WEIGHTS
+    c, k, bit = patterns.pair_a, patterns.pair_b, 1 << patterns.pair_k
+    open_pair = (owners[c] == 0) & (owners[k] == 0)
+    if mover == 1:
+        killed = DEAD[red6[c] | bit, blue6[c]]
+    else:
+        killed = DEAD[red6[c], blue6[c] | bit]
+    pruned = set()
+    for cell, killer in zip(c[open_pair & killed].tolist(), k[open_pair & killed].tolist()):
+        if cell not in pruned and killer not in pruned:
+            pruned.add(cell)
+    dominated = 0
+    for cell in pruned:
+        dominated |= 1 << cell
+
+    candidates = [cell for cell in np.flatnonzero(owners[:n] == 0).tolist() if cell not in pruned]
+    return InferiorCells(dead, captured, dominated, candidates)
+
+class InferiorCellCache:
+    """``analyze`` results keyed by position hash (cleared when full)."""
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self.entries: Dict[int, InferiorCells] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, board: BitBoard) -> InferiorCells:
+        result = self.entries.get(board.hash)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        result = analyze(board)
+        self.entries[board.hash] = result
+        return result
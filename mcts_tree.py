@@ -0,0 +1,312 @@
+# mcts_tree.py
+"""Array-backed (struct-of-arrays) MCTS tree."""
+
+import math
+import numpy as np
+from typing import List, Optional
+
+class MCTSTree:
+    """Search tree stored in preallocated NumPy arrays.
+
+    Node 0 is the root. Children of a node are allocated together in one
+    contiguous slice ``first_child[n] : first_child[n] + num_children[n]``,
+    and nodes hold no game state: positions are replayed from ``move``.
+    ``wins`` are counted for the player who made the move into the node,
+    and so is ``proven``: +1 for a proven win, -1 for a proven loss.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.wins = np.zeros(capacity, dtype=np.float64)
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.num_children = np.zeros(capacity, dtype=np.int16)
+        self.move = np.full(capacity, -1, dtype=np.int16)
+        self.key = np.zeros(capacity, dtype=np.uint64)  # canonical Zobrist hash of each node
+        # All-moves-as-first statistics, same perspective as ``wins``
+        self.amaf_visits = np.zeros(capacity, dtype=np.int32)
+        self.amaf_wins = np.zeros(capacity, dtype=np.float64)
+        # Exact results from terminal positions and the endgame solver
+        self.proven = np.zeros(capacity, dtype=np.int8)
+        # Policy network priors of each move, for PUCT selection
+        self.prior = np.zeros(capacity, dtype=np.float32)
+        # Virtual loss of pending playouts, already included in ``visits``
+        self.virtual = np.zeros(capacity, dtype=np.int32)
+        self.size = 1
+
+    def reset(self):
+        """Drop every node except a fresh root, reusing the allocation."""
+        used = self.size
+        self.visits[:used] = 0
+        self.wins[:used] = 0
+        self.parent[:used] = -1
+        self.first_child[:used] = -1
+        self.num_children[:used] = 0
+        self.move[:used] = -1
+        self.key[:used] = 0
+        self.amaf_visits[:used] = 0
+        self.amaf_wins[:used] = 0
+        self.proven[:used] = 0
+        self.prior[:used] = 0
+        self.virtual[:used] = 0
+        self.size = 1
+
+    def is_full(self, extra: int = 0) -> bool:
+        return self.size + extra > self.capacity
+
+    def expand(self, node: int, moves: List[int], keys: Optional[List[int]] = None) -> bool:
+        """Allocate one child per move; return False if the tree is full."""
+        count = len(moves)
+        if count == 0 or self.size + count > self.capacity:
+            return False
+
+        start = self.size
+        end = start + count
+        self.move[start:end] = moves
+        if keys is not None:
+            self.key[start:end] = keys
+        self.parent[start:end] = node
+        self.first_child[node] = start
+        self.num_children[node] = count
+        self.size = end
+        return True
+
+    def select_child(self, node: int, exploration_constant: float = 1.414, table=None,
+                     rave_equivalence: float = 0) -> int:
+        """Pick a child by UCT; unvisited children are tried first, in order.
+
+        With a ``TranspositionTable``, children use the shared statistics of
+        their position when those cover more visits than the node's own.
+        A positive ``rave_equivalence`` switches to the RAVE blend instead.
+        A proven winning child is always taken and proven losses are skipped.
+        """
+        start = self.first_child[node]
+        end = start + self.num_children[node]
+        visits = self.visits[start:end]
+        wins = self.wins[start:end]
+        parent_visits = self.visits[node]
+        if table is not None:
+            visits, wins = table.blend(self.key[start:end], visits, wins)
+            parent_visits = max(parent_visits, visits.sum())
+
+        lost = None
+        proven = self.proven[start:end]
+        if proven.any():
+            if proven.max() > 0:
+                return start + proven.argmax()
+            lost = proven < 0
+            if lost.all():
+                return start + visits.argmax()
+
+        if rave_equivalence > 0:
+            scores = self._rave_scores(start, end, visits, wins, parent_visits,
+                                       exploration_constant, rave_equivalence)
+            if lost is not None:
+                scores[lost] = -np.inf
+            return start + scores.argmax()
+
+        first = visits.argmin() if lost is None else np.where(lost, np.iinfo(np.int32).max, visits).argmin()
+        if visits[first] == 0:
+            return start + first
+
+        scores = wins / visits + exploration_constant * np.sqrt(
+            math.log(parent_visits) / visits)
+        if lost is not None:
+            scores[lost] = -np.inf
+        return start + scores.argmax()
+
+    def select_child_puct(self, node: int, c_puct: float) -> int:
+        """Pick a child by PUCT: Q + c_puct * P * sqrt(N) / (1 + n).
+
+        Unvisited children count as even (Q = 0.5), so the priors alone
+        order them; proven results are handled as in ``select_child``.
+        """
+        start = self.first_child[node]
+        end = start + self.num_children[node]
+        visits = self.visits[start:end]
+        proven = self.proven[start:end]
+        if proven.any():
+            if proven.max() > 0:
+                return start + proven.argmax()
+            if (proven < 0).all():
+                return start + visits.argmax()
+
+        value = np.where(visits > 0, self.wins[start:end] / np.maximum(visits, 1), 0.5)
+        scores = value + c_puct * self.prior[start:end] * (math.sqrt(self.visits[node]) / (1 + visits))
+        if proven.any():
+            scores[proven < 0] = -np.inf
+        return start + scores.argmax()
+
+    def _rave_scores(self, start: int, end: int, visits: np.ndarray, wins: np.ndarray,
+                     parent_visits: int, exploration_constant: float, equivalence: float) -> np.ndarray:
+        """Blend UCT values with AMAF values using beta = sqrt(k / (3n + k)).
+
+        Unvisited children are scored by their AMAF value alone (0.5 if no
+        playout has touched them yet), so few simulations still rank moves.
+        """
+        amaf_visits = self.amaf_visits[start:end]
+        amaf_value = np.where(amaf_visits > 0,
+                              self.amaf_wins[start:end] / np.maximum(amaf_visits, 1), 0.5)
+        value = wins / np.maximum(visits, 1)
+        beta = np.sqrt(equivalence / (3 * visits + equivalence))
+        exploration = exploration_constant * np.sqrt(math.log(parent_visits + 1) / (visits + 1))
+        return (1 - beta) * value + beta * amaf_value + exploration
+
+    def update_amaf(self, path: List[int], owners: np.ndarray, winners: np.ndarray, first_player: int):
+        """Credit every child of the nodes on ``path`` with the playouts' final stones.
+
+        ``owners`` is a (playouts, cells) array of final player values and
+        ``winners`` the playouts' winners; ``first_player`` moves at ``path[0]``.
+        A child's move counts as played "first" whenever the player choosing
+        at its parent ended up owning that cell.
+        """
+        player = first_player
+        for node in path:
+            count = self.num_children[node]
+            if count:
+                start = self.first_child[node]
+                end = start + count
+                owned = owners[:, self.move[start:end]] == player
+                self.amaf_visits[start:end] += owned.sum(axis=0, dtype=np.int32)
+                self.amaf_wins[start:end] += owned[winners == player].sum(axis=0)
+            player = 3 - player
+
+    def backpropagate(self, path: List[int], result: float):
+        """Add a visit along ``path`` (root first).
+
+        ``result`` is the score for the player who moved into ``path[1]``;
+        the opponent's nodes receive ``1 - result``.
+        """
+        path = np.asarray(path)
+        self.visits[path] += 1
+        self.wins[path[1::2]] += result
+        self.wins[path[2::2]] += 1.0 - result
+
+    def add_virtual_loss(self, path: List[int], amount: int = 1):
+        """Count ``amount`` lost visits along ``path`` while its playout is pending.
+
+        Other selections in the same tree see lower values on the path and
+        spread out; ``remove_virtual_loss`` takes the visits back. The
+        amount is also kept in ``virtual``, so real visits can be told apart.
+        """
+        path = np.asarray(path)
+        self.visits[path] += amount
+        self.virtual[path] += amount
+
+    def remove_virtual_loss(self, path: List[int], amount: int = 1):
+        path = np.asarray(path)
+        self.visits[path] -= amount
+        self.virtual[path] -= amount
+
+    def propagate_proof(self, path: List[int]):
+        """Carry the proven result at the end of ``path`` towards the root.
+
+        A node is lost for the player who moved into it once any child wins
+        for the opponent, and won once every child is lost.
+        """
+        for i in range(len(path) - 1, 0, -1):
+            node = path[i]
+            parent = path[i - 1]
+            if self.proven[node] > 0:
+                self.proven[parent] = -1
+            elif self.proven[node] < 0:
+                start = self.first_child[parent]
+                if not (self.proven[start:start + self.num_children[parent]] < 0).all():
+                    return
+                self.proven[parent] = 1
+            else:
+                return
+
+    def find_child(self, node: int, move: int) -> int:
+        """Return the child of ``node`` reached by ``move``, or -1."""
+        count = self.num_children[node]
+        if count == 0:
+            return -1
+        start = self.first_child[node]
+        matches = np.flatnonzero(self.move[start:start + count] == move)
+        return start + int(matches[0]) if len(matches) else -1
+
+    def promote(self, node: int):
+        """Make ``node`` the new root, compacting its subtree to the front.
+
+        The subtree is renumbered breadth first, which keeps every sibling
+        group contiguous; all other nodes are freed.
+        """
+        if node == 0:
+            return
+
+        # Collect the subtree level by level
+        levels = [np.array([node], dtype=np.int64)]
+        frontier = levels[0]
+        while True:
+            counts = self.num_children[frontier].astype(np.int64)
+            expanded = counts > 0
+            if not expanded.any():
+                break
+            starts = self.first_child[frontier[expanded]].astype(np.int64)
+            counts = counts[expanded]
+            offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            frontier = offsets + np.arange(counts.sum())
+            levels.append(frontier)
+        order = np.concatenate(levels)
+
+        remap = np.full(self.size, -1, dtype=np.int64)
+        remap[order] = np.arange(len(order))
+        visits = self.visits[order]
+        wins = self.wins[order]
+        parent = self.parent[order]
+        first_child = self.first_child[order]
+        num_children = self.num_children[order]
+        move = self.move[order]
+        key = self.key[order]
+        amaf_visits = self.amaf_visits[order]
+        amaf_wins = self.amaf_wins[order]
+        proven = self.proven[order]
+        prior = self.prior[order]
+
+        self.reset()
+        used = len(order)
+        self.visits[:used] = visits
+        self.wins[:used] = wins
+        self.parent[:used] = np.where(parent >= 0, remap[parent], -1)
+        self.parent[0] = -1
+        self.first_child[:used] = np.where(num_children > 0, remap[first_child], -1)
+        self.num_children[:used] = num_children
+        self.move[:used] = move
+        self.key[:used] = key
+        self.amaf_visits[:used] = amaf_visits
+        self.amaf_wins[:used] = amaf_wins
+        self.proven[:used] = proven
+        self.prior[:used] = prior
+        self.size = used
+
+    def best_child(self, node: int) -> int:
+        """Return a proven win, else the most visited child not proven lost (-1 if unexpanded)."""
+        count = self.num_children[node]
+        if count == 0:
+            return -1
+        start = self.first_child[node]
+        visits = self.visits[start:start + count]
+        proven = self.proven[start:start + count]
+        if proven.any():
+            if proven.max() > 0:
+                return start + proven.argmax()
+            if not (proven < 0).all():
+                return start + np.where(proven < 0, -1, visits).argmax()
+        return start + visits.argmax()
+
+    def principal_variation(self, node: int = 0, max_length: int = 32) -> List[int]:
+        """Moves (cells) along the most visited children below ``node``."""
+        moves = []
+        child = self.best_child(node)
+        while child >= 0 and self.visits[child] > 0 and len(moves) < max_length:
+            moves.append(int(self.move[child]))
+            child = self.best_child(child)
+        return moves
+
+    def nbytes(self) -> int:
+        """Memory held by the preallocated arrays."""
+        return sum(array.nbytes for array in (
+            self.visits, self.wins, self.parent, self.first_child, self.num_children, self.move, self.key,
+            self.amaf_visits, self.amaf_wins, self.proven, self.prior, self.virtual))
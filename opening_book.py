@@ -0,0 +1,220 @@
+# opening_book.py
+"""Opening book: deep offline searches of the first plies, looked up through ``np.memmap``.
+
+Usage:
+    python opening_book.py --sizes 7 9 11 --plies 4 --branching 4 --time 30 --workers 8
+
+Layout of a book file (``books/hex_<size>.hexb``):
+    header    4s B B B x Q    magic b"HEXB", format version, board size,
+                              plies built, entry count
+    entries   Q H I f         canonical hash, move (cell index), root visits,
+                              win rate for the side playing the move
+
+Positions are stored once per symmetry class: keys are canonical hashes
+(``BitBoard.canonical``) and moves are cells of the canonical image,
+mapped back to the board on lookup. Entries are sorted by key, and the
+moves of one position by visits (most visited first), so a lookup is one
+binary search in the mapped file. Each position keeps its ``branching`` most visited moves; the
+builder follows all of them to the next ply. Running the builder again
+with more plies (or after an interruption) only searches positions the
+book does not have yet.
+"""
+
+import argparse
+import multiprocessing
+import os
+import struct
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from bitboard import BitBoard
+from config import Config
+
+MAGIC = b"HEXB"
+VERSION = 2
+HEADER = struct.Struct("<4sBBBxQ")
+ENTRY = np.dtype([("key", "<u8"), ("move", "<u2"), ("visits", "<u4"), ("value", "<f4")])
+
+# Book moves of one position: [(cell, visits, win rate), ...], most visited first
+BookMoves = List[Tuple[int, int, float]]
+
+# Per-worker-process AI of the builder, created once per settings
+_worker_ai = None
+_worker_settings: Optional[Dict] = None
+
+def book_path(directory: str, board_size: int) -> str:
+    return os.path.join(directory, f"hex_{board_size}.hexb")
+
+class OpeningBook:
+    """Read-only view of a book file; nothing is loaded up front."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, self.board_size, self.plies, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        if count:
+            self.entries = np.memmap(path, dtype=ENTRY, mode='r', offset=HEADER.size, shape=(count,))
+        else:
+            self.entries = np.zeros(0, dtype=ENTRY)
+        self.keys = self.entries["key"]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def candidates(self, board: BitBoard) -> BookMoves:
+        """Book moves for the position on ``board``, most visited first (empty if unknown)."""
+        if board.size != self.board_size:
+            return []
+        key, symmetry = board.canonical()
+        key = np.uint64(key)
+        cells = board.tables.symmetry_cells[symmetry]
+        keys = self.keys
+        index = int(np.searchsorted(keys, key))
+        moves = []
+        while index < len(keys) and keys[index] == key:
+            entry = self.entries[index]
+            moves.append((int(cells[entry["move"]]), int(entry["visits"]), float(entry["value"])))
+            index += 1
+        return moves
+
+    def lookup(self, board: BitBoard) -> Optional[int]:
+        """The book move (cell) for the position on ``board``, or None."""
+        moves = self.candidates(board)
+        return moves[0][0] if moves else None
+
+def read_book(path: str) -> Tuple[int, int, Dict[int, BookMoves]]:
+    """Load a whole book as (board size, plies, {hash: moves}) for extending it."""
+    book = OpeningBook(path)
+    positions: Dict[int, BookMoves] = {}
+    entries = book.entries
+    for key, move, visits, value in zip(book.keys.tolist(), entries["move"].tolist(),
+                                        entries["visits"].tolist(), entries["value"].tolist()):
+        positions.setdefault(key, []).append((move, visits, value))
+    return book.board_size, book.plies, positions
+
+def write_book(path: str, board_size: int, plies: int, positions: Dict[int, BookMoves]):
+    """Write ``positions`` as a sorted book file (atomically)."""
+    entries = np.zeros(sum(len(moves) for moves in positions.values()), dtype=ENTRY)
+    index = 0
+    for key, moves in positions.items():
+        for move, visits, value in moves:
+            entries[index] = (key, move, visits, value)
+            index += 1
+    entries = entries[np.lexsort((-entries["visits"].astype(np.int64), entries["key"]))]
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, board_size, plies, len(entries)))
+        f.write(entries.tobytes())
+    os.replace(tmp_path, path)
+
+def _replay(board_size: int, moves: List[int]) -> BitBoard:
+    board = BitBoard(board_size)
+    for cell in moves:
+        board.make_move(cell)
+    return board
+
+def _symmetry_cells(board: BitBoard) -> np.ndarray:
+    """Cell map between ``board`` and its canonical image (either way)."""
+    return board.tables.symmetry_cells[board.canonical()[1]]
+
+def _search_worker(settings: Dict, board_size: int, moves: List[int], seed: int) -> BookMoves:
+    """Search one book position; returns every visited root move."""
+    global _worker_ai, _worker_settings
+    from ai import HexAI
+    from hex_game import HexGame
+
+    if _worker_ai is None or _worker_settings != settings:
+        _worker_ai = HexAI(settings)
+        _worker_settings = settings
+    ai = _worker_ai
+    ai.rng.seed(seed)
+    ai.np_rng = np.random.default_rng(seed)
+    game = HexGame(board_size)
+    for cell in moves:
+        game.bitboard.make_move(cell)
+    ai._mcts_search(game)
+
+    tree = ai.tree
+    start = int(tree.first_child[0])
+    end = start + int(tree.num_children[0])
+    return [(int(tree.move[i]), int(tree.visits[i]), float(tree.wins[i] / tree.visits[i]))
+            for i in range(start, end) if tree.visits[i] > 0]
+
+def build_book(path: str, board_size: int, plies: int, branching: int, settings: Dict,
+               workers: int = 1, seed: int = 0) -> int:
+    """Search every book position of the first ``plies`` plies, extending ``path``.
+
+    Positions are searched in parallel, one ply at a time, and the book
+    is written after each ply. Returns the number of positions searched.
+    """
+    positions: Dict[int, BookMoves] = {}
+    built = 0
+    if os.path.exists(path):
+        size, built, positions = read_book(path)
+        if size != board_size:
+            raise ValueError(f"{path} is a {size}x{size} book")
+
+    settings = dict(settings, workers=1, ponder_time=0, book=None)
+    root = BitBoard(board_size)
+    frontier: Dict[int, List[int]] = {root.canonical_hash(): []}  # canonical hash -> moves reaching it
+    searched = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for ply in range(plies):
+            start = time.time()
+            todo = [(key, moves) for key, moves in frontier.items() if key not in positions]
+            futures = [(key, pool.submit(_search_worker, settings, board_size, moves, seed + searched + i))
+                       for i, (key, moves) in enumerate(todo)]
+            for (key, future), (_, moves) in zip(futures, todo):
+                results = sorted(future.result(), key=lambda move: -move[1])[:branching]
+                # Store the moves as cells of the canonical image
+                cells = _symmetry_cells(_replay(board_size, moves))
+                positions[key] = [(int(cells[cell]), visits, value) for cell, visits, value in results]
+            searched += len(todo)
+            built = max(built, ply + 1)
+            write_book(path, board_size, built, positions)
+            print(f"{board_size}x{board_size} ply {ply + 1}/{plies}: {len(frontier)} positions, "
+                  f"{len(todo)} searched in {time.time() - start:.0f}s, {len(positions)} in book")
+
+            # Follow every book move; transpositions merge into one position
+            next_frontier: Dict[int, List[int]] = {}
+            for key, moves in frontier.items():
+                board = _replay(board_size, moves)
+                cells = _symmetry_cells(board)
+                for cell, _, _ in positions.get(key, []):
+                    cell = int(cells[cell])
+                    board.make_move(cell)
+                    if not board.winner:
+                        next_frontier.setdefault(board.canonical_hash(), moves + [cell])
+                    board.unmake_move()
+            frontier = next_frontier
+    return searched
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or extend opening books with deep searches.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[Config.BOARD_SIZE])
+    parser.add_argument("--plies", type=int, default=4, help="book depth in plies from the empty board")
+    parser.add_argument("--branching", type=int, default=4, help="moves kept (and followed) per position")
+    parser.add_argument("--time", type=float, default=30.0, help="search seconds per position")
+    parser.add_argument("--difficulty", default="Expert", choices=list(Config.DIFFICULTY_LEVELS),
+                        help="search settings to start from")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out-dir", default=Config.OPENING_BOOK_DIR)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Whole-time searches in one process each; the cores go to parallel positions
+    settings = dict(Config.DIFFICULTY_LEVELS[args.difficulty], simulations=float("inf"), time_limit=args.time,
+                    early_stop=False)
+    for size in args.sizes:
+        build_book(book_path(args.out_dir, size), size, args.plies, args.branching, settings,
+                   args.workers, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# parallel_search.py
+"""Parallel MCTS helpers: root-parallel searches and tree-parallel leaf playouts."""
+
+import multiprocessing
+import random
+import numpy as np
+from collections import OrderedDict
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+from batch_rollout import batch_fill
+from bitboard import BitBoard, masks_to_array
+from config import Config
+from hex_game import HexGame
+from rollout import ROLLOUT_POLICIES
+
+# A leaf sent to a rollout worker: (Red stones mask, Blue stones mask, side to move, last move)
+LeafPosition = Tuple[int, int, int, int]
+
+# Long-lived pool shared by every HexAI in this process, and its size
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+# Per-worker-process AI cache, so the tree arrays are allocated once. Each
+# AI preallocates a whole tree, so only the most recently used are kept
+_worker_ais: 'OrderedDict[Tuple, object]' = OrderedDict()
+
+# Settings every job sets on the AI itself; they stay out of the cache key
+_PER_MOVE_SETTINGS = ("time_limit", "game_time")
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the persistent process pool, with at least ``workers`` processes.
+
+    Every caller shares one pool sized to the largest request so far, so a
+    process never holds two. A pool broken by a worker dying is dropped
+    and rebuilt, so one crash does not fail every later search.
+    """
+    global _pool, _pool_size
+    # ProcessPoolExecutor has no public test for this; submit raises once it is set
+    if _pool is not None and (_pool._broken or _pool_size < workers):
+        # Jobs already queued on a pool that is only too small still finish
+        _pool.shutdown(wait=False, cancel_futures=bool(_pool._broken))
+        _pool = None
+    if _pool is None:
+        _pool_size = max(workers, _pool_size)
+        # spawn is safe to use from the GUI's threads on every platform
+        _pool = ProcessPoolExecutor(max_workers=_pool_size,
+                                    mp_context=multiprocessing.get_context("spawn"),
+                                    initializer=_init_worker)
+    return _pool
+
+def shutdown_pools():
+    """Stop the pool created by ``get_pool``."""
+    global _pool, _pool_size
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+    _pool = None
+    _pool_size = 0
+
+def _init_worker():
+    # Pay the import cost once when the worker starts, not on the first move
+    import ai  # noqa: F401
+
+def _worker_ai(settings: Dict):
+    from ai import HexAI
+
+    key = tuple(sorted(item for item in settings.items() if item[0] not in _PER_MOVE_SETTINGS))
+    ai = _worker_ais.get(key)
+    if ai is None:
+        ai = HexAI(dict(settings, workers=1, game_time=0))
+        _worker_ais[key] = ai
+        while len(_worker_ais) > Config.WORKER_AI_CACHE_SIZE:
+            _worker_ais.popitem(last=False)
+    else:
+        _worker_ais.move_to_end(key)
+    return ai
+
+def root_search_worker(settings: Dict, board_size: int, moves: List[int], seed: int,
+                       time_limit: Optional[float] = None):
+    """Run one independent search and return the root children statistics.
+
+    Returns (moves, visits, proven, playouts) where ``moves``, ``visits``
+    and ``proven`` are arrays over the root's children.
+    """
+    ai = _worker_ai(settings)
+    ai.time_limit = settings["time_limit"] if time_limit is None else time_limit
+    ai.rng.seed(seed)
+    ai.np_rng = np.random.default_rng(seed)
+
+    game = HexGame(board_size)
+    for cell in moves:
+        game.bitboard.make_move(cell)
+    ai._mcts_search(game)
+
+    tree = ai.tree
+    start = tree.first_child[0]
+    end = start + tree.num_children[0]
+    return (tree.move[start:end].copy(), tree.visits[start:end].copy(), tree.proven[start:end].copy(),
+            ai.last_playouts)
+
+def move_worker(settings: Dict, board_size: int, moves: List[int], seed: int,
+                time_limit: float) -> Tuple[int, Dict]:
+    """Choose a move for one position (engine server games).
+
+    Returns the chosen cell and the search statistics as plain data.
+    """
+    ai = _worker_ai(settings)
+    ai.time_limit = time_limit
+    ai.rng.seed(seed)
+    ai.np_rng = np.random.default_rng(seed)
+
+    game = HexGame(board_size)
+    for cell in moves:
+        game.bitboard.make_move(cell)
+    row, col = ai.get_best_move(game)
+    return row * board_size + col, ai.last_stats.to_dict(top=5)
+
+def submit_root_searches(settings: Dict, game_state: HexGame, count: int, seed: int,
+                         time_limit: Optional[float] = None) -> List[Future]:
+    """Start ``count`` independent searches of ``game_state`` in the shared pool.
+
+    The caller searches too, so the pool is asked for ``count + 1``
+    processes, the same size as every other user of a ``workers`` setting.
+    """
+    pool = get_pool(count + 1)
+    moves = list(game_state.bitboard.moves)
+    futures = []
+    try:
+        for i in range(count):
+            futures.append(pool.submit(root_search_worker, settings, game_state.board_size,
+                                       moves, seed + i, time_limit))
+    except RuntimeError as e:
+        # A broken or shut down pool; the caller's own search still runs
+        print(f"Root search submit error: {e}")
+    return futures
+
+def merge_root_searches(futures: List[Future], merged: np.ndarray, proven: np.ndarray,
+                        stop_event: Optional[threading.Event] = None,
+                        timeout: Optional[float] = None) -> int:
+    """Add each worker's root visits into ``merged`` and its proven moves into ``proven``.
+
+    Both arrays are indexed by cell; ``proven`` holds +1 for moves some
+    worker proved winning and -1 for proven losses. Once ``stop_event`` is
+    set, or ``timeout`` seconds have passed, the remaining searches are
+    cancelled and their late results dropped, so a stop never waits for a
+    worker. A worker that failed is skipped. Returns the number of
+    playouts the workers ran.
+    """
+    playouts = 0
+    pending = set(futures)
+    deadline = None if timeout is None else time.perf_counter() + timeout
+    while pending:
+        if stop_event is not None and stop_event.is_set():
+            break
+        wait_time = 0.05 if deadline is None else min(0.05, max(deadline - time.perf_counter(), 0.0))
+        done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                child_moves, child_visits, child_proven, worker_playouts = future.result()
+            except Exception as e:
+                print(f"Root search worker error: {e}")
+                continue
+            cells = child_moves.astype(np.intp)
+            np.add.at(merged, cells, child_visits)
+            solved = child_proven != 0
+            proven[cells[solved]] = child_proven[solved]
+            playouts += worker_playouts
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+    for future in pending:
+        future.cancel()
+    return playouts
+
+def rollout_worker(board_size: int, leaves: List[LeafPosition], policy: str, playouts: int,
+                   seed: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Run the playouts for a batch of tree-parallel leaves.
+
+    Returns one (winners, owners) pair per leaf: ``winners`` has one entry
+    per playout and ``owners`` is the (playouts, cells) array of final
+    stones, ready for the AMAF update.
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    rollout = ROLLOUT_POLICIES[policy]
+    num_cells = board_size * board_size
+    results = []
+    for red, blue, to_move, last_move in leaves:
+        board = BitBoard(board_size)
+        if playouts == 1 and policy == "truncated":
+            # Truncated playouts detect wins through the union-find
+            board.load([0, red, blue])
+        else:
+            board.stones = [0, red, blue]
+            # The bridge policy only looks at the last move of the history
+            board.moves = [last_move]
+        board.to_move = to_move
+
+        if playouts > 1:
+            winners, fills = batch_fill(board, playouts, np_rng)
+            results.append((winners, fills.reshape(playouts, -1)))
+        else:
+            winner, final_red, final_blue = rollout(board, rng)
+            results.append((np.array([winner], dtype=np.int8),
+                            masks_to_array(final_red, final_blue, num_cells)[None, :]))
+    return results
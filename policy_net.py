@@ -0,0 +1,233 @@
+# policy_net.py
+"""Pure-NumPy policy/value network: batched CPU inference and training.
+
+Usage:
+    python policy_net.py --data data/selfplay --out weights/policy_11.npz --epochs 20
+
+Trains on the shards written by ``selfplay.py`` (visit distributions as
+policy targets, game outcomes as value targets) and saves the weights as
+an ``.npz`` file that ``HexAI`` loads with the ``"evaluator"`` setting.
+
+Positions are seen from the side to move: when Blue is to move the board
+is transposed and the colours swapped, so the network always plays Red
+(top to bottom). Transposing keeps hex adjacency, so this is exact.
+"""
+
+import argparse
+import glob
+import json
+import os
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+class PolicyValueNet:
+    """Two-layer MLP with a policy head (one logit per cell) and a value head.
+
+    Inputs are three planes of the canonical board (own stones, opponent
+    stones, empty cells), flattened. ``evaluate`` runs a whole batch of
+    positions through one chain of matrix products.
+    """
+
+    def __init__(self, size: int, hidden: int = 256, seed: Optional[int] = None):
+        self.size = size
+        self.num_cells = size * size
+        n = self.num_cells
+        rng = np.random.default_rng(seed)
+
+        def layer(fan_in: int, fan_out: int) -> np.ndarray:
+            return (rng.standard_normal((fan_in, fan_out)) * np.sqrt(2.0 / fan_in)).astype(np.float32)
+
+        self.params: Dict[str, np.ndarray] = {
+            "w1": layer(3 * n, hidden), "b1": np.zeros(hidden, dtype=np.float32),
+            "w2": layer(hidden, hidden), "b2": np.zeros(hidden, dtype=np.float32),
+            "wp": layer(hidden, n) * 0.1, "bp": np.zeros(n, dtype=np.float32),
+            "wv": layer(hidden, 1) * 0.1, "bv": np.zeros(1, dtype=np.float32),
+        }
+        # transpose[cell] is the cell's mirror image across the long diagonal
+        rows, cols = np.divmod(np.arange(n), size)
+        self.transpose = cols * size + rows
+
+    @property
+    def hidden(self) -> int:
+        return self.params["b1"].shape[0]
+
+    @classmethod
+    def load(cls, path: str) -> 'PolicyValueNet':
+        with np.load(path) as data:
+            net = cls(int(data["size"]), int(data["b1"].shape[0]))
+            for name in net.params:
+                net.params[name] = data[name].astype(np.float32)
+        return net
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, size=self.size, **self.params)
+
+    def canonical(self, boards: np.ndarray, to_move: np.ndarray) -> np.ndarray:
+        """(B, N*N) player values seen by the side to move: 1 = own, 2 = opponent."""
+        boards = boards.reshape(len(boards), self.num_cells)
+        blue = to_move == 2
+        flipped = boards[:, self.transpose]
+        flipped = np.where(flipped == 0, 0, 3 - flipped)
+        return np.where(blue[:, None], flipped, boards)
+
+    def features(self, canonical: np.ndarray) -> np.ndarray:
+        return np.concatenate([canonical == 1, canonical == 2, canonical == 0], axis=1).astype(np.float32)
+
+    def forward(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+        """Policy logits, value (tanh) and the hidden activations."""
+        p = self.params
+        h1 = np.maximum(x @ p["w1"] + p["b1"], 0)
+        h2 = np.maximum(h1 @ p["w2"] + p["b2"], 0)
+        logits = h2 @ p["wp"] + p["bp"]
+        value = np.tanh(h2 @ p["wv"] + p["bv"])[:, 0]
+        return logits, value, [h1, h2]
+
+    def evaluate(self, boards: np.ndarray, to_move: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Move priors and values for a batch of positions.
+
+        ``boards`` holds player values per cell, (B, N*N) or (B, N, N).
+        Returns priors (B, N*N) over the real cells, zero on occupied ones,
+        and values in [-1, 1] for the side to move.
+        """
+        canonical = self.canonical(boards, to_move)
+        logits, value, _ = self.forward(self.features(canonical))
+        logits = np.where(canonical == 0, logits, -np.inf)
+        logits -= logits.max(axis=1, keepdims=True)
+        priors = np.exp(logits)
+        priors /= priors.sum(axis=1, keepdims=True)
+        blue = to_move == 2
+        priors[blue] = priors[blue][:, self.transpose]
+        return priors, value
+
+    def train_step(self, x: np.ndarray, policy: np.ndarray, outcome: np.ndarray, legal: np.ndarray,
+                   optimizer: 'Adam', value_weight: float = 1.0) -> float:
+        """One gradient step on cross-entropy (policy) plus squared error (value)."""
+        p = self.params
+        batch = len(x)
+        logits, value, (h1, h2) = self.forward(x)
+        logits = np.where(legal, logits, -1e9)
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        loss = (-(policy * np.log(probs + 1e-9)).sum() + value_weight * ((value - outcome) ** 2).sum()) / batch
+
+        d_logits = (probs - policy) / batch
+        d_value = (2 * value_weight * (value - outcome) * (1 - value ** 2) / batch)[:, None]
+        d_h2 = d_logits @ p["wp"].T + d_value @ p["wv"].T
+        d_h2 *= h2 > 0
+        d_h1 = d_h2 @ p["w2"].T
+        d_h1 *= h1 > 0
+        grads = {
+            "wp": h2.T @ d_logits, "bp": d_logits.sum(axis=0),
+            "wv": h2.T @ d_value, "bv": d_value.sum(axis=0),
+            "w2": h1.T @ d_h2, "b2": d_h2.sum(axis=0),
+            "w1": x.T @ d_h1, "b1": d_h1.sum(axis=0),
+        }
+        optimizer.step(p, grads)
+        return float(loss)
+
+class Adam:
+    """Adam with decoupled weight decay over a dict of parameter arrays."""
+
+    def __init__(self, learning_rate: float = 1e-3, weight_decay: float = 1e-4,
+                 beta1: float = 0.9, beta2: float = 0.999):
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.moments: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self.steps = 0
+
+    def step(self, params: Dict[str, np.ndarray], grads: Dict[str, np.ndarray]):
+        self.steps += 1
+        correction1 = 1 - self.beta1 ** self.steps
+        correction2 = 1 - self.beta2 ** self.steps
+        for name, grad in grads.items():
+            m, v = self.moments.get(name, (np.zeros_like(grad), np.zeros_like(grad)))
+            m = self.beta1 * m + (1 - self.beta1) * grad
+            v = self.beta2 * v + (1 - self.beta2) * grad * grad
+            self.moments[name] = (m, v)
+            update = self.learning_rate * (m / correction1) / (np.sqrt(v / correction2) + 1e-8)
+            params[name] -= (update + self.learning_rate * self.weight_decay * params[name]).astype(np.float32)
+
+def load_shards(data_dir: str) -> Dict[str, np.ndarray]:
+    """Concatenate the self-play shards (and pending positions) in ``data_dir``.
+
+    Only the shards and pending file named by ``manifest.json`` are read,
+    so files from a checkpoint that was interrupted are not counted twice.
+    """
+    manifest_path = os.path.join(data_dir, "manifest.json")
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        paths = [os.path.join(data_dir, f"shard_{index:05d}.npz") for index in range(manifest["shards"])]
+        if manifest.get("pending"):
+            paths.append(os.path.join(data_dir, manifest["pending"]))
+    else:
+        paths = sorted(glob.glob(os.path.join(data_dir, "shard_*.npz")))
+    parts: Dict[str, List[np.ndarray]] = {"boards": [], "to_move": [], "policy": [], "outcome": []}
+    for path in paths:
+        with np.load(path) as shard:
+            if len(shard["outcome"]):
+                for field in parts:
+                    parts[field].append(shard[field])
+    if not parts["outcome"]:
+        raise ValueError(f"no positions in {data_dir}")
+    return {field: np.concatenate(arrays) for field, arrays in parts.items()}
+
+def train(net: PolicyValueNet, data: Dict[str, np.ndarray], epochs: int = 10, batch_size: int = 256,
+          learning_rate: float = 1e-3, seed: int = 0) -> List[float]:
+    """Fit ``net`` to self-play positions; returns the mean loss of each epoch."""
+    boards = data["boards"].reshape(len(data["boards"]), -1)
+    to_move = data["to_move"]
+    canonical = net.canonical(boards, to_move)
+    x = net.features(canonical)
+    legal = canonical == 0
+    policy = data["policy"].astype(np.float32)
+    blue = to_move == 2
+    policy[blue] = policy[blue][:, net.transpose]
+    # Positions without a search distribution train the value head only
+    totals = policy.sum(axis=1, keepdims=True)
+    policy = np.divide(policy, totals, out=np.zeros_like(policy), where=totals > 0)
+    outcome = data["outcome"].astype(np.float32)
+
+    rng = np.random.default_rng(seed)
+    optimizer = Adam(learning_rate)
+    losses = []
+    for epoch in range(epochs):
+        order = rng.permutation(len(x))
+        total = 0.0
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            total += net.train_step(x[batch], policy[batch], outcome[batch], legal[batch], optimizer) * len(batch)
+        losses.append(total / len(x))
+        print(f"epoch {epoch + 1}/{epochs}: loss {losses[-1]:.4f}")
+    return losses
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the policy/value network on self-play data.")
+    parser.add_argument("--data", required=True, help="selfplay.py output directory")
+    parser.add_argument("--out", required=True, help="weights file (.npz)")
+    parser.add_argument("--hidden", type=int, default=256)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--resume", action="store_true", help="continue from the weights in --out")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data = load_shards(args.data)
+    size = data["boards"].shape[-1]
+    if args.resume and os.path.exists(args.out):
+        net = PolicyValueNet.load(args.out)
+    else:
+        net = PolicyValueNet(size, args.hidden, seed=args.seed)
+    print(f"{len(data['outcome'])} positions, {size}x{size}, hidden {net.hidden}")
+    train(net, data, args.epochs, args.batch_size, args.learning_rate, args.seed)
+    net.save(args.out)
+
+if __name__ == "__main__":
+    main()
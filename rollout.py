@@ -0,0 +1,94 @@
+# rollout.py
+"""Playout policies used by the MCTS simulation step."""
+
+import random
+from typing import Callable, Dict, Tuple
+from bitboard import BitBoard, spans_edges
+
+# A playout returns (winner, final Red stones mask, final Blue stones mask);
+# the masks feed all-moves-as-first statistics in the search.
+PlayoutResult = Tuple[int, int, int]
+
+def truncated_playout(board: BitBoard, rng: random.Random, max_moves: int = 30) -> PlayoutResult:
+    """Play up to ``max_moves`` random stones in place, checking for a win after each.
+
+    The winner is 0 if the game is still undecided. The caller is
+    responsible for unmaking the moves.
+    """
+    moves = 0
+    while not board.winner and moves < max_moves:
+        valid_moves = board.empty_cells()
+        if not valid_moves:
+            break
+        board.make_move(rng.choice(valid_moves))
+        moves += 1
+    return board.winner, board.stones[1], board.stones[2]
+
+def fill_playout(board: BitBoard, rng: random.Random) -> PlayoutResult:
+    """Fill every empty cell in one random order and decide the winner.
+
+    Hex has no draws, so a full board always has exactly one winner and a
+    single flood fill for Red decides it. The board is left unchanged.
+    """
+    if board.winner:
+        return board.winner, board.stones[1], board.stones[2]
+
+    empty = board.empty_cells()
+    rng.shuffle(empty)
+
+    # The side to move gets the even positions of the shuffled order
+    red_cells = empty[0::2] if board.to_move == 1 else empty[1::2]
+    red = board.stones[1]
+    for cell in red_cells:
+        red |= 1 << cell
+    blue = board.tables.full_mask & ~red
+    return (1 if spans_edges(board.tables, red, 1) else 2), red, blue
+
+def bridge_playout(board: BitBoard, rng: random.Random) -> PlayoutResult:
+    """Fill the board in random order, but answer every bridge intrusion.
+
+    When a move lands on one carrier cell of a two-bridge (or of a bridge
+    between a second-row stone and its owner's edge), the bridge owner
+    replies on the other carrier if it is still empty; otherwise the next
+    cell of the shuffled order is played. The lookup uses the precomputed
+    ``BoardTables.bridge_responses``, so each move costs O(1). The board is
+    left unchanged.
+    """
+    if board.winner:
+        return board.winner, board.stones[1], board.stones[2]
+
+    responses = board.tables.bridge_responses
+    stones = board.stones.copy()
+    occupied = stones[1] | stones[2]
+    order = board.empty_cells()
+    rng.shuffle(order)
+    player = board.to_move
+    last = board.moves[-1] if board.moves else -1
+    index = 0
+    for _ in range(len(order)):
+        cell = -1
+        if last >= 0:
+            own = stones[player]
+            for need, reply in responses[player][last]:
+                if own & need == need and not occupied >> reply & 1:
+                    cell = reply
+                    break
+        if cell < 0:
+            while occupied >> order[index] & 1:
+                index += 1
+            cell = order[index]
+            index += 1
+        bit = 1 << cell
+        stones[player] |= bit
+        occupied |= bit
+        last = cell
+        player = 3 - player
+
+    red = stones[1]
+    return (1 if spans_edges(board.tables, red, 1) else 2), red, stones[2]
+
+ROLLOUT_POLICIES: Dict[str, Callable[[BitBoard, random.Random], PlayoutResult]] = {
+    "truncated": truncated_playout,
+    "fill": fill_playout,
+    "bridge": bridge_playout,
+}
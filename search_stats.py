@@ -0,0 +1,96 @@
+# search_stats.py
+"""Statistics collected by one MCTS search, for tuning and analysis displays."""
+
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from mcts_tree import MCTSTree
+
+PHASES = ("selection", "expansion", "rollout", "backpropagation")
+
+class SearchStats:
+    """What one search did and where its time went.
+
+    ``HexAI`` keeps the statistics of its last search in ``last_stats`` and
+    passes in-progress snapshots to ``stats_callback`` while searching.
+    Root arrays are indexed by the root's children, best first.
+    """
+
+    def __init__(self, board_size: int):
+        self.board_size = board_size
+        self.simulations = 0
+        self.playouts = 0
+        self.elapsed = 0.0
+        self.time_limit = 0.0  # time allotted by the time manager
+        self.stop_reason = ""  # "simulations", "time", "decided" (early stop), "solved", "book" or "stopped"
+        self.phase_times: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.nodes_allocated = 0  # nodes added by this search
+        self.tree_size = 0  # nodes in the tree, including reused ones
+        self.inherited_visits = 0
+        self.max_depth = 0
+        self.solved_nodes = 0  # tree nodes proven by the endgame solver
+        self.solver_nodes = 0  # positions the solver visited
+        self.solver_time = 0.0
+        self.root_moves: List[Tuple[int, int]] = []
+        self.root_visits = np.zeros(0, dtype=np.int64)
+        self.root_win_rates = np.zeros(0)
+        self.principal_variation: List[Tuple[int, int]] = []
+        self.finished = False
+        self.error: Optional[str] = None
+
+    def capture_tree(self, tree: MCTSTree, pv_length: int = 16):
+        """Copy the root distribution and principal variation out of ``tree``."""
+        count = int(tree.num_children[0])
+        start = int(tree.first_child[0])
+        visits = tree.visits[start:start + count].astype(np.int64)
+        wins = tree.wins[start:start + count]
+        order = np.argsort(-visits, kind="stable")
+        self.root_moves = [divmod(int(cell), self.board_size) for cell in tree.move[start:start + count][order]]
+        self.root_visits = visits[order]
+        self.root_win_rates = wins[order] / np.maximum(visits[order], 1)
+        self.principal_variation = [divmod(cell, self.board_size)
+                                    for cell in tree.principal_variation(0, pv_length)]
+        self.tree_size = int(tree.size)
+
+    @property
+    def simulations_per_second(self) -> float:
+        return self.simulations / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self, top: int = 10) -> Dict:
+        """Plain-data form (JSON-serializable) with the ``top`` root moves."""
+        return {
+            "simulations": self.simulations,
+            "playouts": self.playouts,
+            "elapsed": self.elapsed,
+            "time_limit": self.time_limit,
+            "stop_reason": self.stop_reason,
+            "simulations_per_second": self.simulations_per_second,
+            "phase_times": dict(self.phase_times),
+            "nodes_allocated": self.nodes_allocated,
+            "tree_size": self.tree_size,
+            "inherited_visits": self.inherited_visits,
+            "max_depth": self.max_depth,
+            "solved_nodes": self.solved_nodes,
+            "solver_nodes": self.solver_nodes,
+            "solver_time": self.solver_time,
+            "root": [{"move": list(move), "visits": int(visits), "win_rate": float(rate)}
+                     for move, visits, rate in zip(self.root_moves[:top], self.root_visits[:top],
+                                                   self.root_win_rates[:top])],
+            "principal_variation": [list(move) for move in self.principal_variation],
+            "finished": self.finished,
+            "error": self.error,
+        }
+
+    def summary(self) -> str:
+        """One-line report: rate, time split, tree and principal variation."""
+        total = sum(self.phase_times.values()) or 1.0
+        split = ", ".join(f"{phase} {seconds / total:.0%}" for phase, seconds in self.phase_times.items())
+        best = ""
+        if self.root_moves:
+            best = f" | best {self.root_moves[0]} {self.root_win_rates[0]:.1%} of {self.root_visits[0]}"
+        pv = " ".join(f"{row},{col}" for row, col in self.principal_variation)
+        solver = ""
+        if self.solver_nodes:
+            solver = f" | solver {self.solved_nodes} solved, {self.solver_nodes} nodes in {self.solver_time:.2f}s"
+        stop = f", {self.stop_reason}" if self.stop_reason else ""
+        return (f"{self.simulations} sims in {self.elapsed:.2f}s{stop} ({self.simulations_per_second:,.0f}/s; {split}) | "
+                f"+{self.nodes_allocated} nodes, depth {self.max_depth}{best}{solver} | pv {pv}")
@@ -0,0 +1,272 @@
+# selfplay.py
+"""Headless self-play data generation with parallel games and sharded output.
+
+Usage:
+    python selfplay.py --out data/selfplay --games 10000 --workers 8
+
+Each shard ``shard_00000.npz`` holds exactly ``--shard-size`` positions:
+    boards    (P, N, N) int8     player values before the move
+    to_move   (P,)      int8     side to move
+    policy    (P, N*N)  float32  root visit distribution of the search
+    outcome   (P,)      int8     +1 if the side to move went on to win, else -1
+
+With ``--augment rotate`` (the default) every position is also stored
+rotated by 180 degrees, and ``--augment all`` adds the colour-swapped
+transposes as well (see ``BoardTables.symmetry_cells``); the images of a
+game follow its original positions.
+
+Progress is kept in ``manifest.json`` together with the positions of the
+next, not yet full shard (``pending_00001.npz`` and so on, named by the
+manifest), so an interrupted run resumes exactly where it stopped.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from ai import HexAI
+from bitboard import BoardTables, ROTATE, SWAP, SWAP_ROTATE
+from config import Config
+from hex_game import HexGame
+
+FIELDS = ("boards", "to_move", "policy", "outcome")
+
+# Symmetries added to every game by --augment
+AUGMENTATIONS = {"none": (), "rotate": (ROTATE,), "all": (ROTATE, SWAP, SWAP_ROTATE)}
+
+# Per-worker-process AI, created once per settings
+_worker_ai: Optional[HexAI] = None
+_worker_settings: Optional[Dict] = None
+
+def selfplay_settings(difficulty: str) -> Dict:
+    """Search settings for self-play: one process per game, no pondering."""
+    return dict(Config.DIFFICULTY_LEVELS[difficulty], workers=1, ponder_time=0)
+
+def play_game(ai: HexAI, board_size: int, seed: int, sample_moves: int = 0) -> Dict[str, np.ndarray]:
+    """Play one self-play game and return its positions as arrays.
+
+    For the first ``sample_moves`` plies the move is sampled in proportion
+    to root visits instead of taking the most visited one, so games differ.
+    """
+    rng = np.random.default_rng(seed)
+    ai.rng.seed(seed)
+    ai.np_rng = np.random.default_rng(seed)
+    ai.new_game()
+
+    game = HexGame(board_size)
+    boards = []
+    to_move = []
+    policy = []
+    while not game.is_game_over():
+        move = ai.get_best_move(game)
+        visits = ai.last_root_visits.astype(np.float32)
+        if visits.sum() > 0:
+            visits /= visits.sum()
+            if len(game.move_history) < sample_moves:
+                move = divmod(int(rng.choice(len(visits), p=visits)), board_size)
+
+        boards.append(game.board.astype(np.int8))
+        to_move.append(game.current_player.value)
+        policy.append(visits)
+        game.make_move(move[0], move[1])
+
+    to_move = np.array(to_move, dtype=np.int8)
+    return {
+        "boards": np.array(boards, dtype=np.int8).reshape(-1, board_size, board_size),
+        "to_move": to_move,
+        "policy": np.array(policy, dtype=np.float32).reshape(-1, board_size * board_size),
+        "outcome": np.where(to_move == game.winner.value, 1, -1).astype(np.int8),
+    }
+
+def augment(record: Dict[str, np.ndarray], symmetries) -> Dict[str, np.ndarray]:
+    """Append the image of every position under each of ``symmetries``.
+
+    Outcomes are for the side to move, so they carry over unchanged; swaps
+    exchange the stone colours and the side to move.
+    """
+    if not symmetries:
+        return record
+    count, size = record["boards"].shape[:2]
+    tables = BoardTables.get(size)
+    boards = record["boards"].reshape(count, -1)
+    parts = {field: [record[field]] for field in FIELDS}
+    for symmetry in symmetries:
+        # Each symmetry is its own inverse, so gathering through it maps cells
+        cells = tables.symmetry_cells[symmetry]
+        image = boards[:, cells]
+        to_move = record["to_move"]
+        if symmetry >= SWAP:
+            image = np.where(image == 0, 0, 3 - image).astype(np.int8)
+            to_move = (3 - to_move).astype(np.int8)
+        parts["boards"].append(image.reshape(count, size, size))
+        parts["to_move"].append(to_move)
+        parts["policy"].append(record["policy"][:, cells])
+        parts["outcome"].append(record["outcome"])
+    return {field: np.concatenate(arrays) for field, arrays in parts.items()}
+
+def _play_game_worker(settings: Dict, board_size: int, seed: int, sample_moves: int) -> Dict[str, np.ndarray]:
+    global _worker_ai, _worker_settings
+    if _worker_ai is None or _worker_settings != settings:
+        _worker_ai = HexAI(settings)
+        _worker_settings = settings
+    return play_game(_worker_ai, board_size, seed, sample_moves)
+
+class ShardWriter:
+    """Buffers positions and writes them to disk in fixed-size shards."""
+
+    def __init__(self, out_dir: str, shard_size: int, config: Dict):
+        self.out_dir = out_dir
+        self.shard_size = shard_size
+        os.makedirs(out_dir, exist_ok=True)
+        self.manifest_path = os.path.join(out_dir, "manifest.json")
+
+        self.manifest = {"games_completed": 0, "shards": 0, "positions": 0, "checkpoints": 0, "pending": None}
+        self.buffer: Dict[str, List[np.ndarray]] = {field: [] for field in FIELDS}
+        self.buffered = 0
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+            if self.manifest.get("config") != config:
+                raise ValueError(f"{out_dir} was generated with different settings: {self.manifest.get('config')}")
+            if self.manifest.get("pending"):
+                with np.load(os.path.join(out_dir, self.manifest["pending"])) as pending:
+                    if len(pending["outcome"]):
+                        self._append({field: pending[field] for field in FIELDS})
+        self.manifest["config"] = config
+        # Pending files left by a checkpoint that never reached the manifest
+        for path in glob.glob(os.path.join(out_dir, "pending_*.npz")):
+            if os.path.basename(path) != self.manifest.get("pending"):
+                os.remove(path)
+
+    @property
+    def games_completed(self) -> int:
+        return self.manifest["games_completed"]
+
+    def add_game(self, record: Dict[str, np.ndarray]):
+        """Buffer one game's positions, writing out every shard that fills up."""
+        self._append(record)
+        self.manifest["games_completed"] += 1
+        self.manifest["positions"] += len(record["outcome"])
+        wrote = False
+        while self.buffered >= self.shard_size:
+            self._write_shard()
+            wrote = True
+        if wrote:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Persist the pending positions and the manifest (atomically).
+
+        Each checkpoint writes a new pending file and only then replaces the
+        manifest that names it, so a crash in between leaves the previous
+        manifest and pending file, which agree on the games completed.
+        """
+        pending = {field: self._concat(field) for field in FIELDS}
+        previous = self.manifest.get("pending")
+        self.manifest["checkpoints"] = self.manifest.get("checkpoints", 0) + 1
+        name = f"pending_{self.manifest['checkpoints']:05d}.npz"
+        self._atomic_save(os.path.join(self.out_dir, name), pending)
+        self.manifest["pending"] = name
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+        if previous:
+            os.remove(os.path.join(self.out_dir, previous))
+
+    def _append(self, record: Dict[str, np.ndarray]):
+        for field in FIELDS:
+            self.buffer[field].append(record[field])
+        self.buffered += len(record["outcome"])
+
+    def _concat(self, field: str) -> np.ndarray:
+        return np.concatenate(self.buffer[field]) if self.buffer[field] else np.zeros((0,))
+
+    def _write_shard(self):
+        data = {field: self._concat(field) for field in FIELDS}
+        shard = {field: values[:self.shard_size] for field, values in data.items()}
+        rest = {field: values[self.shard_size:] for field, values in data.items()}
+
+        path = os.path.join(self.out_dir, f"shard_{self.manifest['shards']:05d}.npz")
+        self._atomic_save(path, shard)
+        self.manifest["shards"] += 1
+
+        self.buffer = {field: [rest[field]] for field in FIELDS}
+        self.buffered = len(rest["outcome"])
+
+    @staticmethod
+    def _atomic_save(path: str, arrays: Dict[str, np.ndarray]):
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+def generate(out_dir: str, games: int, difficulty: str = "Medium", board_size: int = Config.BOARD_SIZE,
+             workers: int = os.cpu_count() or 1, shard_size: int = 65536, seed: int = 0,
+             sample_moves: int = 6, augmentation: str = "rotate", report_every: float = 30.0):
+    """Play games until ``games`` are completed in ``out_dir`` (resuming if present)."""
+    settings = selfplay_settings(difficulty)
+    symmetries = AUGMENTATIONS[augmentation]
+    config = {"difficulty": difficulty, "settings": settings, "board_size": board_size,
+              "seed": seed, "sample_moves": sample_moves, "shard_size": shard_size,
+              "augment": augmentation}
+    writer = ShardWriter(out_dir, shard_size, config)
+    first_game = writer.games_completed
+    if first_game >= games:
+        print(f"{out_dir} already has {first_game} games")
+        return
+
+    start_time = time.time()
+    last_report = start_time
+    positions = 0
+    next_game = first_game
+    in_flight = deque()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        # Keep a bounded window of games in flight and collect them in order,
+        # so the manifest's game count always names a contiguous prefix of seeds
+        while next_game < games or in_flight:
+            while next_game < games and len(in_flight) < 2 * workers:
+                in_flight.append(pool.submit(_play_game_worker, settings, board_size,
+                                             seed + next_game, sample_moves))
+                next_game += 1
+
+            record = in_flight.popleft().result()
+            positions += len(record["outcome"])
+            writer.add_game(augment(record, symmetries))
+
+            now = time.time()
+            if now - last_report >= report_every or not in_flight:
+                elapsed = now - start_time
+                played = writer.games_completed - first_game
+                print(f"{writer.games_completed}/{games} games, {writer.manifest['shards']} shards | "
+                      f"{played / elapsed * 3600:,.0f} games/hour, {positions / elapsed:,.1f} positions/sec")
+                writer.checkpoint()
+                last_report = now
+    writer.checkpoint()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate self-play training data.")
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--games", type=int, required=True, help="total games to have in the directory")
+    parser.add_argument("--difficulty", default="Medium", choices=list(Config.DIFFICULTY_LEVELS))
+    parser.add_argument("--board-size", type=int, default=Config.BOARD_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shard-size", type=int, default=65536, help="positions per shard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sample-moves", type=int, default=6,
+                        help="opening plies sampled from the visit distribution")
+    parser.add_argument("--augment", default="rotate", choices=list(AUGMENTATIONS),
+                        help="board symmetries stored alongside every position")
+    args = parser.parse_args()
+
+    generate(args.out, args.games, args.difficulty, args.board_size, args.workers,
+             args.shard_size, args.seed, args.sample_moves, args.augment)
+
+if __name__ == "__main__":
+    main()
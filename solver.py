@@ -0,0 +1,83 @@
+# solver.py
+"""Exact depth-first solver for positions with few empty cells."""
+
+import time
+from typing import Dict, Optional
+from bitboard import BitBoard, spans_edges
+
+class SolverBudgetExceeded(Exception):
+    """Raised inside ``Solver`` when a search runs out of nodes."""
+
+class Solver:
+    """Proves who wins a position by exhaustive AND/OR search.
+
+    Moves are made and undone on the ``BitBoard`` in place, so wins are
+    detected by its union-find. A side that cannot connect even with every
+    empty cell has lost, which cuts most lines short. Results are cached by
+    canonical hash across calls, so symmetric positions are solved once;
+    positions that ran out of budget are remembered too and not retried.
+    """
+
+    def __init__(self, max_entries: int = 1000000):
+        self.max_entries = max_entries
+        self.cache: Dict[int, bool] = {}  # hash -> whether the side to move wins
+        self.unsolved = set()
+        self.nodes = 0  # positions visited, summed over all calls
+        self.elapsed = 0.0
+        self._limit = 0
+
+    def solve(self, board: BitBoard, max_nodes: int = 5000) -> Optional[int]:
+        """Return the winning player of ``board``'s position, or None if out of budget."""
+        if board.winner:
+            return board.winner
+        if board.canonical_hash() in self.unsolved:
+            return None
+        if len(self.cache) >= self.max_entries:
+            self.cache.clear()
+            self.unsolved.clear()
+
+        start = time.perf_counter()
+        depth = len(board.moves)
+        self._limit = self.nodes + max_nodes
+        try:
+            to_move_wins = self._wins(board)
+        except SolverBudgetExceeded:
+            while len(board.moves) > depth:
+                board.unmake_move()
+            self.unsolved.add(board.canonical_hash())
+            return None
+        finally:
+            self.elapsed += time.perf_counter() - start
+        return board.to_move if to_move_wins else 3 - board.to_move
+
+    def _wins(self, board: BitBoard) -> bool:
+        """Whether the side to move wins with perfect play."""
+        key = board.canonical_hash()
+        known = self.cache.get(key)
+        if known is not None:
+            return known
+        self.nodes += 1
+        if self.nodes > self._limit:
+            raise SolverBudgetExceeded()
+
+        player = board.to_move
+        opponent = 3 - player
+        empty = board.empty_mask()
+        tables = board.tables
+        if not spans_edges(tables, board.stones[player] | empty, player):
+            result = False
+        elif not spans_edges(tables, board.stones[opponent] | empty, opponent):
+            result = True
+        else:
+            result = False
+            while empty:
+                low = empty & -empty
+                empty ^= low
+                board.make_move(low.bit_length() - 1)
+                won = board.winner == player or not self._wins(board)
+                board.unmake_move()
+                if won:
+                    result = True
+                    break
+        self.cache[key] = result
+        return result
@@ -0,0 +1,29 @@
+# tests/test_arena.py
+"""Elo estimates and Bradley-Terry ratings from match results."""
+
+import math
+import pytest
+from arena import elo_from_score, fit_ratings
+
+def test_elo_from_score_is_symmetric():
+    elo, low, high = elo_from_score(0.5, 100)
+    assert elo == pytest.approx(0.0)
+    assert low == pytest.approx(-high) and low < -50
+    stronger = elo_from_score(0.75, 100)
+    assert stronger[0] == pytest.approx(400 * math.log10(3))
+    assert stronger[1] < stronger[0] < stronger[2]
+    # More games narrow the interval
+    wider = elo_from_score(0.75, 20)
+    assert wider[2] - wider[1] > stronger[2] - stronger[1]
+
+def test_elo_from_score_without_games():
+    elo, low, high = elo_from_score(0.5, 0)
+    assert math.isnan(elo) and (low, high) == (-math.inf, math.inf)
+
+def test_fit_ratings_orders_engines():
+    results = {("a", "b"): [75, 100], ("b", "c"): [75, 100], ("a", "c"): [90, 100]}
+    ratings = fit_ratings(["a", "b", "c"], results)
+    assert ratings["a"] == 0.0
+    assert 0 > ratings["b"] > ratings["c"]
+    # Close to the 3:1 head-to-head score, pulled in slightly by the draw prior
+    assert -400 * math.log10(3) < ratings["b"] < -150
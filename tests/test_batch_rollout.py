@@ -0,0 +1,46 @@
+# tests/test_batch_rollout.py
+"""Vectorized fill-the-board playouts."""
+
+import numpy as np
+import pytest
+from batch_rollout import batch_fill, batch_fill_winners, random_fills, red_connects
+from bitboard import BitBoard, BoardTables, spans_edges
+
+def to_mask(cells: np.ndarray) -> int:
+    return sum(1 << int(cell) for cell in np.flatnonzero(cells))
+
+@pytest.mark.parametrize("size", [2, 5, 11, 13])
+def test_red_connects_matches_flood_fill(size):
+    rng = np.random.default_rng(size)
+    tables = BoardTables.get(size)
+    red = rng.random((200, size, size)) < rng.uniform(0.3, 0.7, (200, 1, 1))
+    expected = [spans_edges(tables, to_mask(board.ravel()), 1) for board in red]
+    np.testing.assert_array_equal(red_connects(red), expected)
+
+def test_random_fills_keep_stones_and_split_the_rest():
+    board = BitBoard(5)
+    for cell in (12, 0, 6):
+        board.make_move(cell)
+    fills = random_fills(board, 100, np.random.default_rng(0)).reshape(100, -1)
+    assert (fills[:, [12, 6]] == 1).all() and (fills[:, 0] == 2).all()
+    # Blue is to move with 22 empty cells: 11 stones each
+    assert ((fills == 1).sum(axis=1) == 2 + 11).all()
+    assert ((fills == 2).sum(axis=1) == 1 + 11).all()
+
+def test_every_fill_has_exactly_one_winner():
+    board = BitBoard(7)
+    for cell in (24, 10, 17):
+        board.make_move(cell)
+    winners, fills = batch_fill(board, 300, np.random.default_rng(1))
+    tables = board.tables
+    for winner, fill in zip(winners, fills.reshape(300, -1)):
+        red = spans_edges(tables, to_mask(fill == 1), 1)
+        blue = spans_edges(tables, to_mask(fill == 2), 2)
+        assert red != blue
+        assert winner == (1 if red else 2)
+
+def test_decided_positions_return_the_winner():
+    board = BitBoard(3)
+    for cell in (0, 1, 3, 2, 6):
+        board.make_move(cell)
+    assert (batch_fill_winners(board, 10, np.random.default_rng(0)) == 1).all()
@@ -0,0 +1,140 @@
+# tests/test_bitboard.py
+"""Bitboard moves, union-find win detection and Zobrist hashing."""
+
+import random
+import pytest
+from bitboard import BitBoard, IDENTITY, ROTATE, SWAP, SWAP_ROTATE
+from hex_game import HexGame
+
+def dfs_connects(board: BitBoard, player: int) -> bool:
+    """Reference win check: depth-first search over ``player``'s stones."""
+    size = board.size
+    stones = {cell for cell in range(size * size) if board.get(cell) == player}
+    if player == 1:
+        start = [cell for cell in stones if cell < size]
+        reached_goal = lambda cell: cell // size == size - 1
+    else:
+        start = [cell for cell in stones if cell % size == 0]
+        reached_goal = lambda cell: cell % size == size - 1
+    seen = set(start)
+    stack = list(start)
+    while stack:
+        cell = stack.pop()
+        if reached_goal(cell):
+            return True
+        row, col = divmod(cell, size)
+        for dr, dc in ((0, -1), (0, 1), (-1, 0), (1, 0), (-1, 1), (1, -1)):
+            r, c = row + dr, col + dc
+            neighbor = r * size + c
+            if 0 <= r < size and 0 <= c < size and neighbor in stones and neighbor not in seen:
+                seen.add(neighbor)
+                stack.append(neighbor)
+    return False
+
+def random_game(board: BitBoard, rng: random.Random, max_moves: int = None):
+    cells = list(range(board.tables.num_cells))
+    rng.shuffle(cells)
+    for cell in cells[:max_moves]:
+        if not board.make_move(cell):
+            break
+
+def snapshot(board: BitBoard):
+    return (list(board.stones), board.to_move, board.winner, list(board.moves), list(board.uf.parent),
+            list(board.uf.size), board.hash, board.hash_rotated, board.hash_swapped, board.hash_swapped_rotated)
+
+@pytest.mark.parametrize("size", [4, 11])
+def test_unmake_restores_position(size):
+    rng = random.Random(size)
+    for _ in range(20):
+        board = BitBoard(size)
+        random_game(board, rng, rng.randrange(size * size // 2))
+        before = snapshot(board)
+        played = rng.randrange(1, size * size // 3)
+        random_game(board, rng, played)
+        while len(board.moves) > len(before[3]):
+            board.unmake_move()
+        assert snapshot(board) == before
+
+def test_illegal_moves_are_rejected():
+    board = BitBoard(3)
+    assert board.make_move(4)
+    assert not board.make_move(4)
+    assert board.moves == [4] and board.to_move == 2
+
+def test_load_derives_side_to_move_and_winner():
+    board = BitBoard(3)
+    for cell in (0, 1, 3, 2, 6):
+        board.make_move(cell)
+    assert board.winner == 1
+
+    loaded = BitBoard(3)
+    loaded.load(board.stones)
+    assert (loaded.winner, loaded.to_move, loaded.hash) == (board.winner, board.to_move, board.hash)
+
+    # Reusing a finished board for a fresh position clears the old result
+    board.load([0, 1, 0])
+    assert (board.winner, board.to_move, board.moves) == (0, 2, [0])
+    played = BitBoard(3)
+    played.make_move(0)
+    assert board.hash == played.hash
+
+@pytest.mark.parametrize("size", [3, 5, 7, 11])
+def test_union_find_matches_dfs(size):
+    rng = random.Random(size)
+    for _ in range(20):
+        board = BitBoard(size)
+        cells = list(range(size * size))
+        rng.shuffle(cells)
+        for cell in cells:
+            player = board.to_move
+            assert board.make_move(cell)
+            for side in (1, 2):
+                assert board.connected(side) == dfs_connects(board, side)
+            if board.winner:
+                assert board.winner == player
+                break
+        # Hex has no draws
+        assert board.winner
+
+def test_hash_is_independent_of_move_order():
+    first = BitBoard(5)
+    second = BitBoard(5)
+    for cell in (3, 7, 12, 20):
+        first.make_move(cell)
+    for cell in (12, 20, 3, 7):
+        second.make_move(cell)
+    assert first.hash == second.hash
+    assert first.canonical_hash() == second.canonical_hash()
+    first.unmake_move()
+    second.unmake_move()
+    assert first.hash != second.hash
+
+def test_load_matches_played_hash():
+    rng = random.Random(1)
+    board = BitBoard(7)
+    random_game(board, rng, 12)
+    loaded = BitBoard(7)
+    loaded.load(board.stones)
+    assert loaded.hash == board.hash
+    assert (loaded.hash_rotated, loaded.hash_swapped, loaded.hash_swapped_rotated) == \
+        (board.hash_rotated, board.hash_swapped, board.hash_swapped_rotated)
+
+@pytest.mark.parametrize("symmetry", [IDENTITY, ROTATE, SWAP, SWAP_ROTATE])
+def test_symmetric_images_share_canonical_hash(symmetry):
+    rng = random.Random(symmetry)
+    for _ in range(10):
+        game = HexGame(6)
+        random_game(game.bitboard, rng, rng.randrange(1, 12))
+        image = game.transformed(symmetry)
+        assert image.canonical_hash() == game.canonical_hash()
+        assert image.transformed(symmetry).bitboard.stones == game.bitboard.stones
+
+def test_canonical_hash_separates_positions():
+    board = BitBoard(5)
+    hashes = set()
+    for cell in range(25):
+        board.make_move(cell)
+        hashes.add(board.canonical_hash())
+        board.unmake_move()
+    # 25 first moves fall into 13 classes under the 180-degree rotation
+    assert len(hashes) == 13
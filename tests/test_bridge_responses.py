@@ -0,0 +1,52 @@
+# tests/test_bridge_responses.py
+"""Bridge intrusion tables against a brute-force enumeration of bridges."""
+
+import pytest
+from bitboard import BoardTables
+
+def neighbours(cell: int, size: int):
+    row, col = divmod(cell, size)
+    return {r * size + c for r, c in ((row, col - 1), (row, col + 1), (row - 1, col), (row + 1, col),
+                                      (row - 1, col + 1), (row + 1, col - 1))
+            if 0 <= r < size and 0 <= c < size}
+
+def expected_responses(size: int):
+    """{player: {intruded cell: {(stones mask, reply)}}} built from the definition of a bridge."""
+    cells = range(size * size)
+    expected = {player: {cell: set() for cell in cells} for player in (1, 2)}
+    for a in cells:
+        for b in cells:
+            if a < b and b not in neighbours(a, size):
+                carriers = neighbours(a, size) & neighbours(b, size)
+                if len(carriers) == 2:
+                    x, y = carriers
+                    for player in (1, 2):
+                        expected[player][x].add(((1 << a) | (1 << b), y))
+                        expected[player][y].add(((1 << a) | (1 << b), x))
+    for stone in cells:
+        row, col = divmod(stone, size)
+        # A second-row stone is joined to its own edge through two edge cells
+        edges = {1: [r * size + col for r in (0, size - 1)],
+                 2: [row * size + c for c in (0, size - 1)]}
+        for player, lines in edges.items():
+            for line in lines:
+                edge_row, edge_col = divmod(line, size)
+                on_edge = {cell for cell in neighbours(stone, size)
+                           if (player == 1 and cell // size == edge_row) or
+                           (player == 2 and cell % size == edge_col)}
+                off_edge = row != edge_row if player == 1 else col != edge_col
+                if len(on_edge) == 2 and off_edge:
+                    x, y = on_edge
+                    expected[player][x].add((1 << stone, y))
+                    expected[player][y].add((1 << stone, x))
+    return expected
+
+@pytest.mark.parametrize("size", [3, 4, 7])
+def test_bridge_responses_match_enumeration(size):
+    tables = BoardTables(size)
+    expected = expected_responses(size)
+    for player in (1, 2):
+        for cell in range(size * size):
+            entries = tables.bridge_responses[player][cell]
+            assert len(entries) == len(set(entries))
+            assert set(entries) == expected[player][cell], (player, divmod(cell, size))
@@ -0,0 +1,88 @@
+# tests/test_engine_server.py
+"""The engine server's JSON protocol over a local socket."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import engine_server
+from engine_server import EngineServer
+from parallel_search import move_worker, shutdown_pools
+
+def run_session(requests, workers: int = 1):
+    """Send ``requests`` one at a time to a fresh server; returns the replies in order."""
+    async def session():
+        server = EngineServer(workers, seed=0)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = []
+        try:
+            for index, request in enumerate(requests):
+                writer.write(json.dumps(dict(request, id=index)).encode() + b"\n")
+                await writer.drain()
+                reply = json.loads(await asyncio.wait_for(reader.readline(), 30))
+                assert reply.pop("id") == index
+                replies.append(reply)
+        finally:
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+        return replies
+
+    try:
+        return asyncio.run(session())
+    finally:
+        shutdown_pools()
+
+def test_game_round_trip():
+    replies = run_session([
+        {"cmd": "new_game", "size": 5, "difficulty": "Beginner", "time_limit": 0.2},
+        {"cmd": "play", "game": 1, "move": [2, 2]},
+        {"cmd": "genmove", "game": 1},
+        {"cmd": "state", "game": 1},
+        {"cmd": "play", "game": 1, "move": [2, 2]},
+        {"cmd": "close", "game": 1},
+        {"cmd": "state", "game": 1},
+        {"cmd": "stats"},
+    ])
+    assert replies[0] == {"game": 1, "ok": True}
+    assert replies[1] == {"winner": 0, "ok": True}
+    move = replies[2]["move"]
+    assert replies[2]["ok"] and move != [2, 2] and replies[2]["search"]["simulations"] > 0
+    assert replies[3]["moves"] == [[2, 2], move] and replies[3]["to_move"] == 1
+    assert replies[4] == {"ok": False, "error": "illegal move [2, 2]"}
+    assert replies[5] == {"ok": True}
+    assert not replies[6]["ok"]
+    assert replies[7]["completed"] == 1 and replies[7]["games"] == 0
+
+@pytest.mark.parametrize("field, value", [
+    ("time_limit", 0), ("time_limit", -1.0), ("time_limit", "NaN"), ("time_limit", "inf"),
+    ("time_limit", "soon"), ("game_time", -5), ("game_time", None),
+])
+def test_new_game_rejects_bad_times(field, value):
+    (reply,) = run_session([{"cmd": "new_game", "size": 5, field: value}])
+    assert not reply["ok"] and field in reply["error"]
+
+def test_bad_requests_get_errors():
+    replies = run_session([{"cmd": "fly"}, {"cmd": "genmove", "game": 7}, {"cmd": "new_game", "size": 40}])
+    assert [reply["ok"] for reply in replies] == [False] * 3
+    assert "unknown command" in replies[0]["error"] and "no game" in replies[1]["error"]
+
+class BrokenPool(ThreadPoolExecutor):
+    """Starts the server but refuses every search."""
+
+    def submit(self, fn, *args, **kwargs):
+        if fn is move_worker:
+            raise RuntimeError("pool is broken")
+        return super().submit(fn, *args, **kwargs)
+
+def test_failed_submit_frees_the_worker_slot(monkeypatch):
+    pool = BrokenPool(1)
+    monkeypatch.setattr(engine_server, "get_pool", lambda workers: pool)
+    # With one slot, a leaked slot would leave the second genmove waiting forever
+    replies = run_session([{"cmd": "new_game", "size": 5}, {"cmd": "genmove", "game": 1},
+                           {"cmd": "genmove", "game": 1}])
+    pool.shutdown()
+    assert [reply["ok"] for reply in replies] == [True, False, False]
+    assert all("could not start" in reply["error"] for reply in replies[1:])
@@ -0,0 +1,29 @@
+# tests/test_hex_game.py
+"""HexGame facade over the bitboard."""
+
+import numpy as np
+from hex_game import HexGame, Player
+
+def test_board_setter_replaces_the_whole_position():
+    game = HexGame(3)
+    for row, col in ((0, 0), (0, 1), (1, 0), (0, 2), (2, 0)):
+        game.make_move(row, col)
+    assert game.winner == Player.PLAYER1
+
+    board = np.zeros((3, 3), dtype=np.int8)
+    board[0, 0] = 1
+    game.board = board
+    assert game.winner is None
+    assert not game.is_game_over()
+    assert game.current_player == Player.PLAYER2
+    assert game.move_history == [] and game.bitboard.moves == [0]
+    np.testing.assert_array_equal(game.board, board)
+
+def test_check_winner_and_unmake():
+    game = HexGame(3)
+    for row, col in ((0, 1), (0, 0), (1, 1), (1, 0), (2, 1)):
+        game.make_move(row, col)
+    assert game.check_winner(Player.PLAYER1) and not game.check_winner(Player.PLAYER2)
+    assert game.is_game_over()
+    assert game.unmake_move() == (2, 1)
+    assert game.winner is None and not game.check_winner(Player.PLAYER1)
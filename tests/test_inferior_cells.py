@@ -0,0 +1,66 @@
+# tests/test_inferior_cells.py
+"""Inferior cell analysis checked against exhaustive search on small boards."""
+
+import random
+from functools import lru_cache
+import pytest
+from bitboard import BitBoard, BoardTables, spans_edges
+from inferior_cells import analyze
+
+SIZE = 4
+TABLES = BoardTables(SIZE)
+
+@lru_cache(maxsize=None)
+def winner(red: int, blue: int, to_move: int) -> int:
+    """Game-theoretic winner by exhaustive search."""
+    if spans_edges(TABLES, red, 1):
+        return 1
+    if spans_edges(TABLES, blue, 2):
+        return 2
+    for cell in range(SIZE * SIZE):
+        if not (red | blue) >> cell & 1:
+            if play(red, blue, to_move, cell) == to_move:
+                return to_move
+    return 3 - to_move
+
+def play(red: int, blue: int, to_move: int, cell: int) -> int:
+    bit = 1 << cell
+    if to_move == 1:
+        return winner(red | bit, blue, 2)
+    return winner(red, blue | bit, 1)
+
+def random_positions(count: int, seed: int):
+    rng = random.Random(seed)
+    while count:
+        board = BitBoard(SIZE)
+        for cell in rng.sample(range(SIZE * SIZE), rng.randrange(5, 10)):
+            board.make_move(cell)
+        if not board.winner:
+            count -= 1
+            yield board
+
+def test_surrounded_cell_is_dead():
+    board = BitBoard(SIZE)
+    # Red stones on all six neighbours of cell 5 (row 1, col 1), Blue elsewhere
+    for red, blue in ((1, 0), (2, 3), (4, 12), (6, 13), (8, 15)):
+        board.make_move(red)
+        board.make_move(blue)
+    board.make_move(9)
+    result = analyze(board)
+    assert result.dead >> 5 & 1
+    assert 5 not in result.candidates
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fill_in_and_pruning_keep_the_result(seed):
+    for board in random_positions(25, seed):
+        red, blue, to_move = board.stones[1], board.stones[2], board.to_move
+        result = analyze(board)
+        value = winner(red, blue, to_move)
+        if not result.candidates:
+            assert spans_edges(TABLES, red | result.fill[1], 1) or spans_edges(TABLES, blue | result.fill[2], 2)
+        # Dead and captured cells can be filled in without changing the winner
+        assert winner(red | result.fill[1], blue | result.fill[2], to_move) == value
+        # A won position keeps a winning move among the candidates, unless
+        # every empty cell was filled in and the fill already connects
+        if value == to_move and result.candidates:
+            assert any(play(red, blue, to_move, cell) == to_move for cell in result.candidates)
@@ -0,0 +1,108 @@
+# tests/test_mcts_tree.py
+"""Array tree bookkeeping: promotion, proofs and move choice."""
+
+import numpy as np
+from mcts_tree import MCTSTree
+
+def build_tree() -> MCTSTree:
+    """Root with children on cells 0-2; child 2 has children on cells 3-4, the first expanded again."""
+    tree = MCTSTree(64)
+    tree.expand(0, [0, 1, 2], keys=[10, 11, 12])
+    tree.expand(3, [3, 4], keys=[13, 14])
+    tree.expand(4, [5], keys=[15])
+    tree.backpropagate([0, 1], 1.0)
+    tree.backpropagate([0, 3, 4, 6], 0.0)
+    tree.backpropagate([0, 3, 5], 1.0)
+    tree.amaf_visits[4] = 7
+    tree.amaf_wins[4] = 3.0
+    tree.prior[5] = 0.25
+    tree.proven[6] = 1
+    tree.propagate_proof([0, 3, 4, 6])
+    return tree
+
+def test_backpropagate_alternates_perspective():
+    tree = MCTSTree(16)
+    tree.expand(0, [0, 1])
+    tree.expand(1, [2, 3])
+    tree.backpropagate([0, 1, 3], 1.0)
+    tree.backpropagate([0, 1, 4], 0.0)
+    assert list(tree.visits[:5]) == [2, 2, 0, 1, 1]
+    # wins count for the player who moved into the node
+    assert list(tree.wins[:5]) == [0.0, 1.0, 0.0, 0.0, 1.0]
+    assert tree.find_child(1, 3) == 4 and tree.find_child(1, 7) == -1
+
+def test_expand_refuses_to_overflow():
+    tree = MCTSTree(4)
+    assert tree.expand(0, [0, 1, 2])
+    assert not tree.expand(1, [3, 4])
+    assert tree.size == 4 and tree.num_children[1] == 0
+
+def test_promote_keeps_subtree_statistics():
+    tree = build_tree()
+    child = tree.find_child(0, 2)
+    expected = {int(tree.move[node]): (tree.visits[node], tree.wins[node], tree.amaf_visits[node],
+                                       tree.amaf_wins[node], tree.proven[node], tree.prior[node], tree.key[node])
+                for node in (4, 5, 6)}
+    root = (tree.visits[child], tree.wins[child], tree.proven[child])
+
+    tree.promote(child)
+    assert tree.size == 4
+    assert (tree.visits[0], tree.wins[0], tree.proven[0]) == root
+    assert tree.parent[0] == -1
+    for move, stats in expected.items():
+        node = tree.find_child(0, move) if move != 5 else tree.find_child(tree.find_child(0, 3), 5)
+        assert node > 0
+        assert (tree.visits[node], tree.wins[node], tree.amaf_visits[node], tree.amaf_wins[node],
+                tree.proven[node], tree.prior[node], tree.key[node]) == stats
+        assert tree.first_child[tree.parent[node]] <= node
+    # Freed nodes are cleared
+    assert not tree.visits[tree.size:].any() and not tree.proven[tree.size:].any()
+
+def test_virtual_loss_steers_selection_and_is_removed():
+    tree = MCTSTree(16)
+    tree.expand(0, [0, 1])
+    tree.backpropagate([0, 1], 1.0)
+    tree.backpropagate([0, 2], 1.0)
+    before = tree.visits.copy(), tree.wins.copy()
+    first = tree.select_child(0)
+    tree.add_virtual_loss([0, first], 3)
+    # The pending path counts as lost visits, so the next selection goes elsewhere
+    assert tree.visits[first] == 4 and tree.wins[first] == 1.0
+    assert tree.select_child(0) != first
+    tree.remove_virtual_loss([0, first], 3)
+    assert (tree.visits == before[0]).all() and (tree.wins == before[1]).all()
+    assert not tree.virtual.any()
+
+def test_proof_propagates_to_the_root():
+    tree = build_tree()
+    # The opponent's reply on cell 5 wins, so the move into node 4 (cell 3) loses
+    assert tree.proven[4] == -1
+    assert tree.proven[3] == 0
+    tree.proven[5] = -1
+    tree.propagate_proof([0, 3, 5])
+    assert tree.proven[3] == 1
+    assert tree.proven[0] == -1
+
+def test_best_child_prefers_unvisited_proven_win():
+    tree = MCTSTree(16)
+    tree.expand(0, [4, 5, 6])
+    tree.visits[1:4] = [50, 0, 20]
+    tree.proven[2] = 1
+    tree.proven[0] = -1
+    assert tree.best_child(0) == 2
+
+def test_best_child_skips_proven_losses():
+    tree = MCTSTree(16)
+    tree.expand(0, [4, 5, 6])
+    tree.visits[1:4] = [50, 10, 20]
+    tree.proven[1] = -1
+    assert tree.best_child(0) == 3
+    # All lost: still the most visited move
+    tree.proven[1:4] = -1
+    assert tree.best_child(0) == 1
+
+def test_reset_clears_used_nodes():
+    tree = build_tree()
+    tree.reset()
+    assert tree.size == 1
+    assert not np.any(tree.visits) and not np.any(tree.proven) and tree.num_children[0] == 0
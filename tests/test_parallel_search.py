@@ -0,0 +1,55 @@
+# tests/test_parallel_search.py
+"""Tests for the shared process pool and the root-parallel merge."""
+
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pytest
+from parallel_search import get_pool, merge_root_searches, shutdown_pools
+
+def finished(result=None, error=None) -> Future:
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+def test_merge_skips_failed_workers():
+    merged = np.zeros(9)
+    proven = np.zeros(9, dtype=np.int8)
+    result = (np.array([4, 5]), np.array([10.0, 3.0]), np.array([0, -1], dtype=np.int8), 13)
+    futures = [finished(error=BrokenProcessPool("worker died")), finished(result)]
+    assert merge_root_searches(futures, merged, proven) == 13
+    assert merged[4] == 10 and merged[5] == 3
+    assert proven[5] == -1 and not proven[4]
+
+def test_broken_pool_is_rebuilt():
+    try:
+        pool = get_pool(1)
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result(timeout=60)
+        rebuilt = get_pool(1)
+        assert rebuilt is not pool
+        assert rebuilt.submit(abs, -3).result(timeout=60) == 3
+    finally:
+        shutdown_pools()
+
+def test_one_pool_serves_every_size():
+    try:
+        small = get_pool(1)
+        large = get_pool(2)
+        assert large is not small and large._max_workers == 2
+        assert get_pool(1) is large and get_pool(2) is large
+    finally:
+        shutdown_pools()
+
+def test_merge_timeout_takes_finished_results_and_cancels_the_rest():
+    merged = np.zeros(9)
+    proven = np.zeros(9, dtype=np.int8)
+    result = (np.array([2]), np.array([7.0]), np.array([0], dtype=np.int8), 7)
+    running = Future()
+    assert merge_root_searches([finished(result), running], merged, proven, timeout=0.0) == 7
+    assert merged[2] == 7
+    assert running.cancelled()
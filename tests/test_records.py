@@ -0,0 +1,100 @@
+# tests/test_records.py
+"""Round trips through the opening book and the game archive files."""
+
+import os
+import random
+import numpy as np
+import pytest
+from bitboard import BitBoard, ROTATE
+from game_record import ArchiveReader, GameArchive, load_record, save_record
+from hex_game import HexGame
+from opening_book import OpeningBook, read_book, write_book
+
+def random_game(size: int, seed: int, finish: bool = True) -> HexGame:
+    rng = random.Random(seed)
+    game = HexGame(size)
+    cells = list(range(size * size))
+    rng.shuffle(cells)
+    for cell in cells if finish else cells[:size]:
+        if not game.make_move(*divmod(cell, size)):
+            break
+    return game
+
+def test_book_round_trip(tmp_path):
+    path = str(tmp_path / "hex_5.hexb")
+    root = BitBoard(5)
+    after = BitBoard(5)
+    after.make_move(7)
+    positions = {
+        root.canonical_hash(): [(12, 900, 0.6), (6, 40, 0.5)],
+        after.canonical_hash(): [(3, 10, 0.4), (11, 300, 0.55)],
+    }
+    write_book(path, 5, 2, positions)
+
+    size, plies, loaded = read_book(path)
+    assert (size, plies) == (5, 2)
+    assert set(loaded) == set(positions)
+    for key, moves in positions.items():
+        # Entries come back most visited first
+        expected = sorted(moves, key=lambda move: -move[1])
+        assert [(move, visits) for move, visits, _ in loaded[key]] == [(m, v) for m, v, _ in expected]
+        np.testing.assert_allclose([value for _, _, value in loaded[key]], [value for _, _, value in expected])
+
+    book = OpeningBook(path)
+    assert len(book) == 4
+    assert book.lookup(root) == 12
+    assert book.lookup(BitBoard(7)) is None
+
+def test_book_lookup_maps_symmetric_positions(tmp_path):
+    path = str(tmp_path / "hex_5.hexb")
+    board = BitBoard(5)
+    board.make_move(7)
+    # Store the reply in the canonical frame, as the builder does
+    _, symmetry = board.canonical()
+    cells = board.tables.symmetry_cells[symmetry]
+    write_book(path, 5, 2, {board.canonical_hash(): [(int(cells[13]), 100, 0.5)]})
+    book = OpeningBook(path)
+    assert book.lookup(board) == 13
+
+    # The rotated position gets the rotated reply
+    rotated = BitBoard(5)
+    rotation = board.tables.symmetry_cells[ROTATE]
+    rotated.make_move(int(rotation[7]))
+    assert book.lookup(rotated) == int(rotation[13])
+
+def test_book_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.hexb"
+    path.write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError):
+        OpeningBook(str(path))
+
+@pytest.mark.parametrize("size", [5, 11, 17])
+def test_archive_round_trip(tmp_path, size):
+    path = str(tmp_path / "games.hexa")
+    games = [random_game(size, seed, finish=seed % 3 != 0) for seed in range(12)]
+    archive = GameArchive(path)
+    archive.extend(games[:7])
+    for game in games[7:]:
+        archive.append(game)
+
+    def check(reader: ArchiveReader):
+        assert len(reader) == len(games)
+        for index, game in enumerate(games):
+            cells = [row * size + col for row, col, _ in game.move_history]
+            assert reader.moves(index).tolist() == cells
+            assert reader.winner(index) == (game.winner.value if game.winner else 0)
+            np.testing.assert_array_equal(reader.board_at(index), game.board)
+            assert reader.game(index).bitboard.stones == game.bitboard.stones
+
+    check(ArchiveReader(path))
+    # A lost index is rebuilt from the record headers
+    os.remove(path + ".idx")
+    check(ArchiveReader(path))
+
+def test_single_record_round_trip(tmp_path):
+    path = str(tmp_path / "game.hexa")
+    game = random_game(11, 3)
+    save_record(game, path)
+    loaded = load_record(path)
+    assert loaded.move_history == game.move_history
+    assert loaded.winner == game.winner
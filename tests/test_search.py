@@ -0,0 +1,61 @@
+# tests/test_search.py
+"""HexAI move choice on solved positions."""
+
+import random
+import pytest
+from ai import HexAI
+from bitboard import BitBoard
+from hex_game import HexGame
+from solver import Solver
+
+SETTINGS = {"simulations": 200, "time_limit": 1.0, "workers": 1, "ponder_time": 0, "book": None}
+
+def winning_moves(board: BitBoard, solver: Solver):
+    wins = []
+    for cell in board.empty_cells():
+        board.make_move(cell)
+        if board.winner or solver.solve(board, 10 ** 7) == 3 - board.to_move:
+            wins.append(cell)
+        board.unmake_move()
+    return wins
+
+def single_win_position(size: int, stones: int, seed: int) -> HexGame:
+    """A random position whose side to move has exactly one winning move."""
+    rng = random.Random(seed)
+    solver = Solver()
+    while True:
+        game = HexGame(size)
+        cells = rng.sample(range(size * size), stones)
+        if all(game.bitboard.make_move(cell) for cell in cells) and not game.bitboard.winner:
+            if len(winning_moves(game.bitboard, solver)) == 1:
+                return game
+
+@pytest.mark.parametrize("seed", range(5))
+def test_proven_promoted_root_plays_the_win(seed):
+    game = single_win_position(5, 14, seed)
+    (win,) = winning_moves(game.bitboard.copy(), Solver())
+    ai = HexAI(SETTINGS)
+    # A kept tree whose root was proven won as a leaf, before it was expanded
+    ai.tree.reset()
+    ai.tree.proven[0] = -1
+    ai.tree_moves = list(game.bitboard.moves)
+    row, col = ai.get_best_move(game)
+    assert row * game.board_size + col == win
+
+def test_reused_tree_converts_won_positions():
+    rng = random.Random(7)
+    solver = Solver()
+    ai = HexAI(SETTINGS)
+    checked = 0
+    for _ in range(8):
+        game = single_win_position(4, 6, rng.randrange(2 ** 31))
+        ai.new_game()
+        while not game.is_game_over():
+            board = game.bitboard.copy()
+            wins = winning_moves(board, solver)
+            row, col = ai.get_best_move(game)
+            if wins:
+                assert row * game.board_size + col in wins
+                checked += 1
+            game.make_move(row, col)
+    assert checked >= 8
@@ -0,0 +1,95 @@
+# tests/test_selfplay.py
+"""Self-play shard writing, resuming and symmetry augmentation."""
+
+import numpy as np
+import pytest
+import selfplay
+from bitboard import ROTATE, SWAP
+from policy_net import load_shards
+from selfplay import FIELDS, ShardWriter, augment
+
+CONFIG = {"difficulty": "Easy", "board_size": 3}
+
+def fake_game(index: int, length: int):
+    rng = np.random.default_rng(index)
+    return {
+        "boards": rng.integers(0, 3, (length, 3, 3)).astype(np.int8),
+        "to_move": rng.integers(1, 3, length).astype(np.int8),
+        "policy": rng.random((length, 9)).astype(np.float32),
+        "outcome": np.full(length, index, dtype=np.float32),
+    }
+
+def assert_positions(out_dir: str, games):
+    written = load_shards(out_dir)
+    for field in FIELDS:
+        np.testing.assert_array_equal(written[field], np.concatenate([game[field] for game in games]))
+
+def test_resume_from_pending(tmp_path):
+    out_dir = str(tmp_path)
+    games = [fake_game(index, 3 + index % 4) for index in range(8)]
+    writer = ShardWriter(out_dir, 10, CONFIG)
+    for game in games[:5]:
+        writer.add_game(game)
+    writer.checkpoint()
+    positions = writer.manifest["positions"]
+
+    # A new writer picks up the unsharded positions where the last one stopped
+    resumed = ShardWriter(out_dir, 10, CONFIG)
+    assert resumed.games_completed == 5
+    assert resumed.buffered == positions - 10 * resumed.manifest["shards"]
+    for game in games[5:]:
+        resumed.add_game(game)
+    resumed.checkpoint()
+
+    assert_positions(out_dir, games)
+    assert resumed.manifest["shards"] == resumed.manifest["positions"] // 10
+    assert list(tmp_path.glob("pending_*.npz")) == [tmp_path / resumed.manifest["pending"]]
+
+def test_crash_before_the_manifest_keeps_the_last_checkpoint(tmp_path, monkeypatch):
+    out_dir = str(tmp_path)
+    games = [fake_game(index, 4) for index in range(6)]
+    writer = ShardWriter(out_dir, 10, CONFIG)
+    for game in games[:2]:
+        writer.add_game(game)
+    writer.checkpoint()
+
+    # The next game fills a shard; the crash hits after the new pending file is saved
+    def crash(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(selfplay.json, "dump", crash)
+    with pytest.raises(OSError):
+        writer.add_game(games[2])
+    monkeypatch.undo()
+
+    resumed = ShardWriter(out_dir, 10, CONFIG)
+    assert resumed.games_completed == 2 and resumed.buffered == 8
+    assert_positions(out_dir, games[:2])
+    for game in games[2:]:
+        resumed.add_game(game)
+    resumed.checkpoint()
+    assert_positions(out_dir, games)
+
+def test_resume_rejects_other_settings(tmp_path):
+    writer = ShardWriter(str(tmp_path), 10, CONFIG)
+    writer.add_game(fake_game(0, 4))
+    writer.checkpoint()
+    with pytest.raises(ValueError):
+        ShardWriter(str(tmp_path), 10, dict(CONFIG, difficulty="Hard"))
+
+def test_augment_maps_cells_and_colours():
+    record = fake_game(1, 1)
+    record["boards"][0] = [[1, 0, 0], [0, 2, 0], [0, 0, 0]]
+    record["to_move"][0] = 1
+    record["policy"][0] = np.eye(9, dtype=np.float32)[5]
+    augmented = augment(record, (ROTATE, SWAP))
+    assert len(augmented["outcome"]) == 3
+    np.testing.assert_array_equal(augmented["outcome"], record["outcome"].repeat(3))
+
+    # 180-degree rotation: (r, c) -> (2 - r, 2 - c)
+    np.testing.assert_array_equal(augmented["boards"][1], [[0, 0, 0], [0, 2, 0], [0, 0, 1]])
+    assert augmented["policy"][1].argmax() == 3
+    assert augmented["to_move"][1] == 1
+    # Colour-swapping transpose: (r, c) -> (c, r) with Red and Blue exchanged
+    np.testing.assert_array_equal(augmented["boards"][2], [[2, 0, 0], [0, 1, 0], [0, 0, 0]])
+    assert augmented["policy"][2].argmax() == 7
+    assert augmented["to_move"][2] == 2
@@ -0,0 +1,47 @@
+# tests/test_solver.py
+"""Endgame solver results against exhaustive minimax."""
+
+import random
+from functools import lru_cache
+import pytest
+from bitboard import BitBoard, BoardTables, spans_edges
+from solver import Solver
+
+@lru_cache(maxsize=None)
+def minimax(size: int, red: int, blue: int, to_move: int) -> int:
+    """Winner with perfect play, without pruning, caching or symmetry."""
+    tables = BoardTables(size)
+    if spans_edges(tables, red, 1):
+        return 1
+    if spans_edges(tables, blue, 2):
+        return 2
+    for cell in range(size * size):
+        if not (red | blue) >> cell & 1:
+            bit = 1 << cell
+            after = minimax(size, red | bit, blue, 2) if to_move == 1 else minimax(size, red, blue | bit, 1)
+            if after == to_move:
+                return to_move
+    return 3 - to_move
+
+@pytest.mark.parametrize("size, stones", [(3, 0), (3, 2), (4, 8), (4, 10)])
+def test_solver_matches_minimax(size, stones):
+    rng = random.Random(size * 100 + stones)
+    solver = Solver()
+    for _ in range(20):
+        board = BitBoard(size)
+        for cell in rng.sample(range(size * size), stones):
+            board.make_move(cell)
+        moves = list(board.moves)
+        expected = minimax(size, board.stones[1], board.stones[2], board.to_move)
+        assert solver.solve(board, 10 ** 7) == expected
+        # The board is left as it was
+        assert board.moves == moves
+
+def test_solver_gives_up_past_the_budget():
+    board = BitBoard(5)
+    solver = Solver()
+    assert solver.solve(board, 10) is None
+    assert board.moves == []
+    # Known to be out of budget, so not searched again
+    nodes = solver.nodes
+    assert solver.solve(board, 10) is None and solver.nodes == nodes
@@ -0,0 +1,63 @@
+# tests/test_time_manager.py
+"""Search budgets: simulation caps, early stopping, extensions and the game clock."""
+
+import time
+import pytest
+from ai import HexAI
+from mcts_tree import MCTSTree
+from selfplay import play_game
+from time_manager import TimeManager
+
+SETTINGS = {"simulations": 200, "time_limit": 1.0, "workers": 1, "ponder_time": 0, "book": None}
+
+def root_with_visits(*visits) -> MCTSTree:
+    tree = MCTSTree(16)
+    tree.expand(0, list(range(len(visits))))
+    tree.visits[1:1 + len(visits)] = visits
+    tree.visits[0] = sum(visits)
+    return tree
+
+def timer(**settings) -> TimeManager:
+    return TimeManager(dict({"time_extension": 2.0, "close_ratio": 0.9, "check_interval": 1}, **settings))
+
+def test_simulation_cap_is_not_extended():
+    manager = timer()
+    manager.start(root_with_visits(50, 50), 100, 10.0, 20, 25)
+    deadline = manager.deadline
+    assert manager.should_stop(100)
+    assert manager.stop_reason == "simulations"
+    assert manager.deadline == deadline and manager.simulations == 100
+
+def test_close_call_at_the_deadline_is_extended_once():
+    manager = timer()
+    manager.start(root_with_visits(50, 48), 10 ** 6, 0.01, 20, 25)
+    time.sleep(0.02)
+    assert not manager.should_stop(98)
+    assert manager.extended and manager.deadline > time.perf_counter()
+    time.sleep(manager.deadline - time.perf_counter() + 0.005)
+    assert manager.should_stop(99)
+    assert manager.stop_reason == "time"
+
+def test_early_stop_ignores_pending_virtual_loss():
+    tree = root_with_visits(10, 1)
+    manager = timer()
+    manager.start(tree, 21, 100.0, 20, 25)
+    # 20 playouts in flight below the runner-up: counted, it would look 11 visits ahead
+    tree.add_virtual_loss([0, 2], 20)
+    assert not manager.should_stop(11)
+    tree.remove_virtual_loss([0, 2], 20)
+    tree.visits[1] = 12
+    manager.countdown = 1
+    assert manager.should_stop(13)
+    assert manager.stop_reason == "decided"
+
+def test_new_game_refills_clock():
+    ai = HexAI(dict(SETTINGS, game_time=0.4))
+    limits = []
+    ai.stats_callback = lambda stats: limits.append(stats.time_limit) if stats.finished else None
+    play_game(ai, 4, seed=0)
+    first_game = limits[0]
+    ai.time_manager.clock_remaining = 0.0
+    limits.clear()
+    play_game(ai, 4, seed=1)
+    assert limits[0] == pytest.approx(first_game)
@@ -0,0 +1,30 @@
+# tests/test_transposition.py
+"""Transposition table slot replacement and the statistics it shares."""
+
+import numpy as np
+from transposition import TranspositionTable
+
+def small_table(capacity: int) -> TranspositionTable:
+    return TranspositionTable(capacity * TranspositionTable.ENTRY_BYTES / (1024 * 1024))
+
+def update(table: TranspositionTable, keys, depths, wins):
+    table.update(np.array(keys, dtype=np.uint64), np.array(depths, dtype=np.int16), np.array(wins, dtype=np.float64))
+
+def test_blend_prefers_the_better_known_entry():
+    table = small_table(16)
+    for _ in range(3):
+        update(table, [1, 2], [0, 1], [1.0, 0.0])
+    keys = np.array([1, 2, 3], dtype=np.uint64)
+    visits, wins = table.blend(keys, np.array([5, 1, 0]), np.array([2.0, 1.0, 0.0]))
+    assert list(visits) == [5, 3, 0] and list(wins) == [2.0, 0.0, 0.0]
+    assert (table.hits, table.misses) == (2, 1)
+
+def test_path_positions_sharing_a_slot_resolve_it_once():
+    table = small_table(4)
+    # 5 and 9 both map to slot 1; the shallower position claims it
+    update(table, [5, 9], [0, 1], [1.0, 0.0])
+    assert (table.keys[1], table.visits[1], table.wins[1], table.depth[1]) == (5, 1, 1.0, 0)
+    # The owner keeps the slot even when it is the deeper of the two
+    update(table, [9, 5], [0, 1], [0.0, 0.5])
+    assert (table.keys[1], table.visits[1], table.wins[1]) == (5, 2, 1.5)
+    assert table.evictions == 0
@@ -0,0 +1,23 @@
+# tests/test_union_find.py
+"""Rollback union-find."""
+
+import random
+from union_find import UnionFind
+
+def test_rollback_restores_earlier_forest():
+    rng = random.Random(0)
+    uf = UnionFind(50)
+    for _ in range(20):
+        uf.union(rng.randrange(50), rng.randrange(50))
+    mark = uf.checkpoint()
+    parent, size = list(uf.parent), list(uf.size)
+    for _ in range(40):
+        uf.union(rng.randrange(50), rng.randrange(50))
+    uf.rollback(mark)
+    assert (uf.parent, uf.size) == (parent, size)
+
+def test_union_reports_merges_once():
+    uf = UnionFind(4)
+    assert uf.union(0, 1) and uf.union(2, 3) and uf.union(1, 3)
+    assert not uf.union(0, 2)
+    assert uf.connected(0, 3) and len(uf.log) == 3
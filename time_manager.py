@@ -0,0 +1,155 @@
+# time_manager.py
+"""Per-move search budgets: early stopping, extensions and a per-game clock."""
+
+import time
+import numpy as np
+from typing import Dict, Optional
+from config import Config
+from mcts_tree import MCTSTree
+
+class TimeManager:
+    """Decides when a search stops.
+
+    ``start`` fixes the budget for one move; ``should_stop`` is called after
+    every simulation and only reads the clock every few iterations. A search
+    stops early once the runner-up at the root cannot catch the leader with
+    the simulations left, and is extended once when the top two are close
+    at the deadline. With ``game_time`` set, each move's time comes out of
+    a per-game clock instead of the fixed ``time_limit``.
+    """
+
+    def __init__(self, difficulty_settings: Dict):
+        self.early_stop = difficulty_settings.get("early_stop", True)
+        self.extension = difficulty_settings.get("time_extension", Config.TIME_EXTENSION)
+        self.close_ratio = difficulty_settings.get("close_ratio", Config.CLOSE_MOVE_RATIO)
+        self.max_interval = difficulty_settings.get("check_interval", Config.TIME_CHECK_INTERVAL)
+        # Seconds for all of this AI's moves in one game (0 = fixed time per move)
+        self.game_time = difficulty_settings.get("game_time", 0)
+        self.clock_remaining = self.game_time
+
+        self.tree: Optional[MCTSTree] = None
+        self.simulations = 0.0
+        self.time_limit = 0.0
+        self.start_time = 0.0
+        self.deadline = 0.0
+        self.managed = False
+        self.extended = False
+        self.interval = 1
+        self.countdown = 1
+        self.stop_reason = ""
+
+    def new_game(self):
+        """Refill the game clock."""
+        self.clock_remaining = self.game_time
+
+    def allocate(self, empty_cells: int, num_cells: int) -> float:
+        """Share of the game clock for the next move, weighted by game phase.
+
+        Hex games end well before the board is full, so about a third of the
+        empty cells are expected to be ours. Openings are cheap, the middle
+        game (where the connection is decided) gets the most time.
+        """
+        moves_left = max(empty_cells / 3, 4.0)
+        filled = 1 - empty_cells / num_cells
+        if filled < 0.1:
+            weight = 0.5
+        elif filled < 0.5:
+            weight = 1.5
+        else:
+            weight = 1.0
+        return min(self.clock_remaining * weight / moves_left, self.clock_remaining / 2)
+
+    def start(self, tree: MCTSTree, simulations: float, time_limit: float,
+              empty_cells: int, num_cells: int, managed: bool = True):
+        """Set the budget for one search.
+
+        ``managed`` searches (the AI's own moves) may stop early, be extended
+        and draw on the game clock; others (pondering) get exactly the
+        budget they ask for.
+        """
+        self.tree = tree
+        self.managed = managed
+        self.simulations = simulations
+        self.time_limit = time_limit
+        if managed and self.game_time > 0:
+            self.time_limit = self.allocate(empty_cells, num_cells)
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + self.time_limit
+        self.extended = False
+        self.interval = 1
+        self.countdown = 1
+        self.stop_reason = ""
+
+    def should_stop(self, simulations_done: int) -> bool:
+        """True once the search should end (call after each simulation)."""
+        if simulations_done >= self.simulations:
+            # A simulation cap is a fixed budget (e.g. the easier levels); only time is extended
+            self.stop_reason = "simulations"
+            return True
+
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        now = time.perf_counter()
+        elapsed = now - self.start_time
+        # Read the clock roughly every millisecond, whatever the simulation rate
+        rate = simulations_done / elapsed if elapsed > 0 else 0.0
+        self.interval = max(1, min(self.max_interval, int(rate * 0.001)))
+        self.countdown = self.interval
+
+        if now >= self.deadline:
+            return self._finish_or_extend(now)
+        if self.managed and self.early_stop and simulations_done:
+            remaining = min(self.simulations - simulations_done, rate * (self.deadline - now))
+            leader, runner_up = self._top_two()
+            if leader - runner_up > remaining:
+                self.stop_reason = "decided"
+                return True
+        return False
+
+    def finish(self) -> float:
+        """Charge the search to the game clock; returns the seconds it took."""
+        elapsed = time.perf_counter() - self.start_time
+        if self.managed and self.game_time > 0:
+            self.clock_remaining = max(self.clock_remaining - elapsed, 0.0)
+        return elapsed
+
+    def charge_move(self, clock_before: float, elapsed: float):
+        """Charge a whole move to the game clock, replacing what ``finish`` charged.
+
+        For moves with work around the search, such as waiting for
+        root-parallel workers; ``clock_before`` is the clock when the move began.
+        """
+        if self.game_time > 0:
+            self.clock_remaining = max(clock_before - elapsed, 0.0)
+
+    def _finish_or_extend(self, now: float) -> bool:
+        """At the deadline, think longer once if the top two moves are close."""
+        if self.managed and not self.extended and self.extension > 1:
+            leader, runner_up = self._top_two()
+            if leader > 0 and runner_up >= self.close_ratio * leader:
+                self.extended = True
+                extra = self.time_limit * (self.extension - 1)
+                if self.game_time > 0:
+                    extra = min(extra, max(self.clock_remaining - (now - self.start_time), 0.0) / 2)
+                self.deadline = max(self.deadline, now) + extra
+                return False
+        self.stop_reason = "time"
+        return True
+
+    def _top_two(self):
+        """Visits of the two most visited root children.
+
+        Virtual loss on playouts still in flight (tree-parallel search) is
+        not counted; those visits have no result yet.
+        """
+        tree = self.tree
+        count = int(tree.num_children[0])
+        if count == 0:
+            return 0, 0
+        start = int(tree.first_child[0])
+        visits = tree.visits[start:start + count] - tree.virtual[start:start + count]
+        if count < 2:
+            return int(visits[0]), 0
+        top = np.partition(visits, count - 2)[-2:]
+        return int(top[1]), int(top[0])
@@ -0,0 +1,103 @@
+# transposition.py
+"""Bounded transposition table sharing MCTS statistics across move orders."""
+
+import numpy as np
+from typing import Dict
+
+class TranspositionTable:
+    """Direct-mapped table of (visits, wins) keyed by Zobrist hash.
+
+    Slots live in NumPy arrays so a whole sibling group can be looked up in
+    one gather during selection. On a collision the entry closer to the
+    root (fewer stones) is kept unless it is from an older search, which is
+    the usual depth-preferred replacement scheme.
+    """
+
+    # key (8) + visits (4) + wins (8) + depth (2) + generation (2)
+    ENTRY_BYTES = 24
+
+    def __init__(self, memory_mb: float):
+        self.capacity = max(1, int(memory_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        self.keys = np.zeros(self.capacity, dtype=np.uint64)
+        self.visits = np.zeros(self.capacity, dtype=np.int32)
+        self.wins = np.zeros(self.capacity, dtype=np.float64)
+        self.depth = np.full(self.capacity, np.iinfo(np.int16).max, dtype=np.int16)
+        self.generation = np.zeros(self.capacity, dtype=np.uint16)
+        self.current_generation = 1
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def new_search(self):
+        """Age existing entries so they can be replaced by the next search."""
+        self.current_generation = (self.current_generation + 1) % 65536 or 1
+
+    def clear(self):
+        self.keys[:] = 0
+        self.visits[:] = 0
+        self.wins[:] = 0
+        self.depth[:] = np.iinfo(np.int16).max
+        self.generation[:] = 0
+
+    def _slots(self, keys: np.ndarray) -> np.ndarray:
+        return (keys % np.uint64(self.capacity)).astype(np.intp)
+
+    def blend(self, keys: np.ndarray, visits: np.ndarray, wins: np.ndarray):
+        """Replace per-node statistics with shared ones where the table knows more.
+
+        Each lookup counts as a hit or miss per key, so the counters measure
+        how often the table is actually read with an entry present.
+        """
+        slots = self._slots(keys)
+        found = self.keys[slots] == keys
+        hits = int(np.count_nonzero(found))
+        self.hits += hits
+        self.misses += len(keys) - hits
+        shared_visits = self.visits[slots]
+        better = found & (shared_visits > visits)
+        if not better.any():
+            return visits, wins
+        return np.where(better, shared_visits, visits), np.where(better, self.wins[slots], wins)
+
+    def update(self, keys: np.ndarray, depths: np.ndarray, wins: np.ndarray):
+        """Add one visit (and the given wins) to each position, claiming slots as needed.
+
+        Positions of one path that map to the same slot resolve it once: the
+        slot's current owner takes the visit if it is on the path, otherwise
+        the position closest to the root (``keys`` run root first) may claim it.
+        """
+        slots = self._slots(keys)
+        stored = self.keys[slots]
+        if len(np.unique(slots)) < len(slots):
+            order = np.lexsort((np.arange(len(slots)), stored != keys, slots))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = slots[order[1:]] != slots[order[:-1]]
+            keep = np.sort(order[first])
+            keys, depths, wins, slots, stored = keys[keep], depths[keep], wins[keep], slots[keep], stored[keep]
+        missing = stored != keys
+        if missing.any():
+            replace = missing & ((self.generation[slots] != self.current_generation)
+                                 | (depths <= self.depth[slots]))
+            self.evictions += int(np.count_nonzero(replace & (self.visits[slots] > 0)))
+            claim = slots[replace]
+            self.keys[claim] = keys[replace]
+            self.visits[claim] = 0
+            self.wins[claim] = 0
+            self.depth[claim] = depths[replace]
+            keep = ~missing | replace
+            slots = slots[keep]
+            wins = wins[keep]
+        np.add.at(self.visits, slots, 1)
+        np.add.at(self.wins, slots, wins)
+        self.generation[slots] = self.current_generation
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for sizing the table."""
+        return {
+            "capacity": self.capacity,
+            "used": int(np.count_nonzero(self.visits)),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_bytes": self.capacity * self.ENTRY_BYTES,
+        }
@@ -0,0 +1,63 @@
+# union_find.py
+"""Disjoint-set forest with rollback, used for incremental win detection."""
+
+from typing import List
+
+class UnionFind:
+    """Union by size without path compression, so every union can be undone.
+
+    Each successful union is logged; ``checkpoint``/``rollback`` restore the
+    forest to an earlier state in O(unions undone).
+    """
+
+    __slots__ = ('parent', 'size', 'log')
+
+    def __init__(self, num_nodes: int):
+        self.parent = list(range(num_nodes))
+        self.size = [1] * num_nodes
+        self.log: List[int] = []  # roots that were attached to another root
+
+    def copy(self) -> 'UnionFind':
+        new_uf = UnionFind.__new__(UnionFind)
+        new_uf.parent = self.parent.copy()
+        new_uf.size = self.size.copy()
+        new_uf.log = self.log.copy()
+        return new_uf
+
+    def find(self, node: int) -> int:
+        parent = self.parent
+        while parent[node] != node:
+            node = parent[node]
+        return node
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of ``a`` and ``b``; return False if already joined."""
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        self.log.append(root_b)
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+    def checkpoint(self) -> int:
+        """Return a marker that ``rollback`` can restore to."""
+        return len(self.log)
+
+    def rollback(self, checkpoint: int):
+        """Undo every union made since ``checkpoint``."""
+        parent = self.parent
+        size = self.size
+        log = self.log
+        while len(log) > checkpoint:
+            child = log.pop()
+            root = parent[child]
+            size[root] -= size[child]
+            parent[child] = child
@@ -4,6 +4,7 @@
 import numpy as np
 from typing import List, Tuple
 from hex_game import HexGame, Player
+from config import Config
 
 def save_game(game: HexGame, filename: str):
     """Save game state to file."""
@@ -11,7 +12,7 @@ def save_game(game: HexGame, filename: str):
         'board': game.board.tolist(),
         'current_player': game.current_player.value,
         'winner': game.winner.value if game.winner else None,
-        'move_history': game.move_history,
+        'move_history': [(row, col, player.value) for row, col, player in game.move_history],
         'board_size': game.board_size
     }
     
@@ -26,40 +27,32 @@ def load_game(filename: str) -> HexGame:
         data = json.load(f)
     
     game = HexGame(data['board_size'])
-    game.board = np.array(data['board'])
-    game.current_player = Player(data['current_player'])
-    game.winner = Player(data['winner']) if data['winner'] else None
-    game.move_history = data['move_history']
+    if data['move_history']:
+        # Replaying keeps the win detection and hashing state consistent
+        for row, col, _ in data['move_history']:
+            game.make_move(row, col)
+    else:
+        game.board = np.array(data['board'], dtype=np.int8)
+        game.current_player = Player(data['current_player'])
+        game.winner = Player(data['winner']) if data['winner'] else None
     
     return game
 
-def generate_training_data(num_games: int = 100) -> List[Tuple[np.ndarray, int]]:
-    """Generate training data from self-play games."""
+def generate_training_data(num_games: int = 100, difficulty: str = "Medium") -> List[Tuple[np.ndarray, int]]:
+    """Generate training data from self-play games.
+
+    Returns (board, outcome) pairs in memory; use ``selfplay.py`` for large
+    runs, which plays games in parallel and streams shards to disk.
+    """
     from ai import HexAI
+    from selfplay import play_game, selfplay_settings
     
     training_data = []
-    ai = HexAI(simulations=500)
+    ai = HexAI(selfplay_settings(difficulty))
     
     for game_num in range(num_games):
-        game = HexGame()
-        states_and_outcomes = []
-        
-        while not game.is_game_over():
-            # Store current state
-            state = game.board.copy()
-            current_player = game.current_player
-            
-            # Make AI move
-            move = ai.get_best_move(game)
-            game.make_move(move[0], move[1])
-            
-            states_and_outcomes.append((state, current_player))
-        
-        # Update outcomes based on winner
-        winner = game.winner
-        for state, player in states_and_outcomes:
-            outcome = 1 if player == winner else -1
-            training_data.append((state, outcome))
+        record = play_game(ai, Config.BOARD_SIZE, seed=game_num)
+        training_data.extend(zip(record["boards"], record["outcome"].tolist()))
         
         print(f"Generated game {game_num + 1}/{num_games}")
     